@@ -0,0 +1,55 @@
+"""Benchmark of adding achievements to the JSON file and to the SQLite store.
+
+Usage::
+
+    python benchmarks/bench_achievements_store.py --existing 20000 --adds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from achievements.main import AchievementStore, load_achievements, save_achievements
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--existing", type=int, default=10_000, help="Achievements already stored")
+    parser.add_argument("--adds", type=int, default=200, help="Achievements added one at a time")
+    args = parser.parse_args()
+
+    existing = [{"title": f"Conquista {idx}", "description": "Descrição " * 5} for idx in range(args.existing)]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = pathlib.Path(tmp) / "achievements.json"
+        save_achievements(json_file, existing)
+        started = time.perf_counter()
+        for idx in range(args.adds):
+            achievements = load_achievements(json_file)
+            achievements.append({"title": f"Nova {idx}", "description": "x"})
+            save_achievements(json_file, achievements)
+        json_seconds = time.perf_counter() - started
+
+        with AchievementStore(pathlib.Path(tmp) / "achievements.db") as store:
+            store.import_achievements(existing)
+            started = time.perf_counter()
+            for idx in range(args.adds):
+                store.add(f"Nova {idx}", "x")
+            store_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            found = store.find(f"Conquista {args.existing // 2}")
+            find_seconds = time.perf_counter() - started
+            assert found
+
+    print(f"{args.existing} existing achievements, {args.adds} adds")
+    print(f"JSON file     {json_seconds / args.adds * 1000:8.3f} ms per add")
+    print(f"SQLite store  {store_seconds / args.adds * 1000:8.3f} ms per add, find by title {find_seconds * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: default ``pd.read_csv`` inference vs. the cached csvexcel schema.
+
+Usage::
+
+    python benchmarks/bench_csvexcel_schema.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+import pandas as pd
+
+from csvexcel.main import load_csv_schema
+
+
+def write_sample_csv(path: pathlib.Path, rows: int) -> None:
+    rng = random.Random(42)
+    branches = [f"Filial {idx:03d}" for idx in range(50)]
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write("id,filial,cliente,codigo,valor\n")
+        for idx in range(rows):
+            missing_id = "" if idx % 997 == 0 else str(idx)
+            fh.write(
+                f"{missing_id},{rng.choice(branches)},Cliente {rng.randrange(rows)},"
+                f"{rng.randrange(10**6):07d},{rng.random() * 1000:.2f}\n"
+            )
+
+
+def measure(label: str, path: pathlib.Path, **read_options) -> None:
+    start = time.perf_counter()
+    frame = pd.read_csv(path, **read_options)
+    elapsed = time.perf_counter() - start
+    memory = frame.memory_usage(deep=True).sum() / 2**20
+    print(f"{label:<10} {elapsed:8.3f}s {memory:10.1f} MiB  id={frame['id'].dtype} codigo={frame['codigo'].dtype}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows in the generated CSV")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "bench.csv"
+        write_sample_csv(path, args.rows)
+        start = time.perf_counter()
+        dtypes = load_csv_schema(str(path), categorical_columns=["filial"])
+        print(f"schema inferred and cached in {time.perf_counter() - start:.3f}s: {dtypes}")
+        measure("default", path)
+        measure("schema", path, dtype=load_csv_schema(str(path), categorical_columns=["filial"]))
+
+
+if __name__ == "__main__":
+    main()
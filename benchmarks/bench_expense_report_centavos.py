@@ -0,0 +1,63 @@
+"""Benchmark: expense_report float accumulation vs. exact integer cents.
+
+Usage::
+
+    python benchmarks/bench_expense_report_centavos.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from expense_report.main import agregar_colunar, agregar_csv, converter_centavos
+
+
+def write_sample_csv(path: pathlib.Path, rows: int, distinct: int) -> None:
+    rng = random.Random(42)
+    categories = [f"Categoria {idx:02d}" for idx in range(20)]
+    amounts = [f"{rng.randrange(10**5)},{rng.randrange(100):02d}" for _ in range(distinct)]
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write("Categoria,Valor\n")
+        for _ in range(rows):
+            fh.write(f"{rng.choice(categories)},\"{rng.choice(amounts)}\"\n")
+
+
+def measure(label: str, repeat: int, function, *args, **kwargs) -> None:
+    timings = []
+    for _ in range(repeat):
+        converter_centavos.cache_clear()
+        start = time.perf_counter()
+        _, total = function(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    print(f"{label:<18} {min(timings):8.3f}s  total={total}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows in the generated CSV")
+    parser.add_argument("--distinct", type=int, default=10_000, help="Distinct amounts in the generated CSV")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(pathlib.Path(tmp) / "bench.csv")
+        write_sample_csv(pathlib.Path(path), args.rows, args.distinct)
+        measure("csv float", args.repeat, agregar_csv, path)
+        measure("csv centavos", args.repeat, agregar_csv, path, centavos=True)
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            return
+        measure("colunar float", args.repeat, agregar_colunar, path)
+        measure("colunar centavos", args.repeat, agregar_colunar, path, centavos=True)
+
+
+if __name__ == "__main__":
+    main()
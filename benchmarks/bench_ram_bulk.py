@@ -0,0 +1,54 @@
+"""Micro-benchmark of RAM bulk transfers against per-byte loops.
+
+Usage::
+
+    python benchmarks/bench_ram_bulk.py --size 16777216
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import timeit
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from ram.main import RAM
+
+
+def load_per_byte(ram: RAM, image: bytes) -> None:
+    for offset, byte in enumerate(image):
+        ram.write(offset, byte)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=4 << 20, help="Bytes in the loaded image")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    image = random.Random(42).randbytes(args.size)
+    ram = RAM(args.size)
+    half = args.size // 2
+    cases = {
+        "load, write per byte": lambda: load_per_byte(ram, image),
+        "load (bytes)": lambda: ram.load(image),
+        "write_block": lambda: ram.write_block(0, image),
+        "dump, per byte": lambda: bytes(value for _, value in ram.dump()),
+        "read_block": lambda: ram.read_block(0, args.size),
+        "fill, write per byte": lambda: [ram.write(a, 0x55) for a in range(args.size)],
+        "fill": lambda: ram.fill(0, args.size, 0x55),
+        "copy, per byte": lambda: [ram.write(a + 1, ram.read(a)) for a in range(half - 1, -1, -1)],
+        "copy (overlapping)": lambda: ram.copy(1, 0, half),
+    }
+
+    print(f"image: {args.size / 2**20:.1f} MiB")
+    for label, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{label:<22} {best:9.4f}s  {args.size / best / 2**20:10.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
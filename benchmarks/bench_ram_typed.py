@@ -0,0 +1,71 @@
+"""Micro-benchmark of RAM typed access and copy-on-write snapshots.
+
+Usage::
+
+    python benchmarks/bench_ram_typed.py --words 1000000 --memory 67108864
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import timeit
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from ram.main import RAM, SparseRAM
+
+
+def read_u32_per_byte(ram: RAM, address: int) -> int:
+    return (
+        ram.read(address)
+        | ram.read(address + 1) << 8
+        | ram.read(address + 2) << 16
+        | ram.read(address + 3) << 24
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=200_000, help="32-bit words read per measurement")
+    parser.add_argument("--memory", type=int, default=64 << 20, help="Bytes of memory for the snapshot runs")
+    parser.add_argument("--dirty", type=int, default=100, help="Pages written between snapshots")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    size = args.words * 4
+    dense, sparse = RAM(size), SparseRAM(size)
+    image = rng.randbytes(size)
+    dense.write_block(0, image)
+    sparse.write_block(0, image)
+    addresses = range(0, size, 4)
+    cases = {
+        "u32 decoded per byte": lambda: [read_u32_per_byte(dense, a) for a in addresses],
+        "read_u32 (RAM)": lambda: [dense.read_u32(a) for a in addresses],
+        "read_u32 (SparseRAM)": lambda: [sparse.read_u32(a) for a in addresses],
+        "read_array (RAM)": lambda: dense.read_array(0, args.words),
+        "read_array (SparseRAM)": lambda: sparse.read_array(0, args.words),
+    }
+
+    memory = SparseRAM(args.memory)
+    memory.write_block(0, rng.randbytes(args.memory))
+    snapshot = memory.snapshot()
+    for _ in range(args.dirty):
+        memory.write_u32(rng.randrange(0, args.memory - 4, 4), rng.getrandbits(32))
+    full = RAM(args.memory)
+    full.write_block(0, memory.read_block(0, args.memory))
+    cases["snapshot, full copy"] = lambda: full.read_block(0, args.memory)
+    cases["snapshot (copy-on-write)"] = memory.snapshot
+    cases[f"diff ({args.dirty} dirty pages)"] = lambda: memory.diff(snapshot)
+
+    print(f"{args.words} words, {args.memory / 2**20:.0f} MiB snapshot memory")
+    for label, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{label:<26} {best:9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
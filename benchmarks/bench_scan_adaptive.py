@@ -0,0 +1,76 @@
+"""Benchmark: fixed vs. adaptive (RTT-based) timeouts in scan.Scanner.
+
+Runs entirely on a local simulated network: a fake connector sleeps for each
+host's round-trip time (with jitter), drops a share of the answers and never
+answers filtered ports, so no packets leave the machine.
+
+Usage::
+
+    python benchmarks/bench_scan_adaptive.py --ports 1-1024 --loss 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import random
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from scan.main import Scanner, parse_ports
+
+OPEN_PORTS = {22, 80, 443}
+# host: (round-trip time, jitter, share of filtered ports)
+HOSTS = {
+    "10.0.0.1": (0.001, 0.0005, 0.0),
+    "10.0.0.2": (0.002, 0.001, 0.5),
+    "10.0.1.1": (0.080, 0.020, 0.1),
+    "10.0.2.1": (0.700, 0.100, 0.0),
+}
+
+
+def simulated_connector(loss: float, seed: int = 42):
+    rng = random.Random(seed)
+
+    async def connect(family, address, port, timeout):
+        rtt, jitter, filtered = HOSTS[address[0]]
+        rtt = max(0.0, rng.gauss(rtt, jitter))
+        unanswered = (port not in OPEN_PORTS and (port * 2654435761 % 1000) / 1000 < filtered) or rng.random() < loss
+        if unanswered or rtt > timeout:
+            await asyncio.sleep(timeout)
+            return None, timeout
+        await asyncio.sleep(rtt)
+        return port in OPEN_PORTS, rtt
+
+    return connect
+
+
+async def run(label: str, ports: list[int], loss: float, **options) -> None:
+    scanner = Scanner(max_sockets=400, per_host=100, connector=simulated_connector(loss), **options)
+    started = time.perf_counter()
+    found = [result async for result in scanner.scan(HOSTS, ports)]
+    elapsed = time.perf_counter() - started
+    expected = len(HOSTS) * len(OPEN_PORTS & set(ports))
+    probes = sum(timing.probes for timing in scanner.timings.values())
+    retries = sum(timing.retries for timing in scanner.timings.values())
+    print(f"{label:<26} {elapsed:7.2f}s  found {len(found)}/{expected}  probes {probes}  retries {retries}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ports", default="1-1024", help="Port list scanned on every simulated host")
+    parser.add_argument("--loss", type=float, default=0.01, help="Share of answers dropped")
+    args = parser.parse_args()
+
+    ports = parse_ports(args.ports)
+    asyncio.run(run("fixed 0.5s", ports, args.loss, timeout=0.5))
+    asyncio.run(run("fixed 0.5s, 1 retry", ports, args.loss, timeout=0.5, retries=1))
+    asyncio.run(run("fixed 2s", ports, args.loss, timeout=2.0))
+    asyncio.run(run("adaptive, 1 retry", ports, args.loss, timeout=1.0, adaptive=True, retries=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: full word_count recount vs. queries on the persistent WordIndex.
+
+Usage::
+
+    python benchmarks/bench_word_count_index.py --files 200 --words 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from word_count.main import WordIndex, count_files_parallel
+
+
+def write_corpus(directory: pathlib.Path, files: int, words: int) -> None:
+    rng = random.Random(42)
+    vocabulary = [f"word{idx}" for idx in range(200_000)]
+    for idx in range(files):
+        (directory / f"doc{idx:05d}.txt").write_text(" ".join(rng.choices(vocabulary, k=words)), encoding="utf-8")
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label:<24} {(time.perf_counter() - start) * 1000:10.2f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100, help="Files in the generated corpus")
+    parser.add_argument("--words", type=int, default=50_000, help="Words per file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = pathlib.Path(tmp) / "corpus"
+        corpus.mkdir()
+        write_corpus(corpus, args.files, args.words)
+        paths = sorted(str(path) for path in corpus.iterdir())
+        timed("full recount", count_files_parallel, paths, 1)
+        with WordIndex(os.path.join(tmp, "index.sqlite")) as index:
+            timed("initial index", index.update, [str(corpus)])
+            (corpus / "doc00000.txt").write_text("changed file", encoding="utf-8")
+            timed("re-index (1 changed)", index.update, [str(corpus)])
+            timed("top 10 query", index.top, 10)
+            timed("single word query", index.frequency, "word42")
+
+
+if __name__ == "__main__":
+    main()
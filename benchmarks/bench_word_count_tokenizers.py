@@ -0,0 +1,57 @@
+"""Micro-benchmark of the word_count tokenizers on a fixed corpus.
+
+Usage::
+
+    python benchmarks/bench_word_count_tokenizers.py --words 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import pathlib
+import random
+import sys
+import timeit
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from word_count.main import TokenPipeline, count_words
+
+STOP_WORDS = frozenset({"the", "of", "and", "to", "a", "in"})
+
+
+def build_corpus(words: int) -> bytes:
+    rng = random.Random(42)
+    vocabulary = ["the", "of", "and", "to", "a", "in"] + [f"Word{idx}" for idx in range(20_000)]
+    lines = []
+    for _ in range(words // 12):
+        lines.append(" ".join(rng.choices(vocabulary, k=12)) + ",\n")
+    return "".join(lines).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000, help="Words in the generated corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.words)
+    text = corpus.decode("utf-8")
+    cases = {"count_words (whole text)": lambda: count_words(text)}
+    for tokenizer in ("regex", "finditer", "ascii"):
+        plain = TokenPipeline(tokenizer)
+        filtered = TokenPipeline(tokenizer, STOP_WORDS, min_length=2)
+        bigrams = TokenPipeline(tokenizer, STOP_WORDS, ngram=2)
+        cases[f"{tokenizer}"] = lambda p=plain: p.count(io.BytesIO(corpus))
+        cases[f"{tokenizer} + stop/min"] = lambda p=filtered: p.count(io.BytesIO(corpus))
+        cases[f"{tokenizer} + bigrams"] = lambda p=bigrams: p.count(io.BytesIO(corpus))
+
+    print(f"corpus: {len(corpus) / 2**20:.1f} MiB, {args.words} words")
+    for label, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{label:<26} {best:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
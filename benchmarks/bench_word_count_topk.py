@@ -0,0 +1,68 @@
+"""Benchmark: exact ``Counter`` top-N vs. the Space-Saving approximate mode.
+
+The generated text mixes a Zipf-like vocabulary with unique request IDs,
+like tokenized logs, so the exact vocabulary keeps growing.
+
+Usage::
+
+    python benchmarks/bench_word_count_topk.py --words 2000000 --capacity 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from word_count.main import count_file, top_words_approximate
+
+
+def write_sample_text(path: pathlib.Path, words: int) -> None:
+    rng = random.Random(42)
+    vocabulary = [f"word{idx}" for idx in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    with path.open("w", encoding="utf-8") as fh:
+        for line in range(words // 10):
+            tokens = rng.choices(vocabulary, weights, k=9)
+            fh.write(f"req{line:09d} {' '.join(tokens)}\n")
+
+
+def measure(label: str, function, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed:8.3f}s  peak {peak:8.1f} MiB")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=1_000_000, help="Words in the generated text")
+    parser.add_argument("--capacity", type=int, default=10_000, help="Words tracked by the sketch")
+    parser.add_argument("--top", type=int, default=10, help="Words compared between both modes")
+    parser.add_argument("--chunk-size", type=int, default=1 << 18, help="Characters read at a time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "bench.txt"
+        write_sample_text(path, args.words)
+        exact = measure("exact", count_file, str(path), args.chunk_size)
+        with path.open(encoding="utf-8") as fh:
+            approximate = measure(
+                "approximate", top_words_approximate, fh, args.top, args.capacity, args.chunk_size
+            )
+        for word, count, error in approximate:
+            print(f"  {word:<10} exact={exact[word]:<8} estimate={count:<8} error<={error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,34 @@
-"""Simple achievements tracker."""
+"""Simple achievements tracker.
+
+Achievements are kept in a SQLite database (``.db``, ``.sqlite`` or
+``.sqlite3`` files, see :class:`AchievementStore`) or, for older files, in a
+single JSON list that is rewritten on every change.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import sqlite3
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List
+
+STORE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+COMPACT_REMOVED_RATIO = 0.25
+COMPACT_MIN_REMOVED = 100
+"""A store is compacted once this share of the rows it held (and at least this many) were removed."""
+
+_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS achievements (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS achievements_by_title ON achievements (title);
+"""
 
 
 def load_achievements(file: Path) -> List[Dict[str, str]]:
@@ -21,35 +44,192 @@ def load_achievements(file: Path) -> List[Dict[str, str]]:
 
 
 def save_achievements(file: Path, achievements: List[Dict[str, str]]) -> None:
-    """Persist ``achievements`` to ``file`` in JSON format."""
-    file.write_text(json.dumps(achievements, indent=2, ensure_ascii=False), encoding="utf-8")
+    """Persist ``achievements`` to ``file`` in JSON format, replacing it atomically."""
+    temporary = file.with_name(file.name + ".tmp")
+    temporary.write_text(json.dumps(achievements, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(temporary, file)
+
+
+class AchievementStore:
+    """Achievements kept in a SQLite database at ``path``, indexed by title.
+
+    Every change is a single transaction, so the file is never left half
+    written.  Adding an achievement appends one row without reading the
+    others, iterating the store streams the rows in insertion order and
+    :meth:`find` and :meth:`remove` use the title index.  Space freed by
+    removals is reclaimed by :meth:`compact`, which :meth:`remove` runs
+    once enough rows have been removed since the last compaction.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_STORE_SCHEMA)
+
+    def __enter__(self) -> "AchievementStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for title, description in self._conn.execute("SELECT title, description FROM achievements ORDER BY id"):
+            yield {"title": title, "description": description}
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM achievements").fetchone()[0]
+
+    def add(self, title: str, description: str) -> None:
+        """Add an achievement with ``title`` and ``description``."""
+        with self._conn:
+            self._conn.execute("INSERT INTO achievements (title, description) VALUES (?, ?)", (title, description))
+
+    def import_achievements(self, achievements: List[Dict[str, str]]) -> int:
+        """Add ``achievements`` (as returned by :func:`load_achievements`) in one transaction."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO achievements (title, description) VALUES (?, ?)",
+                ((ach["title"], ach["description"]) for ach in achievements),
+            )
+        return len(achievements)
+
+    def find(self, title: str) -> List[Dict[str, str]]:
+        """Return the achievements named ``title``."""
+        rows = self._conn.execute("SELECT description FROM achievements WHERE title = ? ORDER BY id", (title,))
+        return [{"title": title, "description": description} for (description,) in rows]
+
+    def remove(self, title: str) -> int:
+        """Remove the achievements named ``title`` and return how many there were."""
+        with self._conn:
+            removed = self._conn.execute("DELETE FROM achievements WHERE title = ?", (title,)).rowcount
+            self._conn.execute(
+                "INSERT INTO meta VALUES ('removed', ?) ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                (removed,),
+            )
+        total_removed = self._conn.execute("SELECT value FROM meta WHERE key = 'removed'").fetchone()[0]
+        if total_removed >= COMPACT_MIN_REMOVED and total_removed >= COMPACT_REMOVED_RATIO * (
+            len(self) + total_removed
+        ):
+            self.compact()
+        return removed
+
+    def compact(self) -> None:
+        """Rewrite the database without the space left by removed achievements."""
+        with self._conn:
+            self._conn.execute("DELETE FROM meta WHERE key = 'removed'")
+        self._conn.execute("VACUUM")
+
+
+def is_store(file: Path) -> bool:
+    """Return True if ``file`` names a SQLite :class:`AchievementStore` rather than a JSON list."""
+    return file.suffix.lower() in STORE_SUFFIXES
+
+
+def open_store(file: Path) -> AchievementStore:
+    """Open the store at ``file``; a new store imports the JSON file of the same name, if any.
+
+    The import is built in a temporary file that only replaces ``file`` once
+    it has committed, so a failed import leaves no store behind and is tried
+    again next time.
+    """
+    legacy = file.with_suffix(".json")
+    if not file.exists() and legacy.exists():
+        temporary = file.with_name(file.name + ".tmp")
+        temporary.unlink(missing_ok=True)
+        try:
+            with AchievementStore(temporary) as store:
+                imported = store.import_achievements(load_achievements(legacy))
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+        os.replace(temporary, file)
+        print(f"Imported {imported} achievement(s) from '{legacy}'.")
+    return AchievementStore(file)
+
+
+def _load_without_store(file: Path) -> List[Dict[str, str]]:
+    """Return the achievements readable at ``file`` without creating a store there.
+
+    A store that does not exist yet reads as the JSON file it would import.
+    """
+    return load_achievements(file.with_suffix(".json") if is_store(file) else file)
 
 
 def list_achievements(file: Path) -> None:
-    """Print all achievements stored in ``file``."""
-    achievements = load_achievements(file)
-    if not achievements:
-        print("No achievements yet.")
-        return
+    """Print all achievements stored in ``file``; a missing store is not created."""
+    if is_store(file) and file.exists():
+        with open_store(file) as store:
+            _print_achievements(iter(store))
+    else:
+        _print_achievements(iter(_load_without_store(file)))
+
+
+def _print_achievements(achievements: Iterator[Dict[str, str]]) -> None:
+    empty = True
     for idx, ach in enumerate(achievements, 1):
+        empty = False
         print(f"{idx}. {ach['title']}: {ach['description']}")
+    if empty:
+        print("No achievements yet.")
 
 
 def add_achievement(file: Path, title: str, description: str) -> None:
     """Add a new achievement with ``title`` and ``description``."""
-    achievements = load_achievements(file)
-    achievements.append({"title": title, "description": description})
-    save_achievements(file, achievements)
+    if is_store(file):
+        with open_store(file) as store:
+            store.add(title, description)
+    else:
+        achievements = load_achievements(file)
+        achievements.append({"title": title, "description": description})
+        save_achievements(file, achievements)
     print(f"Achievement '{title}' added.")
 
 
+def find_achievements(file: Path, title: str) -> None:
+    """Print the achievements named ``title``; a missing store is not created."""
+    if is_store(file) and file.exists():
+        with open_store(file) as store:
+            found = store.find(title)
+    else:
+        found = [ach for ach in _load_without_store(file) if ach["title"] == title]
+    if not found:
+        print(f"No achievement named '{title}'.")
+    for ach in found:
+        print(f"{ach['title']}: {ach['description']}")
+
+
+def remove_achievement(file: Path, title: str) -> None:
+    """Remove the achievements named ``title``."""
+    if is_store(file):
+        with open_store(file) as store:
+            removed = store.remove(title)
+    else:
+        achievements = load_achievements(file)
+        kept = [ach for ach in achievements if ach["title"] != title]
+        removed = len(achievements) - len(kept)
+        if removed:
+            save_achievements(file, kept)
+    print(f"Removed {removed} achievement(s) named '{title}'.")
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Simple achievements tracker")
-    parser.add_argument("action", choices=["list", "add"], help="Action to perform")
-    parser.add_argument("title", nargs="?", help="Title for the achievement when using 'add'")
+    parser.add_argument(
+        "action", choices=["list", "add", "find", "remove", "compact"], help="Action to perform"
+    )
+    parser.add_argument("title", nargs="?", help="Title for the achievement when using 'add', 'find' or 'remove'")
     parser.add_argument("description", nargs="?", help="Description for the achievement when using 'add'")
-    parser.add_argument("--file", default="achievements.json", type=Path, help="Path to JSON file storing achievements")
+    parser.add_argument(
+        "--file",
+        default="achievements.db",
+        type=Path,
+        help="SQLite file (.db) or JSON file storing achievements (default: achievements.db, "
+        "importing achievements.json when created)",
+    )
     return parser.parse_args()
 
 
@@ -59,6 +239,21 @@ def main() -> None:
 
     if args.action == "list":
         list_achievements(file)
+    elif args.action == "compact":
+        if not is_store(file):
+            print("'compact' only applies to SQLite files")
+            return
+        with open_store(file) as store:
+            store.compact()
+        print(f"Compacted '{file}'.")
+    elif args.action in ("find", "remove"):
+        if not args.title:
+            print(f"'{args.action}' requires a title")
+            return
+        if args.action == "find":
+            find_achievements(file, args.title)
+        else:
+            remove_achievement(file, args.title)
     else:
         if not args.title or not args.description:
             print("'add' requires a title and description")
@@ -1,13 +1,42 @@
 """CSV to formatted Excel conversion tool."""
 
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from tkinter import Tk, filedialog
+import argparse
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import io
+import json
+import math
 import os
+import pickle
+import shutil
 import sys
+import tempfile
+import time
+import zipfile
+
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_MAX_BUFFERED_ROWS = 500_000
+DEFAULT_WIDTH_SAMPLE_ROWS = 100_000
+DEFAULT_SCHEMA_SAMPLE_ROWS = 10_000
+SCHEMA_SUFFIX = ".schema.json"
+CATEGORICAL_MAX_RATIO = 0.05
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+HEADER_FONT = Font(bold=True, color="FFFFFF", name="Calibri")
+HEADER_FILL = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
 
 def select_csv_file_dialog():
     """Opens a Tkinter dialog to select a CSV file."""
@@ -24,16 +53,21 @@ def select_csv_file_dialog():
         sys.exit(0) 
     return file_path
 
-def apply_excel_formatting(worksheet):
-    """Applies header formatting and auto-adjusts column widths."""
-    header_font = Font(bold=True, color="FFFFFF", name="Calibri")
-    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-    
+def apply_excel_formatting(worksheet, column_widths=None):
+    """
+    Applies header formatting and auto-adjusts column widths.
 
+    When ``column_widths`` is given (e.g. from a ``ColumnWidthEstimator``) the
+    widths are applied directly and the cells are not scanned again.
+    """
     for cell in worksheet[1]: 
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = HEADER_ALIGNMENT
+
+    if column_widths is not None:
+        _set_column_widths(worksheet, column_widths)
+        return
 
     for col_idx, column in enumerate(worksheet.columns, 1):
         max_length = 0
@@ -50,55 +84,583 @@ def apply_excel_formatting(worksheet):
         worksheet.column_dimensions[column_letter].width = adjusted_width
 
 
-def generate_excel_from_csv(csv_file_path, output_excel_path, split_column_name=None):
+def sanitize_sheet_name(name):
+    """Replaces characters Excel rejects in sheet titles and truncates to 31 chars."""
+    invalid_chars = ['*', ':', '/', '\\', '?', '[', ']']
+    for char in invalid_chars:
+        name = name.replace(char, '_')
+    return name[:31]
+
+
+def unique_sheet_name(value, existing_names):
+    """Returns the sheet title for ``value``, suffixed with a stable hash if already taken."""
+    sheet_name = sanitize_sheet_name(str(value))
+    if sheet_name in existing_names:
+        sheet_name = f"{sheet_name}_{pd.util.hash_pandas_object(pd.Series(value)).sum() % 1000}" # Adiciona um hash para unicidade
+    return sheet_name
+
+
+def _print_csv_read_error(csv_file_path, error):
+    """Prints the user-facing message for an error raised while reading the CSV."""
+    if isinstance(error, FileNotFoundError):
+        print(f"Erro: Arquivo CSV não encontrado em '{csv_file_path}'.")
+    elif isinstance(error, pd.errors.EmptyDataError):
+        print(f"Erro: O arquivo CSV '{csv_file_path}' está vazio.")
+    elif isinstance(error, pd.errors.ParserError):
+        print(f"Erro: Não foi possível parsear o arquivo CSV '{csv_file_path}'. Verifique o formato.")
+    else:
+        print(f"Ocorreu um erro inesperado ao ler o CSV: {error}")
+
+
+def _save_workbook(workbook, output_excel_path, parts=None):
     """
-    Reads a CSV, optionally splits data by a column into sheets,
-    formats, and saves as an Excel file.
+    Saves ``workbook`` reporting success or failure to the user.
+
+    ``parts`` lists ``(worksheet, part_path)`` pairs whose sheet contents were
+    built by worker processes; see ``_write_merged_workbook``.
     """
     try:
-        
-        if not csv_file_path.lower().endswith(".csv"):
-            print(f"Erro: O arquivo '{csv_file_path}' não parece ser um CSV.")
-            return False
-        df = pd.read_csv(csv_file_path)
-    except FileNotFoundError:
-        print(f"Erro: Arquivo CSV não encontrado em '{csv_file_path}'.")
+        if parts:
+            _write_merged_workbook(workbook, parts, output_excel_path)
+        else:
+            workbook.save(output_excel_path)
+        print(f"Arquivo Excel salvo com sucesso em: {output_excel_path}")
+        return True
+    except Exception as e:
+        print(f"Erro ao salvar o arquivo Excel: {e}")
+        print("Verifique se o arquivo não está aberto em outro programa e se você tem permissão para escrever no local.")
         return False
-    except pd.errors.EmptyDataError:
-        print(f"Erro: O arquivo CSV '{csv_file_path}' está vazio.")
+
+
+class SchemaMismatchError(ValueError):
+    """Raised when a CSV no longer fits the dtypes of its cached schema."""
+
+
+def schema_path(csv_file_path):
+    """Returns the path of the sidecar schema file for ``csv_file_path``."""
+    return csv_file_path + SCHEMA_SUFFIX
+
+
+def csv_header_hash(csv_file_path):
+    """Returns the SHA-256 of the CSV's header line, used as the schema cache key."""
+    with open(csv_file_path, "rb") as fh:
+        return hashlib.sha256(fh.readline()).hexdigest()
+
+
+def _infer_column_dtype(values, prefer_categorical=False):
+    """
+    Picks a dtype for a column from its sample ``values`` read as text.
+
+    Integers become ``int64``, or the slower nullable ``Int64`` when the
+    sample has missing values, so gaps do not turn IDs into floats. Numbers
+    with leading zeros (or too many digits) stay text. Text columns become ``category`` when requested or when they have
+    few distinct values. Returns None for columns that are empty in the
+    sample, leaving them to pandas' default inference.
+    """
+    has_missing = values.isna().any()
+    values = values.dropna().str.strip()
+    if values.empty:
+        return None
+    if not values.str.match(r"[+-]?0\d").any():
+        if values.str.fullmatch(r"[+-]?\d{1,18}").all():
+            return "Int64" if has_missing else "int64"
+        if pd.to_numeric(values, errors="coerce").notna().all():
+            return "float64"
+    if values.str.lower().isin(["true", "false"]).all():
+        return "boolean"
+    if prefer_categorical or values.nunique() <= CATEGORICAL_MAX_RATIO * len(values):
+        return "category"
+    return "str"
+
+
+def infer_csv_schema(csv_file_path, sample_rows=DEFAULT_SCHEMA_SAMPLE_ROWS, categorical_columns=()):
+    """Infers a ``{column: dtype}`` mapping from the first ``sample_rows`` rows of the CSV."""
+    sample = pd.read_csv(csv_file_path, nrows=sample_rows, dtype=str)
+    dtypes = {}
+    for column in sample.columns:
+        dtype = _infer_column_dtype(sample[column], column in categorical_columns)
+        if dtype is not None:
+            dtypes[column] = dtype
+    return dtypes
+
+
+def load_csv_schema(csv_file_path, sample_rows=DEFAULT_SCHEMA_SAMPLE_ROWS, categorical_columns=()):
+    """
+    Returns the dtypes for ``csv_file_path`` from its sidecar schema file,
+    inferring and caching them first if the file is missing, was written for
+    a different header, or lacks one of the ``categorical_columns``.
+    """
+    header_hash = csv_header_hash(csv_file_path)
+    categorical_columns = sorted(categorical_columns)
+    try:
+        with open(schema_path(csv_file_path), encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if (cached["header_sha256"] == header_hash
+                and set(categorical_columns) <= set(cached["categorical_columns"])):
+            return cached["dtypes"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    dtypes = infer_csv_schema(csv_file_path, sample_rows, categorical_columns)
+    _save_csv_schema(csv_file_path, header_hash, categorical_columns, dtypes)
+    return dtypes
+
+
+def _save_csv_schema(csv_file_path, header_hash, categorical_columns, dtypes):
+    try:
+        with open(schema_path(csv_file_path), "w", encoding="utf-8") as fh:
+            json.dump({
+                "header_sha256": header_hash,
+                "categorical_columns": categorical_columns,
+                "dtypes": dtypes,
+            }, fh, indent=2, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+# Next wider dtype for a cached column whose values no longer fit.
+_WIDER_DTYPE = {"int64": "Int64", "Int64": "float64", "float64": "str", "boolean": "str"}
+
+
+def _dtype_fits(dtype, values):
+    """True if every one of ``values`` (read as text) can be read as ``dtype``."""
+    has_missing = values.isna().any()
+    values = values.dropna().str.strip()
+    if dtype in ("int64", "Int64", "float64") and values.str.match(r"[+-]?0\d").any():
         return False
-    except pd.errors.ParserError:
-        print(f"Erro: Não foi possível parsear o arquivo CSV '{csv_file_path}'. Verifique o formato.")
+    if dtype == "int64":
+        return not has_missing and values.str.fullmatch(r"[+-]?\d{1,18}").all()
+    if dtype == "Int64":
+        return values.str.fullmatch(r"[+-]?\d{1,18}").all()
+    if dtype == "float64":
+        return pd.to_numeric(values, errors="coerce").notna().all()
+    if dtype == "boolean":
+        return values.str.lower().isin(["true", "false"]).all()
+    return True
+
+
+def widen_csv_schema(csv_file_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Widens the cached dtypes of ``csv_file_path`` that do not fit the whole
+    file (``int64`` to ``Int64`` to ``float64`` to ``str``), reading only
+    those columns, and saves the result. Returns the new dtypes, or None if
+    there is no cached schema or no column needed widening.
+    """
+    try:
+        with open(schema_path(csv_file_path), encoding="utf-8") as fh:
+            cached = json.load(fh)
+        dtypes = dict(cached["dtypes"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    columns = [column for column, dtype in dtypes.items() if dtype in _WIDER_DTYPE]
+    if not columns:
+        return None
+    changed = False
+    for chunk in pd.read_csv(csv_file_path, dtype=str, usecols=columns, chunksize=chunksize):
+        for column in columns:
+            while dtypes[column] in _WIDER_DTYPE and not _dtype_fits(dtypes[column], chunk[column]):
+                dtypes[column] = _WIDER_DTYPE[dtypes[column]]
+                changed = True
+    if not changed:
+        return None
+    _save_csv_schema(csv_file_path, cached["header_sha256"], cached["categorical_columns"], dtypes)
+    return dtypes
+
+
+def _is_schema_mismatch(error, read_options):
+    """True if ``error`` came from converting values to the schema's dtypes."""
+    return (
+        "dtype" in read_options
+        and isinstance(error, (ValueError, TypeError))
+        and not isinstance(error, (pd.errors.ParserError, pd.errors.EmptyDataError))
+    )
+
+
+def _excel_ready(frame):
+    """Replaces ``pd.NA`` in nullable columns with ``None``, which openpyxl can write."""
+    converted = None
+    for column in frame.columns:
+        series = frame[column]
+        if getattr(series.dtype, "na_value", None) is pd.NA and series.hasnans:
+            if converted is None:
+                converted = frame.copy()
+            converted[column] = series.astype(object).where(series.notna(), None)
+    return frame if converted is None else converted
+
+
+class ColumnWidthEstimator:
+    """
+    Works out column widths from the source data while it is read.
+
+    Each ``update`` measures a whole frame with vectorized string lengths, so
+    no worksheet cells have to be read back. By default a column is as wide
+    as its longest value. ``sample_rows`` stops measuring after that many
+    rows, and ``quantile`` sizes each column to that quantile of the value
+    lengths (over a sample of ``DEFAULT_WIDTH_SAMPLE_ROWS`` rows unless told
+    otherwise) so a few outliers do not produce huge columns.
+    """
+
+    def __init__(self, columns, sample_rows=None, quantile=None):
+        self.columns = list(columns)
+        if quantile is not None and sample_rows is None:
+            sample_rows = DEFAULT_WIDTH_SAMPLE_ROWS
+        self.sample_rows = sample_rows
+        self.quantile = quantile
+        self.rows_seen = 0
+        self._max_lengths = [len(str(column)) for column in self.columns]
+        self._lengths = [[] for _ in self.columns]
+
+    @property
+    def complete(self):
+        """True once the configured sample has been fully measured."""
+        return self.sample_rows is not None and self.rows_seen >= self.sample_rows
+
+    def update(self, frame):
+        """Measures the values of ``frame``, up to the remaining sample size."""
+        if self.complete:
+            return
+        if self.sample_rows is not None:
+            frame = frame.iloc[:self.sample_rows - self.rows_seen]
+        self.rows_seen += len(frame)
+        for idx, column in enumerate(self.columns):
+            lengths = frame[column].dropna().astype(str).str.len()
+            if lengths.empty:
+                continue
+            if self.quantile is None:
+                self._max_lengths[idx] = max(self._max_lengths[idx], int(lengths.max()))
+            else:
+                self._lengths[idx].append(lengths)
+
+    def widths(self):
+        """Returns the width of each column, padded like ``apply_excel_formatting``."""
+        widths = []
+        for idx, column in enumerate(self.columns):
+            max_length = self._max_lengths[idx]
+            if self._lengths[idx]:
+                value_length = pd.concat(self._lengths[idx]).quantile(self.quantile)
+                max_length = max(max_length, math.ceil(value_length))
+            widths.append(max_length + 2)
+        return widths
+
+
+def _set_column_widths(worksheet, column_widths):
+    for col_idx, width in enumerate(column_widths, 1):
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = width
+
+
+def _create_streaming_sheet(workbook, title, columns, column_widths):
+    """Creates a write-only sheet with ``column_widths`` and writes the styled header.
+
+    Write-only sheets emit column settings before the first row, so widths
+    have to be known when the sheet is opened.
+    """
+    worksheet = workbook.create_sheet(title=title)
+    _set_column_widths(worksheet, column_widths)
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+    return worksheet
+
+
+def _append_frame(worksheet, frame):
+    """Appends the rows of ``frame`` to a write-only ``worksheet``."""
+    for row in dataframe_to_rows(_excel_ready(frame), index=False, header=False):
+        worksheet.append(row)
+
+
+class SheetPartitioner:
+    """
+    Groups rows by ``column`` into per-sheet buffers in a single pass.
+
+    Each added frame is split with one ``groupby`` instead of one boolean
+    mask per distinct value. Partitions keep the order in which their value
+    first appeared. Once more than ``max_buffered_rows`` rows are held in
+    memory, every buffer is pickled into a shared temporary spill file and
+    read back lazily by ``partitions``.
+
+    If ``width_estimator`` is given it is called with the frame's columns to
+    create one ``ColumnWidthEstimator`` per partition, kept up to date in
+    ``estimators`` as rows arrive.
+
+    With ``spill_dir`` the spill file is a named file in that directory, so
+    other processes can read partitions from it (see ``spilled_partitions``).
+    """
+
+    def __init__(self, column, max_buffered_rows=DEFAULT_MAX_BUFFERED_ROWS, width_estimator=None, spill_dir=None):
+        self.column = column
+        self.max_buffered_rows = max_buffered_rows
+        self.width_estimator = width_estimator
+        self.spill_dir = spill_dir
+        self.estimators = {}
+        self._buffers = {}
+        self._spilled = {}
+        self._buffered_rows = 0
+        self._spill_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, frame):
+        """Distributes the rows of ``frame`` among the partition buffers."""
+        for value, group in frame.groupby(self.column, sort=False, observed=True):
+            self._buffers.setdefault(value, []).append(group)
+            self._buffered_rows += len(group)
+            if self.width_estimator is not None:
+                if value not in self.estimators:
+                    self.estimators[value] = self.width_estimator(frame.columns)
+                self.estimators[value].update(group)
+        if self._buffered_rows > self.max_buffered_rows:
+            self._spill()
+
+    def _spill(self):
+        if self._spill_file is None:
+            if self.spill_dir is None:
+                self._spill_file = tempfile.TemporaryFile()
+            else:
+                self._spill_file = tempfile.NamedTemporaryFile(dir=self.spill_dir, suffix=".spill", delete=False)
+        self._spill_file.seek(0, os.SEEK_END)
+        for value, frames in self._buffers.items():
+            offsets = self._spilled.setdefault(value, [])
+            for frame in frames:
+                offsets.append(self._spill_file.tell())
+                pickle.dump(frame, self._spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+            frames.clear()
+        self._buffered_rows = 0
+
+    def _frames(self, value):
+        for offset in self._spilled.get(value, ()):
+            self._spill_file.seek(offset)
+            yield pickle.load(self._spill_file)
+        yield from self._buffers[value]
+
+    def partitions(self):
+        """Yields ``(value, frames)`` pairs where ``frames`` iterates the partition's DataFrames."""
+        for value in self._buffers:
+            yield value, self._frames(value)
+
+    def spilled_partitions(self):
+        """
+        Spills every buffer and returns the spill file path with a list of
+        ``(value, offsets)`` pairs; ``read_spilled_frames`` turns them back
+        into DataFrames. Requires ``spill_dir``.
+        """
+        if self.spill_dir is None:
+            raise ValueError("spilled_partitions requires a spill_dir.")
+        self._spill()
+        self._spill_file.flush()
+        return self._spill_file.name, [(value, list(self._spilled.get(value, ()))) for value in self._buffers]
+
+    def close(self):
+        """Releases the spill file, if any."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            if self.spill_dir is not None:
+                os.remove(self._spill_file.name)
+            self._spill_file = None
+
+
+def read_spilled_frames(spill_path, offsets):
+    """Yields the DataFrames pickled at ``offsets`` of a ``SheetPartitioner`` spill file, one at a time."""
+    with open(spill_path, "rb") as spill_file:
+        for offset in offsets:
+            spill_file.seek(offset)
+            yield pickle.load(spill_file)
+
+
+def _write_merged_workbook(workbook, parts, output_excel_path):
+    """
+    Saves ``workbook`` as a skeleton next to the parts and writes
+    ``output_excel_path`` with each skeleton sheet replaced by the sheet of
+    the matching single-sheet part workbook.
+
+    openpyxl writes strings inline, so a sheet only refers to the workbook's
+    style table, which is the same in every part because all of them style
+    just the header. The tables are still compared before merging.
+    """
+    skeleton_path = os.path.join(os.path.dirname(parts[0][1]), "skeleton.xlsx")
+    workbook.save(skeleton_path)
+    replacements = {worksheet.path.lstrip("/"): part_path for worksheet, part_path in parts}
+    with zipfile.ZipFile(skeleton_path) as skeleton, \
+            zipfile.ZipFile(output_excel_path, "w", zipfile.ZIP_DEFLATED) as target:
+        styles = skeleton.read("xl/styles.xml")
+        for item in skeleton.infolist():
+            part_path = replacements.get(item.filename)
+            if part_path is None:
+                target.writestr(item, skeleton.read(item.filename))
+                continue
+            with zipfile.ZipFile(part_path) as part:
+                if part.read("xl/styles.xml") != styles:
+                    raise ValueError(f"A parte '{part_path}' usa estilos diferentes do arquivo final.")
+                with part.open("xl/worksheets/sheet1.xml") as source, target.open(item.filename, "w") as dest:
+                    shutil.copyfileobj(source, dest)
+
+
+def _build_partition_part(part_path, columns, spill_path, offsets, column_widths):
+    """
+    Worker entry point: writes one partition as a single-sheet workbook at
+    ``part_path``, streaming its frames from the spill file one at a time.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = _create_streaming_sheet(workbook, "Dados", columns, column_widths)
+    for frame in read_spilled_frames(spill_path, offsets):
+        _append_frame(worksheet, frame)
+    workbook.save(part_path)
+    return part_path
+
+
+def _build_partitions_in_parallel(workbook, partitioner, columns, parts_dir, workers):
+    """
+    Creates a header-only sheet in ``workbook`` per partition and has a
+    process pool build the full sheets. Returns ``(worksheet, part_path)``
+    pairs for ``_write_merged_workbook``. At most ``2 * workers`` partitions
+    are in flight at once.
+
+    The workers only receive the spill file path and offsets of their
+    partition, so no partition is ever held whole in memory.
+    """
+    parts = []
+    spill_path, partitions = partitioner.spilled_partitions()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for index, (value, offsets) in enumerate(partitions):
+            sheet_name = unique_sheet_name(value, workbook.sheetnames)
+            column_widths = partitioner.estimators[value].widths()
+            worksheet = _create_streaming_sheet(workbook, sheet_name, columns, column_widths)
+            part_path = os.path.join(parts_dir, f"part{index}.xlsx")
+            pending.append(executor.submit(
+                _build_partition_part, part_path, columns, spill_path, offsets, column_widths
+            ))
+            parts.append((worksheet, part_path))
+            if len(pending) >= 2 * workers:
+                pending.popleft().result()
+        for future in pending:
+            future.result()
+    return parts
+
+
+def _write_streaming_partition(workbook, sheet_name, columns, frames, column_widths):
+    """Creates a write-only sheet named ``sheet_name`` holding every frame of a partition."""
+    worksheet = _create_streaming_sheet(workbook, sheet_name, columns, column_widths)
+    for frame in frames:
+        _append_frame(worksheet, frame)
+
+
+def _generate_excel_streaming(csv_file_path, output_excel_path, split_column_name, chunksize,
+                              max_buffered_rows=DEFAULT_MAX_BUFFERED_ROWS, width_sample_rows=None,
+                              width_quantile=None, workers=None, read_options=None):
+    """
+    Streaming variant of ``generate_excel_from_csv``: reads the CSV in chunks
+    of ``chunksize`` rows and appends them to a write-only workbook, so memory
+    stays bounded by the chunk size instead of the file size.
+
+    In split mode the chunks first go through a ``SheetPartitioner`` (which
+    spills to disk past ``max_buffered_rows``), and each partition is then
+    written to its sheet in one contiguous run, sized from widths measured
+    over the whole partition while it was read. Without a split column the
+    sheet has to be opened before the data ends, so its widths come from the
+    first ``width_sample_rows`` rows (one chunk by default), which are held
+    back until measured.
+
+    With ``workers`` greater than one, the partitions are turned into sheets
+    by a process pool and merged into the final workbook. ``read_options``
+    are passed on to ``pd.read_csv``.
+    """
+    def new_estimator(columns):
+        return ColumnWidthEstimator(columns, width_sample_rows, width_quantile)
+
+    workbook = Workbook(write_only=True)
+    parallel = bool(workers and workers > 1)
+    parts_dir = tempfile.mkdtemp(prefix="csvexcel_") if parallel else None
+    partitioner = SheetPartitioner(split_column_name, max_buffered_rows, new_estimator, spill_dir=parts_dir)
+    columns = None
+    split = False
+    worksheet = None
+    pending = []
+    parts = None
+    try:
+        with partitioner, pd.read_csv(csv_file_path, chunksize=chunksize, **(read_options or {})) as reader:
+            for chunk in reader:
+                if columns is None:
+                    columns = list(chunk.columns)
+                    split = bool(split_column_name) and split_column_name in chunk.columns
+                    if not split:
+                        if chunk.empty:
+                            print("Warning: O CSV está vazio, a planilha 'Dados' será criada sem dados.")
+                        estimator = ColumnWidthEstimator(columns, width_sample_rows or chunksize, width_quantile)
+                if split:
+                    partitioner.add(chunk)
+                elif worksheet is not None:
+                    _append_frame(worksheet, chunk)
+                else:
+                    estimator.update(chunk)
+                    pending.append(chunk)
+                    if estimator.complete:
+                        worksheet = _create_streaming_sheet(workbook, "Dados", columns, estimator.widths())
+                        for frame in pending:
+                            _append_frame(worksheet, frame)
+                        pending = []
+
+            if split:
+                if parallel:
+                    parts = _build_partitions_in_parallel(workbook, partitioner, columns, parts_dir, workers)
+                else:
+                    for value, frames in partitioner.partitions():
+                        sheet_name = unique_sheet_name(value, workbook.sheetnames)
+                        column_widths = partitioner.estimators[value].widths()
+                        _write_streaming_partition(workbook, sheet_name, columns, frames, column_widths)
+                if not workbook.sheetnames:
+                    _create_streaming_sheet(workbook, "Dados", columns, new_estimator(columns).widths())
+            elif worksheet is None:
+                worksheet = _create_streaming_sheet(workbook, "Dados", columns, estimator.widths())
+                for frame in pending:
+                    _append_frame(worksheet, frame)
+        return _save_workbook(workbook, output_excel_path, parts)
+    except Exception as e:
+        if _is_schema_mismatch(e, read_options or {}):
+            raise SchemaMismatchError(str(e)) from e
+        _print_csv_read_error(csv_file_path, e)
         return False
+    finally:
+        if parts_dir is not None:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+def _generate_excel_in_memory(csv_file_path, output_excel_path, split_column_name, width_sample_rows,
+                              width_quantile, read_options):
+    """Default ``generate_excel_from_csv`` path: loads the whole CSV into one DataFrame."""
+    try:
+        df = _excel_ready(pd.read_csv(csv_file_path, **read_options))
     except Exception as e:
-        print(f"Ocorreu um erro inesperado ao ler o CSV: {e}")
+        if _is_schema_mismatch(e, read_options):
+            raise SchemaMismatchError(str(e)) from e
+        _print_csv_read_error(csv_file_path, e)
         return False
 
+    def column_widths(frame):
+        estimator = ColumnWidthEstimator(frame.columns, width_sample_rows, width_quantile)
+        estimator.update(frame)
+        return estimator.widths()
+
     workbook = Workbook()
     default_sheet_removed = False
 
     if split_column_name and split_column_name in df.columns:
 
-        def sanitize_sheet_name(name):
-            invalid_chars = ['*', ':', '/', '\\', '?', '[', ']']
-            for char in invalid_chars:
-                name = name.replace(char, '_')
-            return name[:31]
-
-        unique_values = df[split_column_name].unique()
-        for value in unique_values:
-            sheet_name = sanitize_sheet_name(str(value))
-            if sheet_name in workbook.sheetnames:
-                sheet_name = f"{sheet_name}_{pd.util.hash_pandas_object(pd.Series(value)).sum() % 1000}" # Adiciona um hash para unicidade
-
-            value_df = df[df[split_column_name] == value]
-
-            if not value_df.empty:
-                worksheet = workbook.create_sheet(title=sheet_name)
-                for r_idx, row in enumerate(dataframe_to_rows(value_df, index=False, header=True), 1):
-                    for c_idx, cell_value in enumerate(row, 1):
-                        worksheet.cell(row=r_idx, column=c_idx, value=cell_value)
-                apply_excel_formatting(worksheet)
+        for value, value_df in df.groupby(split_column_name, sort=False, observed=True):
+            sheet_name = unique_sheet_name(value, workbook.sheetnames)
+            worksheet = workbook.create_sheet(title=sheet_name)
+            for r_idx, row in enumerate(dataframe_to_rows(value_df, index=False, header=True), 1):
+                for c_idx, cell_value in enumerate(row, 1):
+                    worksheet.cell(row=r_idx, column=c_idx, value=cell_value)
+            apply_excel_formatting(worksheet, column_widths(value_df))
 
         if workbook.sheetnames != ["Sheet"] and "Sheet" in workbook.sheetnames:
             del workbook["Sheet"]
@@ -114,12 +676,12 @@ def generate_excel_from_csv(csv_file_path, output_excel_path, split_column_name=
             if not df.columns.empty: 
                  for c_idx, col_name in enumerate(df.columns, 1):
                      worksheet.cell(row=1, column=c_idx, value=col_name)
-            apply_excel_formatting(worksheet)
+            apply_excel_formatting(worksheet, column_widths(df))
         else:
             for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), 1):
                 for c_idx, cell_value in enumerate(row, 1):
                     worksheet.cell(row=r_idx, column=c_idx, value=cell_value)
-            apply_excel_formatting(worksheet)
+            apply_excel_formatting(worksheet, column_widths(df))
     
   
     if not default_sheet_removed and len(workbook.sheetnames) > 1 and "Sheet" in workbook.sheetnames and workbook["Sheet"].max_row == 1 and workbook["Sheet"].max_column == 1 and workbook["Sheet"].cell(1,1).value is None:
@@ -129,16 +691,220 @@ def generate_excel_from_csv(csv_file_path, output_excel_path, split_column_name=
         except KeyError:
             pass 
 
+    return _save_workbook(workbook, output_excel_path)
+
+
+def generate_excel_from_csv(csv_file_path, output_excel_path, split_column_name=None,
+                            streaming=False, chunksize=DEFAULT_CHUNKSIZE,
+                            max_buffered_rows=DEFAULT_MAX_BUFFERED_ROWS, width_sample_rows=None,
+                            width_quantile=None, workers=None, schema=False):
+    """
+    Reads a CSV, optionally splits data by a column into sheets,
+    formats, and saves as an Excel file.
+
+    With ``streaming=True`` the CSV is read ``chunksize`` rows at a time and
+    written through a write-only workbook, keeping peak memory flat for
+    arbitrarily large inputs. When splitting in streaming mode, at most
+    ``max_buffered_rows`` partitioned rows are kept in memory before they are
+    spilled to a temporary file.
+
+    Column widths are computed from the data as it is read (see
+    ``ColumnWidthEstimator``); ``width_sample_rows`` and ``width_quantile``
+    limit the measurement to a sample or size columns to a length quantile.
+
+    With a split column and ``workers`` greater than one, the data is read
+    the streaming way and each sheet is built in a separate process.
+
+    With ``schema=True`` the columns are read with explicit dtypes inferred
+    once from a sample and cached next to the CSV (see ``load_csv_schema``),
+    using the pyarrow engine for whole-file reads when it is installed. If
+    the data no longer fits the cached dtypes, the offending columns are
+    widened in the cache (see ``widen_csv_schema``) and the CSV is read
+    again; only if that does not help is the schema discarded and the CSV
+    read with default inference.
+    """
+    if not csv_file_path.lower().endswith(".csv"):
+        print(f"Erro: O arquivo '{csv_file_path}' não parece ser um CSV.")
+        return False
+
+    use_streaming = streaming or (split_column_name and workers and workers > 1)
+    read_options = {}
+    if schema:
+        categorical_columns = [split_column_name] if split_column_name else []
+        try:
+            read_options["dtype"] = load_csv_schema(csv_file_path, categorical_columns=categorical_columns)
+        except Exception:
+            pass  # O erro de leitura é reportado abaixo, sem o esquema.
+        if read_options and not use_streaming and importlib.util.find_spec("pyarrow") is not None:
+            read_options["engine"] = "pyarrow"
+
+    def generate(read_options):
+        if use_streaming:
+            return _generate_excel_streaming(
+                csv_file_path, output_excel_path, split_column_name, chunksize, max_buffered_rows,
+                width_sample_rows, width_quantile, workers, read_options,
+            )
+        return _generate_excel_in_memory(
+            csv_file_path, output_excel_path, split_column_name, width_sample_rows, width_quantile,
+            read_options,
+        )
+
     try:
-        workbook.save(output_excel_path)
-        print(f"Arquivo Excel salvo com sucesso em: {output_excel_path}")
-        return True
-    except Exception as e:
-        print(f"Erro ao salvar o arquivo Excel: {e}")
-        print("Verifique se o arquivo não está aberto em outro programa e se você tem permissão para escrever no local.")
+        return generate(read_options)
+    except SchemaMismatchError as e:
+        mismatch = e
+    try:
+        widened = widen_csv_schema(csv_file_path, chunksize)
+    except Exception:
+        widened = None
+    if widened is not None:
+        print(f"Aviso: os dados não correspondem ao esquema em cache ({mismatch}). Ampliando os tipos do esquema.")
+        try:
+            return generate({**read_options, "dtype": widened})
+        except SchemaMismatchError as e:
+            mismatch = e
+    print(f"Aviso: os dados não correspondem ao esquema em cache ({mismatch}). Lendo sem tipos explícitos.")
+    with contextlib.suppress(OSError):
+        os.remove(schema_path(csv_file_path))
+    return generate({})
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting one CSV in ``convert_csv_files``."""
+
+    csv_path: str
+    output_path: str
+    success: bool
+    seconds: float
+    messages: str = ""
+
+
+def collect_csv_files(sources):
+    """
+    Expands ``sources`` (files, directories or glob patterns) into a sorted,
+    de-duplicated list of CSV paths. Directories contribute their ``*.csv``
+    files.
+    """
+    found = set()
+    for source in sources:
+        if os.path.isdir(source):
+            found.update(glob.glob(os.path.join(source, "*.csv")))
+        elif glob.has_magic(source):
+            found.update(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+        else:
+            found.add(source)
+    return sorted(found)
+
+
+def default_output_path(csv_file_path, output_dir=None):
+    """Returns ``<nome>_formatado.xlsx`` next to the CSV or inside ``output_dir``."""
+    base_name = os.path.splitext(os.path.basename(csv_file_path))[0]
+    if output_dir is None:
+        output_dir = os.path.dirname(csv_file_path)
+    return os.path.join(output_dir, f"{base_name}_formatado.xlsx")
+
+
+def _convert_one(csv_file_path, output_excel_path, options):
+    """Worker entry point for ``convert_csv_files``; captures the printed messages."""
+    messages = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(messages):
+        try:
+            success = generate_excel_from_csv(csv_file_path, output_excel_path, **options)
+        except Exception as e:
+            print(f"Ocorreu um erro inesperado: {e}")
+            success = False
+    return ConversionResult(
+        csv_file_path, output_excel_path, success, time.perf_counter() - start, messages.getvalue().strip()
+    )
+
+
+def convert_csv_files(sources, output_dir=None, processes=None, **options):
+    """
+    Converts every CSV matched by ``sources`` using a process pool of
+    ``processes`` processes (all cores by default) and returns one
+    ``ConversionResult`` per file, in path order. ``options`` are passed on
+    to ``generate_excel_from_csv``.
+
+    CSVs with the same name in different directories would write the same
+    file inside ``output_dir``: only the first one is converted and the
+    others are reported as failures.
+    """
+    csv_files = collect_csv_files(sources)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    outputs = [default_output_path(csv_file, output_dir) for csv_file in csv_files]
+    if not csv_files:
+        return []
+    owners = {}
+    results = {}
+    for csv_file, output in zip(csv_files, outputs):
+        owner = owners.setdefault(os.path.normcase(os.path.abspath(output)), csv_file)
+        if owner != csv_file:
+            results[csv_file] = ConversionResult(
+                csv_file, output, False, 0.0,
+                f"Erro: a saída '{output}' já é gerada a partir de '{owner}'.",
+            )
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            csv_file: executor.submit(_convert_one, csv_file, output, options)
+            for csv_file, output in zip(csv_files, outputs)
+            if csv_file not in results
+        }
+        results.update((csv_file, future.result()) for csv_file, future in futures.items())
+    return [results[csv_file] for csv_file in csv_files]
+
+
+def print_conversion_report(results):
+    """Prints per-file timings and failures for ``convert_csv_files`` results."""
+    for result in results:
+        status = "OK" if result.success else "FALHA"
+        print(f"{status:<6}{result.seconds:8.2f}s  {result.csv_path} -> {result.output_path}")
+        if not result.success and result.messages:
+            for line in result.messages.splitlines():
+                print(f"        {line}")
+    failures = sum(not result.success for result in results)
+    print(f"{len(results)} arquivo(s) processado(s), {failures} falha(s).")
+
+
+def parse_args(argv=None):
+    """Processa argumentos da linha de comando para o modo sem interface."""
+    parser = argparse.ArgumentParser(description="Converte arquivos CSV em planilhas Excel formatadas.")
+    parser.add_argument("entradas", nargs="*",
+                        help="Arquivos CSV, diretórios ou padrões glob. Sem entradas, abre o modo interativo.")
+    parser.add_argument("--saida", help="Diretório de saída. Padrão: o diretório de cada CSV.")
+    parser.add_argument("--dividir", help="Coluna usada para dividir os dados em abas.")
+    parser.add_argument("--streaming", action="store_true", help="Lê o CSV em blocos com memória constante.")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Linhas por bloco no modo streaming.")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Número de arquivos convertidos em paralelo. Padrão: todos os núcleos.")
+    parser.add_argument("--processos-abas", type=int, default=None,
+                        help="Processos usados para gerar as abas de um mesmo arquivo ao dividir.")
+    parser.add_argument("--esquema", action="store_true",
+                        help="Lê com tipos explícitos, inferidos uma vez e guardados em '<csv>.schema.json'.")
+    return parser.parse_args(argv)
+
+
+def run_batch(args):
+    """Runs the headless batch conversion described by ``args``; returns True if every file succeeded."""
+    results = convert_csv_files(
+        args.entradas,
+        output_dir=args.saida,
+        processes=args.processos,
+        split_column_name=args.dividir,
+        streaming=args.streaming,
+        chunksize=args.chunksize,
+        workers=args.processos_abas,
+        schema=args.esquema,
+    )
+    if not results:
+        print("Nenhum arquivo CSV encontrado.")
         return False
+    print_conversion_report(results)
+    return all(result.success for result in results)
+
 
-def main():
+def interactive_main():
     print("--- Ferramenta de Conversão CSV para Excel Formatado ---")
     
     csv_file = select_csv_file_dialog()
@@ -146,20 +912,23 @@ def main():
         print(f"Erro: O caminho '{csv_file}' não é um arquivo válido.")
         return
 
-    base_name = os.path.splitext(os.path.basename(csv_file))[0]
-    output_dir = os.path.dirname(csv_file)
-    default_output_file = os.path.join(output_dir, f"{base_name}_formatado.xlsx")
+    default_output_file = default_output_path(csv_file)
     
     output_file_input = input(f"Salvar como [{default_output_file}]: ") or default_output_file
     output_excel_path = os.path.abspath(output_file_input) 
 
     split_column = input("Digite o nome da coluna para dividir em abas (opcional, pressione Enter para pular): ").strip()
     
+    streaming = os.path.getsize(csv_file) >= STREAMING_THRESHOLD_BYTES
+    if streaming:
+        print("Arquivo grande detectado, usando o modo streaming.")
+
     print(f"\nProcessando '{csv_file}'...")
     success = generate_excel_from_csv(
         csv_file,
         output_excel_path,
-        split_column_name=split_column if split_column else None
+        split_column_name=split_column if split_column else None,
+        streaming=streaming,
     )
     
     if success:
@@ -167,5 +936,13 @@ def main():
     else:
         print("A conversão falhou. Veja as mensagens de erro acima.")
 
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.entradas:
+        interactive_main()
+        return
+    if not run_batch(args):
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
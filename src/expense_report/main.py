@@ -2,54 +2,888 @@
 
 import argparse
 import csv
+import functools
+import glob
+import hashlib
+import io
+import json
+import math
+import os
+import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
 
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # O motor colunar é opcional; o motor csv usa só a biblioteca padrão.
+    np = pd = None
 
-def gerar_relatorio(caminho_csv, coluna_categoria="Categoria", coluna_valor="Valor"):
-    """Lê um CSV e imprime o total de despesas por categoria."""
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+CHECKPOINT_VERSAO = 1
+TAMANHO_BLOCO_PADRAO = 1_000_000
+TAMANHO_FATIA_PADRAO = 64 * 1024 * 1024
+TAMANHO_LOTE_CENTAVOS = 8192
+MOTORES = ("auto", "colunar", "csv")
+PERIODOS = ("dia", "semana", "mes", "ano")
+FORMATOS_SAIDA = ("texto", "csv", "json")
+FORMATOS_DATA = ("%Y-%m-%d", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d/%m/%Y %H:%M:%S")
+CAMPOS_ESTATISTICAS = ("quantidade", "soma", "minimo", "maximo", "media")
+
+
+class ColunasAusentesError(ValueError):
+    """O CSV não contém as colunas de categoria e valor pedidas."""
+
+
+def converter_valor(texto):
+    """Converte um valor monetário com vírgula ou ponto decimal; retorna None se inválido."""
     try:
-        with open(caminho_csv, newline='', encoding='utf-8') as csvfile:
-            leitor = csv.DictReader(csvfile)
-            if coluna_categoria not in leitor.fieldnames or coluna_valor not in leitor.fieldnames:
-                print(f"O CSV deve conter as colunas '{coluna_categoria}' e '{coluna_valor}'.")
-                return False
-            totais = defaultdict(float)
-            total = 0.0
-            for linha in leitor:
-                try:
-                    valor = float(str(linha[coluna_valor]).replace(',', '.'))
-                except (ValueError, TypeError):
+        return float(str(texto).replace(',', '.'))
+    except (ValueError, TypeError):
+        return None
+
+
+def _agrupamento_valido(texto, separador):
+    """Confere se ``texto`` está agrupado de três em três dígitos por ``separador``."""
+    grupos = texto.split(separador)
+    return (1 <= len(grupos[0]) <= 3
+            and all(len(grupo) == 3 for grupo in grupos[1:])
+            and all(grupo.isascii() and grupo.isdigit() for grupo in grupos))
+
+
+@functools.lru_cache(maxsize=65536)
+def converter_centavos(texto):
+    """
+    Converte um valor monetário em centavos inteiros; retorna None se inválido.
+
+    Aceita os estilos ``1.234,56`` e ``1,234.56``: com os dois separadores,
+    o último é o decimal. Com um só, ele é separador de milhar quando se
+    repete ou quando agrupa exatamente três dígitos após uma parte inteira
+    diferente de zero (``1.234`` vale 1234,00); caso contrário é o decimal.
+    Casas além da segunda são arredondadas (metade para longe do zero).
+    Valores repetidos são resolvidos pelo cache.
+    """
+    if texto is None:
+        return None
+    texto = texto.strip()
+    # Caminho rápido para o caso comum: só dígitos e duas casas decimais.
+    if texto[-3:-2] in (",", "."):
+        digitos = texto[:-3] + texto[-2:]
+        if digitos.isdigit() and digitos.isascii():
+            return int(digitos)
+    sinal = -1 if texto[:1] == "-" else 1
+    if texto[:1] in ("-", "+"):
+        texto = texto[1:]
+    virgula = texto.rfind(",")
+    ponto = texto.rfind(".")
+    if virgula >= 0 and ponto >= 0:
+        decimal = max(virgula, ponto)
+        milhar = "." if decimal == virgula else ","
+        inteiro, fracao = texto[:decimal], texto[decimal + 1:]
+        if not _agrupamento_valido(inteiro, milhar):
+            return None
+        inteiro = inteiro.replace(milhar, "")
+    elif virgula >= 0 or ponto >= 0:
+        separador = "," if virgula >= 0 else "."
+        partes = texto.split(separador)
+        if len(partes) > 2 or (len(partes[1]) == 3 and partes[0].lstrip("0")):
+            if not _agrupamento_valido(texto, separador):
+                return None
+            inteiro, fracao = texto.replace(separador, ""), ""
+        else:
+            inteiro, fracao = partes
+    else:
+        inteiro, fracao = texto, ""
+    if not inteiro and not fracao:
+        return None
+    if not all(parte.isascii() and parte.isdigit() for parte in (inteiro, fracao) if parte):
+        return None
+    centavos = int(inteiro or "0") * 100 + int(fracao[:2].ljust(2, "0"))
+    if len(fracao) > 2 and fracao[2] >= "5":
+        centavos += 1
+    return sinal * centavos
+
+
+def formatar_centavos(centavos):
+    """Formata centavos inteiros como ``1234.56`` sem passar por ``float``."""
+    sinal = "-" if centavos < 0 else ""
+    inteiro, resto = divmod(abs(centavos), 100)
+    return f"{sinal}{inteiro}.{resto:02d}"
+
+
+def _acumuladores(centavos):
+    """Retorna ``(totais, total)`` vazios para o modo de acumulação escolhido."""
+    return (defaultdict(int), 0) if centavos else (defaultdict(float), 0.0)
+
+
+_LOTE_SIMPLES = re.compile(r"(?:[0-9]+[,.][0-9]{2}\n)*[0-9]+[,.][0-9]{2}")
+_SEM_SEPARADOR = str.maketrans("", "", ",.")
+
+
+def _centavos_em_lote_texto(textos):
+    """
+    Converte ``textos`` em centavos de uma só vez quando todos têm o formato
+    comum ``123,45``/``123.45``; caso contrário, valor a valor com
+    ``converter_centavos``.
+    """
+    try:
+        juntos = "\n".join(textos)
+    except TypeError:
+        juntos = None
+    if juntos and _LOTE_SIMPLES.fullmatch(juntos):
+        valores = list(map(int, juntos.translate(_SEM_SEPARADOR).split("\n")))
+        if len(valores) == len(textos):  # um texto com quebra de linha desfaria o alinhamento
+            return valores
+    return [converter_centavos(texto) for texto in textos]
+
+
+def _somar_pares(pares, centavos=False, totais=None, total=None):
+    """
+    Acumula pares ``(categoria, texto do valor)`` sobre ``(totais, total)``,
+    ignorando valores inválidos.
+
+    Em centavos, os textos de cada lote de ``TAMANHO_LOTE_CENTAVOS`` linhas
+    são agrupados por categoria e convertidos de uma vez, o que mantém o
+    laço por linha tão curto quanto o do modo ``float``.
+    """
+    if totais is None:
+        totais, total = _acumuladores(centavos)
+    if not centavos:
+        for categoria, texto in pares:
+            valor = converter_valor(texto)
+            if valor is None:
+                continue
+            totais[categoria] += valor
+            total += valor
+        return totais, total
+    pares = iter(pares)
+    while True:
+        pendentes = defaultdict(list)
+        for categoria, texto in islice(pares, TAMANHO_LOTE_CENTAVOS):
+            pendentes[categoria].append(texto)
+        if not pendentes:
+            return totais, total
+        for categoria, textos in pendentes.items():
+            valores = [valor for valor in _centavos_em_lote_texto(textos) if valor is not None]
+            if valores:
+                soma = sum(valores)
+                totais[categoria] += soma
+                total += soma
+
+
+def imprimir_resumo(totais, total, titulo=None, centavos=False):
+    """
+    Imprime o total por categoria, do maior para o menor, seguido do total geral.
+
+    Com ``centavos=True`` os valores são inteiros em centavos.
+    """
+    formatar = formatar_centavos if centavos else "{:.2f}".format
+    print(f"--- Resumo de Despesas ({titulo}) ---" if titulo else "--- Resumo de Despesas ---")
+    for categoria, valor in sorted(totais.items(), key=lambda item: item[1], reverse=True):
+        print(f"{categoria}: {formatar(valor)}")
+    print(f"Total: {formatar(total)}")
+
+
+def caminho_checkpoint(caminho_csv):
+    """Retorna o caminho padrão do checkpoint incremental de ``caminho_csv``."""
+    return caminho_csv + CHECKPOINT_SUFFIX
+
+
+class _LinhasComPosicao:
+    """
+    Itera as linhas completas de um arquivo binário já decodificadas,
+    acompanhando o deslocamento em bytes consumido até o momento.
+
+    Uma linha final sem quebra de linha (ainda sendo escrita) não é
+    consumida e fica para a próxima execução.
+    """
+
+    def __init__(self, arquivo, posicao):
+        self.arquivo = arquivo
+        self.posicao = posicao
+
+    def __iter__(self):
+        for linha in self.arquivo:
+            if not linha.endswith(b"\n"):
+                return
+            self.posicao += len(linha)
+            yield linha.decode("utf-8")
+
+
+def _sha256_intervalo(arquivo, inicio, fim):
+    arquivo.seek(inicio)
+    return hashlib.sha256(arquivo.read(fim - inicio)).hexdigest()
+
+
+def _carregar_checkpoint(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as fh:
+            estado = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(estado, dict) or estado.get("versao") != CHECKPOINT_VERSAO:
+        return None
+    return estado
+
+
+def _salvar_checkpoint(caminho, estado):
+    """Grava o checkpoint de forma atômica (arquivo temporário + ``os.replace``)."""
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as fh:
+        json.dump(estado, fh, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def _checkpoint_valido(estado, arquivo, cabecalho_sha256, coluna_categoria, coluna_valor, centavos):
+    """Confere se o arquivo ainda é o mesmo que gerou ``estado``, apenas com linhas acrescentadas."""
+    try:
+        if (estado["cabecalho_sha256"] != cabecalho_sha256
+                or estado["coluna_categoria"] != coluna_categoria
+                or estado["coluna_valor"] != coluna_valor
+                or estado.get("centavos", False) != centavos):
+            return False
+        posicao = estado["posicao"]
+        inicio = estado["inicio_ultima_linha"]
+        if os.fstat(arquivo.fileno()).st_size < posicao:
+            return False
+        return _sha256_intervalo(arquivo, inicio, posicao) == estado["ultima_linha_sha256"]
+    except (KeyError, TypeError, ValueError, OSError):
+        return False
+
+
+def agregar_incremental(caminho_csv, coluna_categoria="Categoria", coluna_valor="Valor", arquivo_checkpoint=None,
+                        centavos=False):
+    """
+    Soma as despesas por categoria processando apenas as linhas acrescentadas
+    desde a última execução.
+
+    O checkpoint guarda os totais, o deslocamento em bytes após a última
+    linha processada e o SHA-256 dessa linha. Se o arquivo foi truncado ou
+    reescrito (cabeçalho, tamanho ou última linha não conferem), tudo é
+    reprocessado. Retorna ``(totais, total)``, em centavos inteiros se
+    ``centavos=True``.
+    """
+    if arquivo_checkpoint is None:
+        arquivo_checkpoint = caminho_checkpoint(caminho_csv)
+
+    with open(caminho_csv, "rb") as arquivo:
+        linha_cabecalho = arquivo.readline()
+        cabecalho_sha256 = hashlib.sha256(linha_cabecalho).hexdigest()
+        campos = next(csv.reader([linha_cabecalho.decode("utf-8")]), [])
+        if coluna_categoria not in campos or coluna_valor not in campos:
+            raise ColunasAusentesError(f"O CSV deve conter as colunas '{coluna_categoria}' e '{coluna_valor}'.")
+        indice_categoria = campos.index(coluna_categoria)
+        indice_valor = campos.index(coluna_valor)
+
+        estado = _carregar_checkpoint(arquivo_checkpoint)
+        if estado is not None and _checkpoint_valido(estado, arquivo, cabecalho_sha256, coluna_categoria, coluna_valor,
+                                                     centavos):
+            totais = defaultdict(int if centavos else float, estado["totais"])
+            total = estado["total"]
+            posicao = estado["posicao"]
+            inicio_ultima = estado["inicio_ultima_linha"]
+        else:
+            if estado is not None:
+                print("Aviso: o arquivo mudou desde o último checkpoint; reprocessando desde o início.")
+            totais, total = _acumuladores(centavos)
+            posicao = inicio_ultima = len(linha_cabecalho)
+
+        arquivo.seek(posicao)
+        linhas = _LinhasComPosicao(arquivo, posicao)
+
+        def pares():
+            nonlocal inicio_ultima, posicao
+            for registro in csv.reader(linhas):
+                inicio_ultima, posicao = posicao, linhas.posicao
+                if indice_valor >= len(registro):
                     continue
-                categoria = linha[coluna_categoria]
-                totais[categoria] += valor
-                total += valor
-    except FileNotFoundError:
-        print(f"Erro: Arquivo '{caminho_csv}' não encontrado.")
+                categoria = registro[indice_categoria] if indice_categoria < len(registro) else None
+                yield categoria, registro[indice_valor]
+
+        totais, total = _somar_pares(pares(), centavos, totais, total)
+
+        _salvar_checkpoint(arquivo_checkpoint, {
+            "versao": CHECKPOINT_VERSAO,
+            "cabecalho_sha256": cabecalho_sha256,
+            "coluna_categoria": coluna_categoria,
+            "coluna_valor": coluna_valor,
+            "centavos": centavos,
+            "posicao": posicao,
+            "inicio_ultima_linha": inicio_ultima,
+            "ultima_linha_sha256": _sha256_intervalo(arquivo, inicio_ultima, posicao),
+            "totais": list(totais.items()),
+            "total": total,
+        })
+    return totais, total
+
+
+def _ler_cabecalho(caminho_csv):
+    with open(caminho_csv, newline='', encoding='utf-8') as csvfile:
+        return next(csv.reader(csvfile), [])
+
+
+def _validar_colunas(campos, coluna_categoria, coluna_valor):
+    if coluna_categoria not in campos or coluna_valor not in campos:
+        raise ColunasAusentesError(f"O CSV deve conter as colunas '{coluna_categoria}' e '{coluna_valor}'.")
+
+
+def _centavos_em_lote(textos):
+    """
+    Converte uma lista de textos em centavos ``int64`` com numpy.
+
+    Só o formato mais comum (dígitos ASCII, separador e duas casas, como
+    ``1234,56``) é resolvido de forma vetorizada; os demais textos passam por
+    ``converter_centavos``. Retorna ``(numeros, validos)``.
+    """
+    textos = [texto if isinstance(texto, str) else "" for texto in textos]
+    numeros = np.zeros(len(textos), dtype=np.int64)
+    rapidos = np.zeros(len(textos), dtype=bool)
+    matriz = np.array(textos, dtype=str)
+    largura = matriz.dtype.itemsize // 4
+    if 4 <= largura <= 19:
+        codigos = matriz.view(np.uint32).reshape(len(textos), largura).astype(np.int64)
+        tamanhos = np.char.str_len(matriz)
+        posicoes = np.arange(largura)
+        separador = tamanhos[:, None] - 3
+        eh_separador = posicoes == separador
+        eh_digito = (posicoes < tamanhos[:, None]) & ~eh_separador
+        digitos = codigos - ord("0")
+        separador_ok = np.take_along_axis(codigos, np.clip(separador, 0, largura - 1), axis=1)[:, 0]
+        rapidos = ((tamanhos >= 4)
+                   & np.isin(separador_ok, (ord(","), ord(".")))
+                   & np.all(~eh_digito | ((digitos >= 0) & (digitos <= 9)), axis=1))
+        expoentes = np.where(posicoes < separador, tamanhos[:, None] - 2 - posicoes, tamanhos[:, None] - 1 - posicoes)
+        potencias = 10 ** np.clip(expoentes, 0, 18)
+        numeros = np.where(eh_digito & rapidos[:, None], digitos * potencias, 0).sum(axis=1)
+    validos = rapidos.copy()
+    for indice in np.flatnonzero(~rapidos):
+        valor = converter_centavos(textos[indice])
+        if valor is not None:
+            numeros[indice] = valor
+            validos[indice] = True
+    return numeros, validos
+
+
+def _converter_bloco(valores, centavos=False):
+    """
+    Converte uma coluna de valores em texto para ``float`` (ou centavos
+    ``int64``) de uma só vez.
+
+    Os valores são fatorados e só os textos distintos passam por
+    ``converter_valor`` (ou ``_centavos_em_lote``), de modo que o critério
+    (e o arredondamento) é o mesmo do motor csv. Retorna ``(numeros, validos)``.
+    """
+    codigos, distintos = pd.factorize(valores.to_numpy(), use_na_sentinel=False)
+    if centavos:
+        numeros, validos = _centavos_em_lote(distintos)
+        return numeros[codigos], validos[codigos]
+    convertidos = [converter_valor(texto) for texto in distintos]
+    numeros = np.array([np.nan if valor is None else valor for valor in convertidos], dtype=float)
+    validos = np.array([valor is not None for valor in convertidos], dtype=bool)
+    return numeros[codigos], validos[codigos]
+
+
+def agregar_colunar(caminho_csv, coluna_categoria="Categoria", coluna_valor="Valor",
+                    tamanho_bloco=TAMANHO_BLOCO_PADRAO, centavos=False):
+    """
+    Soma as despesas por categoria lendo só as duas colunas necessárias,
+    em blocos de ``tamanho_bloco`` linhas, com pandas.
+
+    As somas são acumuladas na ordem das linhas (``np.add.at`` e
+    ``np.cumsum`` não reordenam as parcelas), então os totais são
+    idênticos, bit a bit, aos do laço linha a linha. Retorna ``(totais, total)``;
+    com ``centavos=True`` soma centavos inteiros em ``int64``.
+    """
+    _validar_colunas(_ler_cabecalho(caminho_csv), coluna_categoria, coluna_valor)
+    leitor = pd.read_csv(
+        caminho_csv, usecols=[coluna_categoria, coluna_valor], dtype=str, keep_default_na=False,
+        encoding="utf-8", chunksize=tamanho_bloco,
+    )
+    return _somar_blocos(leitor, coluna_categoria, coluna_valor, centavos)
+
+
+def _somar_blocos(leitor, coluna_categoria, coluna_valor, centavos=False):
+    """Acumula os blocos de ``leitor`` (um ``pd.read_csv`` em blocos); retorna ``(totais, total)``."""
+    totais, total = _acumuladores(centavos)
+    tipo = np.int64 if centavos else float
+    with leitor:
+        for bloco in leitor:
+            numeros, validos = _converter_bloco(bloco[coluna_valor], centavos)
+            if not validos.any():
+                continue
+            numeros = numeros[validos]
+            codigos, categorias = pd.factorize(bloco[coluna_categoria].to_numpy()[validos], use_na_sentinel=False)
+            somas = np.array([totais[categoria] for categoria in categorias], dtype=tipo)
+            np.add.at(somas, codigos, numeros)
+            for categoria, soma in zip(categorias, somas.tolist()):
+                totais[categoria] = soma
+            if centavos:
+                total += int(numeros.sum())
+            else:
+                total = float(np.cumsum(np.concatenate(([total], numeros)))[-1])
+    return totais, total
+
+
+def _somar_registros(registros, indice_categoria, indice_valor, centavos=False):
+    """Acumula registros de ``csv.reader`` com o mesmo critério de ``agregar_csv``."""
+    pares = ((registro[indice_categoria] if indice_categoria < len(registro) else None, registro[indice_valor])
+             for registro in registros if registro and indice_valor < len(registro))
+    return _somar_pares(pares, centavos)
+
+
+def dividir_em_fatias(caminho_csv, tamanho_fatia=TAMANHO_FATIA_PADRAO):
+    """
+    Divide o corpo de ``caminho_csv`` (sem o cabeçalho) em intervalos de
+    bytes ``(inicio, fim)`` de cerca de ``tamanho_fatia`` bytes, sempre
+    começando e terminando em início de linha.
+
+    Supõe um registro por linha: campos entre aspas com quebras de linha
+    podem ser cortados entre duas fatias.
+    """
+    fatias = []
+    with open(caminho_csv, "rb") as arquivo:
+        arquivo.readline()
+        inicio = arquivo.tell()
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        while inicio < tamanho:
+            arquivo.seek(min(inicio + tamanho_fatia, tamanho) - 1)
+            arquivo.readline()
+            fim = arquivo.tell()
+            fatias.append((inicio, fim))
+            inicio = fim
+    return fatias
+
+
+def _agregar_fatia(caminho_csv, inicio, fim, campos, coluna_categoria, coluna_valor, motor, centavos=False):
+    """Ponto de entrada dos processos: agrega os bytes ``[inicio, fim)`` de ``caminho_csv``."""
+    with open(caminho_csv, "rb") as arquivo:
+        arquivo.seek(inicio)
+        dados = arquivo.read(fim - inicio)
+    if not dados.strip():
+        return [], _acumuladores(centavos)[1]
+    if motor == "colunar":
+        leitor = pd.read_csv(
+            io.BytesIO(dados), header=None, names=campos, usecols=[coluna_categoria, coluna_valor],
+            dtype=str, keep_default_na=False, encoding="utf-8", chunksize=TAMANHO_BLOCO_PADRAO,
+        )
+        totais, total = _somar_blocos(leitor, coluna_categoria, coluna_valor, centavos)
+    else:
+        registros = csv.reader(io.StringIO(dados.decode("utf-8"), newline=""))
+        totais, total = _somar_registros(
+            registros, campos.index(coluna_categoria), campos.index(coluna_valor), centavos
+        )
+    return list(totais.items()), total
+
+
+def expandir_caminhos(caminhos):
+    """Expande padrões glob em ``caminhos``, mantendo a ordem e removendo repetições."""
+    expandidos = []
+    for caminho in caminhos:
+        encontrados = sorted(glob.glob(caminho, recursive=True)) if glob.has_magic(caminho) else [caminho]
+        for encontrado in encontrados:
+            if encontrado not in expandidos:
+                expandidos.append(encontrado)
+    return expandidos
+
+
+def agregar_arquivos(caminhos, coluna_categoria="Categoria", coluna_valor="Valor", motor="auto", processos=None,
+                     tamanho_fatia=TAMANHO_FATIA_PADRAO, centavos=False):
+    """
+    Agrega vários CSVs (ou padrões glob) em paralelo.
+
+    Cada arquivo é dividido em fatias de bytes alinhadas a linhas (veja
+    ``dividir_em_fatias``), cada fatia é agregada em um processo separado e
+    os totais parciais são mesclados na ordem dos arquivos e fatias, o que
+    preserva a ordem de primeira aparição das categorias. Como as parcelas
+    são somadas em grupos, os totais podem diferir dos do laço sequencial na
+    última casa binária (exceto com ``centavos=True``, que soma inteiros).
+
+    Retorna ``(totais, total, por_arquivo)``, onde ``por_arquivo`` mapeia
+    cada caminho para o seu próprio ``(totais, total)``.
+    """
+    if motor == "auto":
+        motor = "csv" if pd is None else "colunar"
+    arquivos = expandir_caminhos(caminhos)
+    tarefas = []
+    for caminho in arquivos:
+        campos = _ler_cabecalho(caminho)
+        _validar_colunas(campos, coluna_categoria, coluna_valor)
+        for inicio, fim in dividir_em_fatias(caminho, tamanho_fatia):
+            tarefas.append((caminho, inicio, fim, campos, coluna_categoria, coluna_valor, motor, centavos))
+
+    if processos == 1 or len(tarefas) <= 1:
+        parciais = [_agregar_fatia(*tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            parciais = list(executor.map(_agregar_fatia, *zip(*tarefas)))
+
+    totais, total = _acumuladores(centavos)
+    totais_por_arquivo = {caminho: _acumuladores(centavos)[0] for caminho in arquivos}
+    total_por_arquivo = dict.fromkeys(arquivos, total)
+    for tarefa, (itens, subtotal) in zip(tarefas, parciais):
+        caminho = tarefa[0]
+        for categoria, valor in itens:
+            totais[categoria] += valor
+            totais_por_arquivo[caminho][categoria] += valor
+        total += subtotal
+        total_por_arquivo[caminho] += subtotal
+    por_arquivo = {caminho: (totais_por_arquivo[caminho], total_por_arquivo[caminho]) for caminho in arquivos}
+    return totais, total, por_arquivo
+
+
+def agregar_csv(caminho_csv, coluna_categoria="Categoria", coluna_valor="Valor", centavos=False):
+    """
+    Soma as despesas por categoria com ``csv.DictReader``; retorna ``(totais, total)``.
+
+    Com ``centavos=True`` os valores são lidos por ``converter_centavos`` e
+    somados como inteiros, sem erro de arredondamento.
+    """
+    with open(caminho_csv, newline='', encoding='utf-8') as csvfile:
+        leitor = csv.DictReader(csvfile)
+        if coluna_categoria not in leitor.fieldnames or coluna_valor not in leitor.fieldnames:
+            raise ColunasAusentesError(f"O CSV deve conter as colunas '{coluna_categoria}' e '{coluna_valor}'.")
+        return _somar_pares(((linha[coluna_categoria], linha[coluna_valor]) for linha in leitor), centavos)
+
+
+def gerar_relatorio(caminho_csv, coluna_categoria="Categoria", coluna_valor="Valor", incremental=False,
+                    arquivo_checkpoint=None, motor="auto", processos=None, por_arquivo=False, centavos=False):
+    """
+    Lê um CSV e imprime o total de despesas por categoria.
+
+    Com ``incremental=True`` apenas as linhas acrescentadas desde a última
+    execução são lidas (veja ``agregar_incremental``). Caso contrário,
+    ``motor`` escolhe entre o motor ``"colunar"`` (pandas, veja
+    ``agregar_colunar``) e o motor ``"csv"`` da biblioteca padrão; ``"auto"``
+    usa o colunar quando o pandas está instalado.
+
+    ``caminho_csv`` também pode ser uma lista de caminhos ou padrões glob.
+    Com vários arquivos, ou com ``processos`` definido, os arquivos são
+    agregados em fatias por um conjunto de processos (veja
+    ``agregar_arquivos``); ``por_arquivo=True`` imprime também o resumo de
+    cada arquivo.
+
+    ``centavos=True`` soma os valores como centavos inteiros (veja
+    ``converter_centavos``), exatamente.
+    """
+    caminhos = [caminho_csv] if isinstance(caminho_csv, (str, os.PathLike)) else list(caminho_csv)
+    em_paralelo = (len(caminhos) > 1 or processos is not None or por_arquivo
+                   or any(glob.has_magic(str(caminho)) for caminho in caminhos))
+    if motor == "auto":
+        motor = "csv" if pd is None else "colunar"
+    if motor == "colunar" and pd is None:
+        print("Erro: o motor colunar requer pandas e numpy instalados.")
+        return False
+    if incremental and em_paralelo:
+        print("Erro: o modo incremental aceita apenas um arquivo, sem processos paralelos.")
+        return False
+
+    resumos_por_arquivo = {}
+    try:
+        if em_paralelo:
+            totais, total, resumos_por_arquivo = agregar_arquivos(
+                caminhos, coluna_categoria, coluna_valor, motor, processos, centavos=centavos
+            )
+            if not resumos_por_arquivo:
+                print("Erro: nenhum arquivo encontrado.")
+                return False
+        elif incremental:
+            totais, total = agregar_incremental(
+                caminho_csv, coluna_categoria, coluna_valor, arquivo_checkpoint, centavos
+            )
+        elif motor == "colunar":
+            totais, total = agregar_colunar(caminho_csv, coluna_categoria, coluna_valor, centavos=centavos)
+        else:
+            totais, total = agregar_csv(caminho_csv, coluna_categoria, coluna_valor, centavos)
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo '{e.filename or caminho_csv}' não encontrado.")
+        return False
+    except ColunasAusentesError as e:
+        print(e)
         return False
     except Exception as e:
         print(f"Erro ao ler o CSV: {e}")
         return False
 
-    print("--- Resumo de Despesas ---")
-    for categoria, valor in sorted(totais.items(), key=lambda item: item[1], reverse=True):
-        print(f"{categoria}: {valor:.2f}")
-    print(f"Total: {total:.2f}")
+    if por_arquivo:
+        for caminho, (totais_arquivo, total_arquivo) in resumos_por_arquivo.items():
+            imprimir_resumo(totais_arquivo, total_arquivo, titulo=caminho, centavos=centavos)
+            print()
+    imprimir_resumo(totais, total, centavos=centavos)
+    return True
+
+
+class Estatisticas:
+    """Acumulador compacto de quantidade, soma, mínimo e máximo de um grupo."""
+
+    __slots__ = ("quantidade", "soma", "minimo", "maximo")
+
+    def __init__(self):
+        self.quantidade = 0
+        self.soma = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def adicionar(self, valor):
+        self.quantidade += 1
+        self.soma += valor
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def mesclar(self, outro):
+        """Incorpora os valores acumulados em ``outro``."""
+        self.quantidade += outro.quantidade
+        self.soma += outro.soma
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+
+    @property
+    def media(self):
+        return self.soma / self.quantidade if self.quantidade else 0.0
+
+    def como_dict(self):
+        return {campo: getattr(self, campo) for campo in CAMPOS_ESTATISTICAS}
+
+
+@functools.lru_cache(maxsize=65536)
+def periodo_da_data(texto, periodo):
+    """
+    Retorna o rótulo do ``periodo`` (dia, semana ISO, mês ou ano) que contém
+    a data em ``texto``, aceitando os formatos de ``FORMATOS_DATA``; texto
+    vazio se a data for inválida. Datas repetidas são resolvidas pelo cache.
+    """
+    texto = texto.strip()
+    for formato in FORMATOS_DATA:
+        try:
+            data = datetime.strptime(texto, formato)
+            break
+        except ValueError:
+            continue
+    else:
+        return ""
+    if periodo == "dia":
+        return data.strftime("%Y-%m-%d")
+    if periodo == "semana":
+        ano, semana, _ = data.isocalendar()
+        return f"{ano}-S{semana:02d}"
+    if periodo == "mes":
+        return data.strftime("%Y-%m")
+    return data.strftime("%Y")
+
+
+def agregar_grupos(caminho_csv, colunas_grupo=("Categoria",), coluna_valor="Valor", coluna_data=None, periodo=None,
+                   grupos=None):
+    """
+    Agrupa as despesas de ``caminho_csv`` por várias colunas em uma única
+    leitura, opcionalmente acrescentando o ``periodo`` da ``coluna_data``
+    como última dimensão.
+
+    Retorna um dicionário ``{chave: Estatisticas}`` em que ``chave`` é a
+    tupla de valores das dimensões. Passe ``grupos`` para acumular vários
+    arquivos no mesmo resultado.
+    """
+    if grupos is None:
+        grupos = {}
+    campos = _ler_cabecalho(caminho_csv)
+    necessarias = list(colunas_grupo) + [coluna_valor] + ([coluna_data] if periodo else [])
+    ausentes = [coluna for coluna in necessarias if coluna not in campos]
+    if ausentes:
+        raise ColunasAusentesError(f"O CSV não contém as colunas: {', '.join(ausentes)}.")
+    indices = [campos.index(coluna) for coluna in colunas_grupo]
+    indice_valor = campos.index(coluna_valor)
+    indice_data = campos.index(coluna_data) if periodo else None
+
+    with open(caminho_csv, newline='', encoding='utf-8') as csvfile:
+        leitor = csv.reader(csvfile)
+        next(leitor, None)
+        for registro in leitor:
+            if indice_valor >= len(registro):
+                continue
+            valor = converter_valor(registro[indice_valor])
+            if valor is None:
+                continue
+            chave = tuple(registro[indice] if indice < len(registro) else None for indice in indices)
+            if indice_data is not None:
+                data = registro[indice_data] if indice_data < len(registro) else ""
+                chave += (periodo_da_data(data, periodo),)
+            estatisticas = grupos.get(chave)
+            if estatisticas is None:
+                estatisticas = grupos[chave] = Estatisticas()
+            estatisticas.adicionar(valor)
+    return grupos
+
+
+def calcular_rollup(grupos):
+    """
+    Acrescenta aos ``grupos`` os subtotais de cada prefixo das dimensões
+    (como o ``ROLLUP`` do SQL), mesclando os acumuladores já calculados sem
+    reler os dados. As dimensões agregadas aparecem como None; a chave só
+    com None é o total geral.
+    """
+    resultado = dict(grupos)
+    if not grupos:
+        return resultado
+    dimensoes = len(next(iter(grupos)))
+    for nivel in range(dimensoes - 1, -1, -1):
+        for chave, estatisticas in grupos.items():
+            chave_nivel = chave[:nivel] + (None,) * (dimensoes - nivel)
+            if chave_nivel not in resultado:
+                resultado[chave_nivel] = Estatisticas()
+            resultado[chave_nivel].mesclar(estatisticas)
+    return resultado
+
+
+def _validar_dimensoes(dimensoes):
+    """
+    Levanta ``ValueError`` se alguma dimensão se repete ou tem o nome de um
+    campo de ``CAMPOS_ESTATISTICAS``, o que duplicaria colunas no CSV e
+    chaves no JSON.
+    """
+    conflitantes = [dimensao for dimensao in dimensoes if dimensao in CAMPOS_ESTATISTICAS]
+    if conflitantes:
+        raise ValueError(f"As colunas de agrupamento não podem se chamar {', '.join(conflitantes)}: "
+                         f"{', '.join(CAMPOS_ESTATISTICAS)} são os campos das estatísticas.")
+    repetidas = sorted({dimensao for dimensao in dimensoes if list(dimensoes).count(dimensao) > 1})
+    if repetidas:
+        raise ValueError(f"Colunas de agrupamento repetidas: {', '.join(repetidas)}.")
+
+
+def escrever_agregacoes(grupos, dimensoes, formato="texto", destino=None):
+    """
+    Escreve ``grupos`` em ``destino`` (padrão: saída padrão) como texto, CSV
+    ou JSON; as ``dimensoes`` são conferidas por ``_validar_dimensoes``.
+    """
+    _validar_dimensoes(dimensoes)
+    destino = destino or sys.stdout
+    if formato == "json":
+        linhas = [dict(zip(dimensoes, chave), **estatisticas.como_dict()) for chave, estatisticas in grupos.items()]
+        json.dump(linhas, destino, ensure_ascii=False, indent=2)
+        destino.write("\n")
+    elif formato == "csv":
+        escritor = csv.writer(destino, lineterminator="\n")
+        escritor.writerow(list(dimensoes) + list(CAMPOS_ESTATISTICAS))
+        for chave, estatisticas in grupos.items():
+            escritor.writerow(list(chave) + [getattr(estatisticas, campo) for campo in CAMPOS_ESTATISTICAS])
+    else:
+        print(f"--- Resumo de Despesas por {', '.join(dimensoes)} ---", file=destino)
+        ordenados = sorted(grupos.items(), key=lambda item: item[1].soma, reverse=True)
+        for chave, e in ordenados:
+            rotulo = " / ".join("(todos)" if parte is None else str(parte) for parte in chave)
+            print(f"{rotulo}: {e.soma:.2f} (n={e.quantidade}, mín {e.minimo:.2f}, máx {e.maximo:.2f}, "
+                  f"média {e.media:.2f})", file=destino)
+
+
+def gerar_agregacoes(caminho_csv, colunas_grupo=("Categoria",), coluna_valor="Valor", coluna_data=None,
+                     periodo=None, rollup=False, formato="texto", saida=None):
+    """
+    Agrupa um ou vários CSVs (caminhos ou padrões glob) por ``colunas_grupo``
+    e, opcionalmente, pelo ``periodo`` de ``coluna_data``, calculando
+    quantidade, soma, mínimo, máximo e média por grupo. Com ``rollup=True``
+    inclui os subtotais de cada nível. O resultado é escrito em ``saida`` (ou
+    na saída padrão) no ``formato`` pedido.
+    """
+    caminhos = [caminho_csv] if isinstance(caminho_csv, (str, os.PathLike)) else list(caminho_csv)
+    if periodo and not coluna_data:
+        print("Erro: informe a coluna de data para agrupar por período.")
+        return False
+    dimensoes = list(colunas_grupo) + ([f"{coluna_data} ({periodo})"] if periodo else [])
+    try:
+        _validar_dimensoes(dimensoes)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return False
+    grupos = {}
+    try:
+        for caminho in expandir_caminhos(caminhos):
+            agregar_grupos(caminho, colunas_grupo, coluna_valor, coluna_data, periodo, grupos)
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo '{e.filename or caminho_csv}' não encontrado.")
+        return False
+    except ColunasAusentesError as e:
+        print(e)
+        return False
+    except Exception as e:
+        print(f"Erro ao ler o CSV: {e}")
+        return False
+
+    if rollup:
+        grupos = calcular_rollup(grupos)
+    if not saida:
+        escrever_agregacoes(grupos, dimensoes, formato)
+        return True
+    try:
+        with open(saida, "w", newline='', encoding='utf-8') as destino:
+            escrever_agregacoes(grupos, dimensoes, formato, destino)
+    except OSError as e:
+        print(f"Erro ao gravar '{saida}': {e}")
+        return False
     return True
 
 
 def parse_args():
     """Processa argumentos da linha de comando."""
     parser = argparse.ArgumentParser(description="Gera um resumo de despesas a partir de um arquivo CSV.")
-    parser.add_argument("arquivo", help="Caminho para o arquivo CSV.")
+    parser.add_argument("arquivos", nargs="+", help="Caminhos ou padrões glob dos arquivos CSV.")
     parser.add_argument("--categoria", default="Categoria", help="Nome da coluna de categoria. Padrão: 'Categoria'.")
     parser.add_argument("--valor", default="Valor", help="Nome da coluna de valor. Padrão: 'Valor'.")
-    return parser.parse_args()
+    parser.add_argument("--incremental", action="store_true",
+                        help="Processa apenas as linhas novas desde a última execução, usando um checkpoint.")
+    parser.add_argument("--checkpoint", help="Arquivo de checkpoint. Padrão: '<arquivo>.checkpoint.json'.")
+    parser.add_argument("--motor", choices=MOTORES, default="auto",
+                        help="Motor de leitura: 'colunar' (pandas), 'csv' (biblioteca padrão) ou 'auto'. Padrão: 'auto'.")
+    parser.add_argument("--processos", type=int,
+                        help="Agrega os arquivos em fatias com este número de processos.")
+    parser.add_argument("--por-arquivo", action="store_true", help="Imprime também o resumo de cada arquivo.")
+    parser.add_argument("--centavos", action="store_true",
+                        help="Soma em centavos inteiros (exato), aceitando '1.234,56' e '1,234.56'.")
+    parser.add_argument("--agrupar",
+                        help="Colunas de agrupamento separadas por vírgula (ex.: 'Categoria,CentroCusto').")
+    parser.add_argument("--data", help="Coluna de data usada com --periodo.")
+    parser.add_argument("--periodo", choices=PERIODOS, help="Agrupa também pelo período da coluna de data.")
+    parser.add_argument("--rollup", action="store_true", help="Inclui os subtotais de cada nível do agrupamento.")
+    parser.add_argument("--formato", choices=FORMATOS_SAIDA, default="texto",
+                        help="Formato da saída agrupada: 'texto', 'csv' ou 'json'. Padrão: 'texto'.")
+    parser.add_argument("--saida", help="Arquivo de saída para os agrupamentos. Padrão: a saída padrão.")
+    args = parser.parse_args()
+    if _modo_agrupamento(args):
+        ignoradas = [opcao for opcao, usada in (
+            ("--incremental", args.incremental),
+            ("--checkpoint", args.checkpoint),
+            ("--motor", args.motor != "auto"),
+            ("--processos", args.processos is not None),
+            ("--por-arquivo", args.por_arquivo),
+            ("--centavos", args.centavos),
+        ) if usada]
+        if ignoradas:
+            parser.error(f"{', '.join(ignoradas)} não se aplica(m) aos agrupamentos "
+                         "(--agrupar, --periodo, --rollup, --formato ou --saida).")
+    return args
+
+
+def _modo_agrupamento(args):
+    """Indica se os argumentos pedem os agrupamentos de ``gerar_agregacoes`` em vez do resumo."""
+    return bool(args.agrupar or args.periodo or args.rollup or args.formato != "texto" or args.saida)
 
 
 def main():
     args = parse_args()
-    sucesso = gerar_relatorio(args.arquivo, args.categoria, args.valor)
+    caminhos = args.arquivos[0] if len(args.arquivos) == 1 else args.arquivos
+    if _modo_agrupamento(args):
+        colunas_grupo = [coluna.strip() for coluna in (args.agrupar or args.categoria).split(",") if coluna.strip()]
+        sucesso = gerar_agregacoes(
+            caminhos, colunas_grupo, args.valor, args.data, args.periodo, args.rollup, args.formato, args.saida,
+        )
+        if not sucesso:
+            sys.exit(1)
+        return
+    sucesso = gerar_relatorio(
+        caminhos, args.categoria, args.valor, args.incremental, args.checkpoint, args.motor,
+        args.processos, args.por_arquivo, args.centavos,
+    )
     if not sucesso:
         sys.exit(1)
 
@@ -2,13 +2,63 @@
 
 Provides a RAM class that mimics byte addressable memory. The class
 supports reading, writing, loading sequences of bytes and dumping
-memory contents.
+memory contents. Memory is stored compactly, one byte per address, and
+can be shared without copying through :meth:`RAM.view`.
+
+:class:`MappedRAM` keeps memory in a memory-mapped file, which doubles as
+a snapshot, and :class:`SparseRAM` allocates pages only when they are first
+written, so large address spaces cost only what is actually used.
 """
 
 from __future__ import annotations
 
+import ctypes
+import errno
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
 from dataclasses import dataclass
-from typing import Iterable, Iterator, Tuple
+from typing import Iterable, Iterator, Mapping, NamedTuple, Tuple
+
+PAGE_SIZE = 4096
+"""Default page size of :class:`SparseRAM`, in bytes."""
+
+_CHUNK_SIZE = 1 << 20
+_ZERO_CHUNK = bytes(_CHUNK_SIZE)
+_NONZERO_RE = re.compile(rb"[^\x00]+")
+
+BYTE_ORDERS = ("little", "big")
+_INT_STRUCTS = {
+    (width, byteorder): struct.Struct(("<" if byteorder == "little" else ">") + code)
+    for width, code in ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+    for byteorder in BYTE_ORDERS
+}
+_U16, _U32, _U64 = ({order: _INT_STRUCTS[width, order] for order in BYTE_ORDERS} for width in (2, 4, 8))
+_ARRAY_TYPECODES: dict[int, str] = {}
+for _code in "QLIHB":
+    _ARRAY_TYPECODES.setdefault(array(_code).itemsize, _code)
+
+
+def _int_struct(width: int, byteorder: str) -> struct.Struct:
+    try:
+        return _INT_STRUCTS[width, byteorder]
+    except KeyError:
+        raise ValueError(f"Unsupported integer width {width} or byte order '{byteorder}'") from None
+
+
+class PageStats(NamedTuple):
+    """How many of the ``pages`` pages of ``page_size`` bytes hold real memory."""
+
+    page_size: int
+    pages: int
+    resident: int
+
+    @property
+    def resident_bytes(self) -> int:
+        return self.resident * self.page_size
 
 
 @dataclass
@@ -19,8 +69,11 @@ class RAM:
     ----------
     size: int
         The total number of addressable bytes.
-    memory: list[int]
-        Backing storage for the simulated memory.
+    memory: bytearray
+        Backing storage for the simulated memory, one byte per address.
+
+    On Python 3.12 and later the RAM itself supports the buffer protocol,
+    so ``memoryview(ram)`` works; on 3.10 and 3.11 use :meth:`view`.
     """
 
     size: int
@@ -28,12 +81,30 @@ class RAM:
     def __post_init__(self) -> None:
         if self.size <= 0:
             raise ValueError("RAM size must be positive")
-        self.memory = [0] * self.size
+        self.memory = bytearray(self.size)
 
     def _validate_address(self, address: int) -> None:
         if not 0 <= address < self.size:
             raise IndexError(f"Address {address} out of range")
 
+    def _validate_range(self, start: int, end: int) -> None:
+        if not 0 <= start <= end <= self.size:
+            raise IndexError(f"Address range {start}-{end} out of range")
+
+    def view(self, start: int = 0, end: int | None = None) -> memoryview:
+        """Return a writable view of memory from ``start`` to ``end`` without copying it.
+
+        Writes through the view change the RAM directly and are not checked.
+        """
+        if end is None:
+            end = self.size
+        self._validate_range(start, end)
+        return memoryview(self.memory)[start:end]
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Support ``memoryview(ram)`` and other buffer consumers (Python 3.12+)."""
+        return memoryview(self.memory)
+
     def read(self, address: int) -> int:
         """Read a single byte from memory."""
         self._validate_address(address)
@@ -46,10 +117,123 @@ class RAM:
             raise ValueError("Value must be between 0 and 255")
         self.memory[address] = value
 
+    def read_block(self, start: int, length: int) -> bytes:
+        """Return a copy of ``length`` bytes of memory starting at ``start``."""
+        self._validate_range(start, start + length)
+        return bytes(self.memory[start : start + length])
+
+    def write_block(self, start: int, data: bytes | bytearray | memoryview) -> None:
+        """Write the raw bytes of ``data`` (any buffer) to memory starting at ``start``.
+
+        The whole range is validated before anything is written.
+        """
+        with memoryview(data) as block, block.cast("B") as raw:
+            self._validate_range(start, start + raw.nbytes)
+            self.memory[start : start + raw.nbytes] = raw
+
+    def fill(self, start: int, length: int, value: int = 0) -> None:
+        """Set ``length`` bytes of memory starting at ``start`` to ``value``."""
+        self._validate_range(start, start + length)
+        if not 0 <= value <= 0xFF:
+            raise ValueError("Value must be between 0 and 255")
+        self.memory[start : start + length] = bytes((value,)) * length
+
+    def copy(self, dest: int, src: int, length: int) -> None:
+        """Copy ``length`` bytes from ``src`` to ``dest``; the ranges may overlap, as with memmove."""
+        self._validate_range(src, src + length)
+        self._validate_range(dest, dest + length)
+        with memoryview(self.memory) as view:
+            view[dest : dest + length] = view[src : src + length]
+
+    def _unpack(self, fmt: struct.Struct, address: int) -> int:
+        return fmt.unpack_from(self.memory, address)[0]
+
+    def _pack(self, fmt: struct.Struct, address: int, value: int) -> None:
+        fmt.pack_into(self.memory, address, value)
+
+    def read_int(self, address: int, width: int, byteorder: str = "little") -> int:
+        """Read an unsigned integer of ``width`` bytes (1, 2, 4 or 8) at ``address``."""
+        fmt = _int_struct(width, byteorder)
+        self._validate_range(address, address + width)
+        return self._unpack(fmt, address)
+
+    def write_int(self, address: int, value: int, width: int, byteorder: str = "little") -> None:
+        """Write ``value`` as an unsigned integer of ``width`` bytes (1, 2, 4 or 8) at ``address``."""
+        fmt = _int_struct(width, byteorder)
+        self._validate_range(address, address + width)
+        if not 0 <= value < 1 << 8 * width:
+            raise ValueError(f"Value must be between 0 and {(1 << 8 * width) - 1}")
+        self._pack(fmt, address, value)
+
+    def read_u16(self, address: int, byteorder: str = "little") -> int:
+        fmt = _U16.get(byteorder) or _int_struct(2, byteorder)
+        self._validate_range(address, address + 2)
+        return self._unpack(fmt, address)
+
+    def read_u32(self, address: int, byteorder: str = "little") -> int:
+        fmt = _U32.get(byteorder) or _int_struct(4, byteorder)
+        self._validate_range(address, address + 4)
+        return self._unpack(fmt, address)
+
+    def read_u64(self, address: int, byteorder: str = "little") -> int:
+        fmt = _U64.get(byteorder) or _int_struct(8, byteorder)
+        self._validate_range(address, address + 8)
+        return self._unpack(fmt, address)
+
+    def write_u16(self, address: int, value: int, byteorder: str = "little") -> None:
+        self.write_int(address, value, 2, byteorder)
+
+    def write_u32(self, address: int, value: int, byteorder: str = "little") -> None:
+        self.write_int(address, value, 4, byteorder)
+
+    def write_u64(self, address: int, value: int, byteorder: str = "little") -> None:
+        self.write_int(address, value, 8, byteorder)
+
+    def read_array(self, address: int, count: int, width: int = 4, byteorder: str = "little") -> array:
+        """Read ``count`` consecutive unsigned integers of ``width`` bytes into an :class:`array.array`."""
+        _int_struct(width, byteorder)
+        values = array(_ARRAY_TYPECODES[width])
+        values.frombytes(self.read_block(address, count * width))
+        if byteorder != sys.byteorder:
+            values.byteswap()
+        return values
+
+    def write_array(self, address: int, values: Iterable[int], width: int = 4, byteorder: str = "little") -> None:
+        """Write ``values`` as consecutive unsigned integers of ``width`` bytes."""
+        _int_struct(width, byteorder)
+        try:
+            words = array(_ARRAY_TYPECODES[width], values)
+        except OverflowError:
+            raise ValueError(f"Value must be between 0 and {(1 << 8 * width) - 1}") from None
+        if byteorder != sys.byteorder:
+            words.byteswap()
+        self.write_block(address, words)
+
+    def page_stats(self) -> PageStats:
+        """Return the resident page statistics; all of a plain RAM is allocated up front."""
+        pages = -(-self.size // PAGE_SIZE)
+        return PageStats(PAGE_SIZE, pages, pages)
+
     def load(self, data: Iterable[int], start_address: int = 0) -> None:
-        """Load a sequence of bytes into memory starting at start_address."""
-        for offset, byte in enumerate(data):
-            self.write(start_address + offset, byte)
+        """Load a sequence of bytes into memory starting at start_address.
+
+        Byte buffers, lists and tuples are copied in one step; if they run
+        past the end of memory the bytes that fit are written before the
+        IndexError, just as with one :meth:`write` per byte.
+        """
+        block = _as_bytes(data)
+        if block is None:
+            for offset, byte in enumerate(data):
+                self.write(start_address + offset, byte)
+            return
+        if not block:
+            return
+        self._validate_address(start_address)
+        fits = min(len(block), self.size - start_address)
+        with memoryview(block) as view:
+            self.write_block(start_address, view[:fits])
+        if fits < len(block):
+            self._validate_address(start_address + fits)
 
     def dump(self, start: int = 0, end: int | None = None) -> Iterator[Tuple[int, int]]:
         """Iterate over memory contents from ``start`` to ``end``.
@@ -58,9 +242,385 @@ class RAM:
         """
         if end is None:
             end = self.size
-        for address in range(start, end):
-            self._validate_address(address)
-            yield address, self.memory[address]
+        if start < end:
+            self._validate_address(start)
+        stop = min(end, self.size)
+        for chunk_start in range(start, stop, _CHUNK_SIZE):
+            chunk = self.read_block(chunk_start, min(_CHUNK_SIZE, stop - chunk_start))
+            yield from zip(range(chunk_start, chunk_start + len(chunk)), chunk)
+        if start < end and end > self.size:
+            self._validate_address(self.size)
+
+
+def _mincore(buffer: mmap.mmap, length: int) -> int | None:
+    """Return how many pages of the mapping ``buffer`` are in memory, or None if unknown."""
+    try:
+        libc_mincore = ctypes.CDLL(None, use_errno=True).mincore
+    except (AttributeError, OSError, TypeError):
+        return None
+    vector = (ctypes.c_ubyte * (-(-length // mmap.PAGESIZE)))()
+    anchor = ctypes.c_char.from_buffer(buffer)
+    try:
+        failed = libc_mincore(ctypes.c_void_p(ctypes.addressof(anchor)), ctypes.c_size_t(length), vector)
+    finally:
+        del anchor
+    if failed:
+        return None
+    return sum(page & 1 for page in bytes(vector))
+
+
+def _data_regions(path: str | None, size: int) -> list[Tuple[int, int]]:
+    """Return the ``(start, end)`` ranges of the first ``size`` bytes of ``path`` that may hold data.
+
+    Holes of sparse files are skipped where the platform can find them;
+    otherwise (or if ``path`` is None) the whole range is returned.
+    """
+    if path is None or not hasattr(os, "SEEK_DATA"):
+        return [(0, size)]
+    regions = []
+    with open(path, "rb") as fh:
+        offset = 0
+        while offset < size:
+            try:
+                start = os.lseek(fh.fileno(), offset, os.SEEK_DATA)
+            except OSError as exc:
+                if exc.errno == errno.ENXIO:
+                    break
+                return [(0, size)]
+            if start >= size:
+                break
+            end = min(os.lseek(fh.fileno(), start, os.SEEK_HOLE), size)
+            regions.append((start, end))
+            offset = end
+    return regions
+
+
+def _chunks(regions: Iterable[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+    """Split ``(start, end)`` ranges into ``(offset, length)`` pieces of at most ``_CHUNK_SIZE``."""
+    for start, end in regions:
+        for offset in range(start, end, _CHUNK_SIZE):
+            yield offset, min(_CHUNK_SIZE, end - offset)
+
+
+@dataclass
+class MappedRAM(RAM):
+    """A RAM whose memory is a memory-mapped file (anonymous memory if ``path`` is None).
+
+    An existing file keeps its contents and a shorter one is extended
+    without writing to it, so the operating system only allocates the
+    pages that are touched.  :meth:`snapshot` and :meth:`restore` save and
+    reload the whole memory through a file; call :meth:`close` (or use the
+    RAM as a context manager) to unmap it once all views are released.
+    """
+
+    path: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.size <= 0:
+            raise ValueError("RAM size must be positive")
+        if self.path is None:
+            self.memory = mmap.mmap(-1, self.size)
+            return
+        with open(self.path, "a+b") as fh:
+            if os.fstat(fh.fileno()).st_size < self.size:
+                fh.truncate(self.size)
+            self.memory = mmap.mmap(fh.fileno(), self.size)
+
+    def flush(self) -> None:
+        """Write changed pages back to the backing file."""
+        if self.path is not None:
+            self.memory.flush()
+
+    def snapshot(self, path: str) -> None:
+        """Save the memory to ``path`` atomically, leaving holes for zeroed regions.
+
+        For file-backed RAM only the regions holding data in the backing
+        file are read, so a sparse memory is saved in time proportional to
+        the pages in use.
+        """
+        self.flush()
+        with open(path + ".tmp", "wb") as fh, memoryview(self.memory) as view:
+            for offset, length in _chunks(_data_regions(self.path, self.size)):
+                chunk = view[offset : offset + length]
+                if chunk != _ZERO_CHUNK[:length]:
+                    fh.seek(offset)
+                    fh.write(chunk)
+            fh.truncate(self.size)
+        os.replace(path + ".tmp", path)
+
+    def restore(self, path: str) -> None:
+        """Replace the memory with the contents of a :meth:`snapshot` file of the same size.
+
+        Pages that are zero both in memory and in the snapshot are left
+        untouched, so restoring does not allocate them.
+        """
+        if os.path.getsize(path) != self.size:
+            raise ValueError(f"Snapshot '{path}' does not match a RAM of {self.size} bytes")
+        snapshot_regions = _data_regions(path, self.size)
+        with open(path, "rb") as fh, memoryview(self.memory) as view:
+            for offset, length in _chunks(_data_regions(self.path, self.size)):
+                if view[offset : offset + length] != _ZERO_CHUNK[:length]:
+                    view[offset : offset + length] = _ZERO_CHUNK[:length]
+            for offset, length in _chunks(snapshot_regions):
+                fh.seek(offset)
+                chunk = fh.read(length)
+                if chunk != _ZERO_CHUNK[:length]:
+                    view[offset : offset + length] = chunk
+
+    def page_stats(self) -> PageStats:
+        """Return how many pages of the mapping are resident in memory.
+
+        Uses ``mincore`` where available; elsewhere file-backed RAM reports
+        the pages allocated in its file and anonymous RAM reports every page.
+        """
+        pages = -(-self.size // mmap.PAGESIZE)
+        resident = _mincore(self.memory, self.size)
+        if resident is None:
+            if self.path is None:
+                resident = pages
+            else:
+                self.flush()
+                resident = min(pages, os.stat(self.path).st_blocks * 512 // mmap.PAGESIZE)
+        return PageStats(mmap.PAGESIZE, pages, resident)
+
+    def close(self) -> None:
+        self.flush()
+        self.memory.close()
+
+    def __enter__(self) -> "MappedRAM":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class PageSnapshot:
+    """The pages of a :class:`SparseRAM` at the time :meth:`SparseRAM.snapshot` was called."""
+
+    size: int
+    page_size: int
+    pages: Mapping[int, bytearray]
+
+
+@dataclass
+class SparseRAM(RAM):
+    """A RAM that allocates ``page_size``-byte pages on first write.
+
+    Pages that were never written read as zeros, so even a 64-bit address
+    space only costs the pages in use; filling whole pages with zero
+    releases them again.  Zero fills and copies only visit allocated
+    pages, so their cost does not grow with the range.  The memory is not contiguous, so :meth:`view`
+    is limited to a single page.
+
+    :meth:`snapshot` shares the current pages with the returned
+    :class:`PageSnapshot` instead of copying them; a shared page is only
+    copied the first time it is written afterwards.  Views taken before a
+    snapshot must not be written to after it.
+    """
+
+    page_size: int = PAGE_SIZE
+
+    def __post_init__(self) -> None:
+        if self.size <= 0:
+            raise ValueError("RAM size must be positive")
+        if self.page_size <= 0:
+            raise ValueError("Page size must be positive")
+        self.pages: dict[int, bytearray] = {}
+        self._shared: set[int] = set()
+
+    def _page(self, index: int) -> bytearray:
+        """Return page ``index`` for writing, allocating it or copying it away from snapshots."""
+        page = self.pages.get(index)
+        if page is None:
+            page = self.pages[index] = bytearray(self.page_size)
+        elif index in self._shared:
+            page = self.pages[index] = bytearray(page)
+            self._shared.discard(index)
+        return page
+
+    def _spans(self, start: int, length: int) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield ``(page index, offset in page, offset in range, length)`` covering a range."""
+        position = 0
+        while position < length:
+            index, offset = divmod(start + position, self.page_size)
+            count = min(self.page_size - offset, length - position)
+            yield index, offset, position, count
+            position += count
+
+    def _allocated_spans(self, start: int, length: int) -> list[Tuple[int, int, int, int]]:
+        """Return the spans of :meth:`_spans` that fall on allocated pages, visiting only those."""
+        if length <= 0:
+            return []
+        first, last = start // self.page_size, (start + length - 1) // self.page_size
+        if last - first < len(self.pages):
+            indices = [index for index in range(first, last + 1) if index in self.pages]
+        else:
+            indices = sorted(index for index in self.pages if first <= index <= last)
+        spans = []
+        for index in indices:
+            base = index * self.page_size
+            low, high = max(start, base), min(start + length, base + self.page_size)
+            spans.append((index, low - base, low - start, high - low))
+        return spans
+
+    def read(self, address: int) -> int:
+        """Read a single byte from memory."""
+        self._validate_address(address)
+        page = self.pages.get(address // self.page_size)
+        return page[address % self.page_size] if page is not None else 0
+
+    def write(self, address: int, value: int) -> None:
+        """Write a single byte to memory."""
+        self._validate_address(address)
+        if not 0 <= value <= 0xFF:
+            raise ValueError("Value must be between 0 and 255")
+        self._page(address // self.page_size)[address % self.page_size] = value
+
+    def view(self, start: int = 0, end: int | None = None) -> memoryview:
+        """Return a writable view of a range within one page, allocating the page."""
+        if end is None:
+            end = self.size
+        self._validate_range(start, end)
+        index, offset = divmod(start, self.page_size)
+        if end - start > self.page_size - offset:
+            raise ValueError("SparseRAM views cannot span pages")
+        return memoryview(self._page(index))[offset : offset + end - start]
+
+    def __buffer__(self, flags: int) -> memoryview:
+        raise TypeError("SparseRAM memory is not contiguous")
+
+    def read_block(self, start: int, length: int) -> bytes:
+        """Return a copy of ``length`` bytes of memory starting at ``start``."""
+        self._validate_range(start, start + length)
+        block = bytearray(length)
+        for index, offset, position, count in self._allocated_spans(start, length):
+            block[position : position + count] = self.pages[index][offset : offset + count]
+        return bytes(block)
+
+    def write_block(self, start: int, data: bytes | bytearray | memoryview) -> None:
+        """Write the raw bytes of ``data`` (any buffer) to memory starting at ``start``.
+
+        The whole range is validated before anything is written.
+        """
+        with memoryview(data) as block, block.cast("B") as raw:
+            self._validate_range(start, start + raw.nbytes)
+            for index, offset, position, count in self._spans(start, raw.nbytes):
+                self._page(index)[offset : offset + count] = raw[position : position + count]
+
+    def fill(self, start: int, length: int, value: int = 0) -> None:
+        """Set ``length`` bytes of memory starting at ``start`` to ``value``."""
+        self._validate_range(start, start + length)
+        if not 0 <= value <= 0xFF:
+            raise ValueError("Value must be between 0 and 255")
+        if not value:
+            for index, offset, _, count in self._allocated_spans(start, length):
+                if count == self.page_size:
+                    self._shared.discard(index)
+                    del self.pages[index]
+                else:
+                    self._page(index)[offset : offset + count] = bytes(count)
+            return
+        for index, offset, _, count in self._spans(start, length):
+            if count == self.page_size:
+                self._shared.discard(index)
+                self.pages[index] = bytearray(bytes((value,)) * count)
+            else:
+                self._page(index)[offset : offset + count] = bytes((value,)) * count
+
+    def copy(self, dest: int, src: int, length: int) -> None:
+        """Copy ``length`` bytes from ``src`` to ``dest``; the ranges may overlap, as with memmove.
+
+        Only the allocated pages of the source are read; the rest of the
+        destination is zero-filled, releasing its whole pages.
+        """
+        self._validate_range(dest, dest + length)
+        self._validate_range(src, src + length)
+        chunks = [
+            (position, bytes(self.pages[index][offset : offset + count]))
+            for index, offset, position, count in self._allocated_spans(src, length)
+        ]
+        self.fill(dest, length)
+        for position, chunk in chunks:
+            self.write_block(dest + position, chunk)
+
+    def _unpack(self, fmt: struct.Struct, address: int) -> int:
+        index, offset = divmod(address, self.page_size)
+        if offset + fmt.size <= self.page_size:
+            page = self.pages.get(index)
+            return fmt.unpack_from(page, offset)[0] if page is not None else 0
+        return fmt.unpack(self.read_block(address, fmt.size))[0]
+
+    def _pack(self, fmt: struct.Struct, address: int, value: int) -> None:
+        index, offset = divmod(address, self.page_size)
+        if offset + fmt.size <= self.page_size:
+            fmt.pack_into(self._page(index), offset, value)
+        else:
+            self.write_block(address, fmt.pack(value))
+
+    def page_stats(self) -> PageStats:
+        """Return how many pages have been allocated."""
+        return PageStats(self.page_size, -(-self.size // self.page_size), len(self.pages))
+
+    def snapshot(self) -> PageSnapshot:
+        """Return a copy-on-write snapshot of the memory; it costs one reference per page."""
+        self._shared = set(self.pages)
+        return PageSnapshot(self.size, self.page_size, dict(self.pages))
+
+    def _check_snapshot(self, snapshot: PageSnapshot) -> None:
+        if (snapshot.size, snapshot.page_size) != (self.size, self.page_size):
+            raise ValueError("Snapshot was taken from a RAM of a different size or page size")
+
+    def restore(self, snapshot: PageSnapshot) -> None:
+        """Return the memory to the contents of ``snapshot``, sharing its pages again."""
+        self._check_snapshot(snapshot)
+        self.pages = dict(snapshot.pages)
+        self._shared = set(self.pages)
+
+    def diff(self, snapshot: PageSnapshot, other: PageSnapshot | None = None) -> list[Tuple[int, int]]:
+        """Return the sorted ``(start, end)`` address ranges that differ between two states.
+
+        Compares ``snapshot`` with ``other`` or, by default, with the
+        current memory.  Pages still shared by both sides are skipped
+        without being read.
+        """
+        self._check_snapshot(snapshot)
+        if other is not None:
+            self._check_snapshot(other)
+        before, after = snapshot.pages, self.pages if other is None else other.pages
+        zero = bytes(self.page_size)
+        ranges: list[Tuple[int, int]] = []
+        for index in sorted(before.keys() | after.keys()):
+            old, new = before.get(index), after.get(index)
+            if old is new:
+                continue
+            old = old if old is not None else zero
+            new = new if new is not None else zero
+            if old == new:
+                continue
+            changed = int.from_bytes(old, "big") ^ int.from_bytes(new, "big")
+            base = index * self.page_size
+            for match in _NONZERO_RE.finditer(changed.to_bytes(self.page_size, "big")):
+                start, end = base + match.start(), base + match.end()
+                if ranges and ranges[-1][1] == start:
+                    ranges[-1] = (ranges[-1][0], end)
+                else:
+                    ranges.append((start, end))
+        return ranges
+
+
+def _as_bytes(data: Iterable[int]) -> bytes | memoryview | None:
+    """Return ``data`` as bytes if that can be done without consuming it, else None."""
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    if isinstance(data, memoryview) and data.format == "B" and data.ndim == 1 and data.c_contiguous:
+        return data
+    if isinstance(data, (list, tuple)):
+        try:
+            return bytes(data)
+        except (TypeError, ValueError):
+            return None
+    return None
 
 
 def _demo() -> None:
@@ -3,7 +3,73 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import csv
+import errno
+import hashlib
+import ipaddress
+import itertools
+import json
+import os
+import re
 import socket
+import time
+from collections import deque
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Iterable, Iterator, NamedTuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; the descriptor limit is then not checked.
+    resource = None
+
+DEFAULT_CONCURRENCY = 500
+"""Connection attempts kept in flight by :class:`Scanner`."""
+
+FD_HEADROOM = 64
+"""File descriptors left free for other files when capping the sockets in flight."""
+
+SOCKET_RETRY_DELAY = 0.01
+SOCKET_RETRY_MAX_DELAY = 1.0
+"""Back-off, in seconds, while the process or system is out of file descriptors."""
+
+DEFAULT_MIN_TIMEOUT = 0.05
+DEFAULT_MAX_TIMEOUT = 3.0
+"""Bounds of the per-host timeout in adaptive mode, in seconds."""
+
+DEFAULT_BLOCK_SIZE = 256
+"""Ports per block recorded by :class:`ScanCheckpoint`."""
+
+CHECKPOINT_VERSION = 1
+OUTPUT_FORMATS = ("jsonl", "csv")
+
+DEFAULT_BANNER_TIMEOUT = 2.0
+DEFAULT_GREETING_TIMEOUT = 0.5
+DEFAULT_BANNER_BYTES = 1024
+DEFAULT_BANNER_WORKERS = 100
+"""Defaults of :class:`BannerGrabber`."""
+
+HTTP_PROBE = b"HEAD / HTTP/1.0\r\nHost: %s\r\n\r\n"
+"""Sent to ports that stay silent after connecting."""
+
+SERVICE_SIGNATURES = (
+    ("ssh", rb"SSH-\d+\.\d+-"),
+    ("http", rb"HTTP/\d(?:\.\d)? \d{3}\b"),
+    ("ftp", rb"220[ -][^\r\n]*FTP"),
+    ("smtp", rb"220[ -][^\r\n]*\b(?:E?SMTP|Postfix|Exim|Sendmail)\b"),
+    ("pop3", rb"\+OK\b"),
+    ("imap", rb"\* OK\b"),
+    ("mysql", rb".{4}\x0a\d+\.\d+\.\d+"),
+    ("redis", rb"-(?:ERR|NOAUTH|DENIED)\b"),
+)
+"""Service name and banner pattern, tried in order at the start of the banner."""
+
+_SIGNATURE_RE = re.compile(
+    b"|".join(b"(?P<%s>%s)" % (name.encode(), pattern) for name, pattern in SERVICE_SIGNATURES),
+    re.IGNORECASE | re.DOTALL,
+)
+_SERVER_HEADER_RE = re.compile(rb"\r?\nServer:[ \t]*([^\r\n]*)", re.IGNORECASE)
 
 
 def scan_ports(host: str, start: int, end: int, timeout: float = 0.5) -> list[int]:
@@ -17,19 +83,909 @@ def scan_ports(host: str, start: int, end: int, timeout: float = 0.5) -> list[in
     return open_ports
 
 
+class RateLimiter:
+    """Spaces out calls to :meth:`wait` so at most ``rate`` happen per second."""
+
+    def __init__(self, rate: float | None) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self._interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ScanResult(NamedTuple):
+    """An open port found by :class:`Scanner`: connect time in seconds and Unix time found.
+
+    ``connection`` is the connected socket when the scanner was created with
+    ``keep_open=True``; whoever consumes the result must close it.
+    """
+
+    host: str
+    port: int
+    latency: float
+    timestamp: float = 0.0
+    connection: socket.socket | None = None
+
+
+class ServiceResult(NamedTuple):
+    """An open port identified by :class:`BannerGrabber`.
+
+    ``service`` is the name of the matching entry of
+    :data:`SERVICE_SIGNATURES` (None if nothing matched) and ``banner`` the
+    first line the port sent back.
+    """
+
+    host: str
+    port: int
+    latency: float
+    timestamp: float
+    service: str | None
+    banner: str
+
+
+def parse_ports(spec: str) -> list[int]:
+    """Parse a port list such as ``"22,80,443,8000-8100"`` (duplicates removed, order kept)."""
+    ports: dict[int, None] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        first, _, last = part.partition("-")
+        try:
+            low, high = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid port range '{part}'") from None
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"Invalid port range '{part}'")
+        ports.update(dict.fromkeys(range(low, high + 1)))
+    return list(ports)
+
+
+def expand_targets(specs: Iterable[str]) -> Iterator[str]:
+    """Return an iterator over the hosts named by ``specs``: host names, addresses or CIDR networks.
+
+    Every spec is validated up front, so a malformed network raises
+    ``ValueError`` here; the addresses of each network are produced lazily.
+    """
+    targets: list[str | ipaddress.IPv4Network | ipaddress.IPv6Network] = []
+    for spec in specs:
+        spec = spec.strip()
+        if "/" in spec:
+            targets.append(ipaddress.ip_network(spec, strict=False))
+        elif spec:
+            targets.append(spec)
+    return itertools.chain.from_iterable(
+        map(str, target.hosts()) if not isinstance(target, str) else (target,) for target in targets
+    )
+
+
+def read_host_file(path: str) -> list[str]:
+    """Return the targets listed in ``path``, one per line, ignoring ``#`` comments."""
+    with open(path, "r", encoding="utf-8") as fh:
+        return [line.split("#", 1)[0].strip() for line in fh if line.split("#", 1)[0].strip()]
+
+
+async def _resolve(host: str) -> tuple[int, tuple]:
+    """Return the address family and socket address of ``host`` (port 0)."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        loop = asyncio.get_running_loop()
+        family, _, _, _, sockaddr = (await loop.getaddrinfo(host, 0, type=socket.SOCK_STREAM))[0]
+        return family, sockaddr
+    if address.version == 6:
+        return socket.AF_INET6, (host, 0, 0, 0)
+    return socket.AF_INET, (host, 0)
+
+
+def socket_limit() -> int | None:
+    """Return how many sockets may be open at once under ``RLIMIT_NOFILE``, or None if unlimited.
+
+    :data:`FD_HEADROOM` descriptors are left for standard streams, output
+    files and the like.
+    """
+    if resource is None:
+        return None
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return None
+    return max(soft - FD_HEADROOM, 1)
+
+
+async def _new_socket(family: int) -> socket.socket:
+    """Create a non-blocking TCP socket, waiting while no file descriptor is free (EMFILE/ENFILE)."""
+    delay = SOCKET_RETRY_DELAY
+    while True:
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError as exc:
+            if exc.errno not in (errno.EMFILE, errno.ENFILE):
+                raise
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SOCKET_RETRY_MAX_DELAY)
+            continue
+        sock.setblocking(False)
+        return sock
+
+
+async def open_port(
+    family: int, address: tuple, port: int, timeout: float
+) -> tuple[bool | None, float, socket.socket | None]:
+    """Like :func:`connect_port`, but also return the connected socket (None unless open).
+
+    Running out of file descriptors delays the attempt instead of failing it.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        sock = await _new_socket(family)
+    except OSError:
+        return False, 0.0, None
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (address[0], port, *address[2:])), timeout)
+    except asyncio.TimeoutError:
+        sock.close()
+        return None, time.perf_counter() - started, None
+    except OSError:
+        sock.close()
+        return False, time.perf_counter() - started, None
+    except BaseException:
+        sock.close()
+        raise
+    return True, time.perf_counter() - started, sock
+
+
+async def connect_port(family: int, address: tuple, port: int, timeout: float) -> tuple[bool | None, float]:
+    """Try to connect to ``address`` on ``port`` and return ``(state, seconds)``.
+
+    ``state`` is True when the port accepted the connection, False when the
+    host answered that it is closed (or unreachable) and None when nothing
+    came back within ``timeout``, which may mean a filtered port or a lost
+    packet.
+    """
+    state, elapsed, sock = await open_port(family, address, port, timeout)
+    if sock is not None:
+        sock.close()
+    return state, elapsed
+
+
+async def probe_port(family: int, address: tuple, port: int, timeout: float) -> float | None:
+    """Return the connect time to ``address`` on ``port``, or None if it fails within ``timeout``."""
+    state, elapsed = await connect_port(family, address, port, timeout)
+    return elapsed if state else None
+
+
+class RttEstimator:
+    """Smoothed connect round-trip time of one host, TCP retransmission-timer style.
+
+    Every definite answer (accepted or refused connection) is a sample.
+    ``timeout`` is ``srtt + 4 * rttvar`` as in RFC 6298, clamped to
+    ``[min_timeout, max_timeout]``, or ``initial`` before the first sample.
+    ``probes``, ``retries`` and ``timeouts`` count connection attempts,
+    repeated attempts and probes still unanswered after the retries.
+    """
+
+    __slots__ = ("initial", "min_timeout", "max_timeout", "srtt", "rttvar", "samples", "probes", "retries", "timeouts")
+
+    def __init__(self, initial: float, min_timeout: float, max_timeout: float) -> None:
+        self.initial = initial
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.samples = 0
+        self.probes = 0
+        self.retries = 0
+        self.timeouts = 0
+
+    def observe(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.initial
+        return min(max(self.srtt + 4 * self.rttvar, self.min_timeout), self.max_timeout)
+
+
+class ScanCheckpoint:
+    """Completed ``(host, port block)`` pairs of a scan, saved to ``path``.
+
+    The port list is cut into blocks of ``block_size`` ports; a block is
+    recorded once every port in it has been probed and its open ports have
+    been handed to the consumer, so a resumed scan skips it.  The file is
+    written atomically at most every ``interval`` seconds and by
+    :meth:`save`.  A checkpoint made for another port list or block size is
+    ignored (``resumed`` is False).
+
+    A block with open ports still :meth:`hold`-ing it is only recorded by
+    :meth:`mark` once the last of them is :meth:`release`-d.
+    """
+
+    def __init__(self, path: str, ports: list[int], block_size: int = DEFAULT_BLOCK_SIZE, interval: float = 5.0) -> None:
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self.path = path
+        self.block_size = block_size
+        self.interval = interval
+        self.fingerprint = hashlib.sha256(json.dumps([block_size, ports]).encode("ascii")).hexdigest()
+        self.completed: dict[str, set[int]] = {}
+        self.resumed = False
+        self._saved_at = time.monotonic()
+        self._holds: dict[tuple[str, int], int] = {}
+        self._waiting: set[tuple[str, int]] = set()
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if state.get("version") == CHECKPOINT_VERSION and state.get("fingerprint") == self.fingerprint:
+            self.completed = {
+                host: {block for first, last in ranges for block in range(first, last + 1)}
+                for host, ranges in state["completed"].items()
+            }
+            self.resumed = True
+
+    def hold(self, host: str, block: int) -> None:
+        """Keep ``block`` from being recorded until a matching :meth:`release`."""
+        self._holds[host, block] = self._holds.get((host, block), 0) + 1
+
+    def release(self, host: str, block: int) -> None:
+        """Drop a :meth:`hold`, recording the block if it was marked meanwhile."""
+        self._holds[host, block] -= 1
+        if not self._holds[host, block]:
+            del self._holds[host, block]
+            if (host, block) in self._waiting:
+                self._waiting.discard((host, block))
+                self.mark(host, block)
+
+    def mark(self, host: str, block: int) -> None:
+        if (host, block) in self._holds:
+            self._waiting.add((host, block))
+            return
+        self.completed.setdefault(host, set()).add(block)
+        if time.monotonic() - self._saved_at >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        completed = {}
+        for host, blocks in self.completed.items():
+            ranges: list[list[int]] = []
+            for block in sorted(blocks):
+                if ranges and ranges[-1][1] == block - 1:
+                    ranges[-1][1] = block
+                else:
+                    ranges.append([block, block])
+            completed[host] = ranges
+        state = {"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint, "completed": completed}
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(temporary, self.path)
+        self._saved_at = time.monotonic()
+
+
+class ResultWriter:
+    """Write each :class:`ScanResult` to a JSON Lines or CSV file as it arrives.
+
+    Every row carries an ISO 8601 UTC timestamp, the host, the port and the
+    connect latency in milliseconds; with ``services=True`` rows are
+    :class:`ServiceResult` and also carry the service and banner.  With
+    ``append=True`` rows are added to an existing file (the CSV header is
+    only written to an empty file).
+    """
+
+    FIELDS = ("timestamp", "host", "port", "latency_ms")
+    SERVICE_FIELDS = FIELDS + ("service", "banner")
+
+    def __init__(
+        self, path: str, output_format: str | None = None, append: bool = False, services: bool = False
+    ) -> None:
+        self.format = output_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if self.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{self.format}'")
+        self.fields = self.SERVICE_FIELDS if services else self.FIELDS
+        self._fh = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._csv = None
+        if self.format == "csv":
+            self._csv = csv.writer(self._fh)
+            if self._fh.tell() == 0:
+                self._csv.writerow(self.fields)
+
+    def write(self, result: ScanResult | ServiceResult) -> None:
+        timestamp = datetime.fromtimestamp(result.timestamp, timezone.utc).isoformat(timespec="milliseconds")
+        row: tuple = (timestamp, result.host, result.port, round(result.latency * 1000, 3))
+        if self.fields is self.SERVICE_FIELDS:
+            row += (result.service, result.banner)
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._fh.write(json.dumps(dict(zip(self.fields, row))) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _Target:
+    """Scheduling state of one host: remaining ports, probes in flight, rate limit."""
+
+    def __init__(
+        self,
+        host: str,
+        ports: list[int],
+        rate: float | None,
+        timing: RttEstimator,
+        block_size: int | None = None,
+        done_blocks: set[int] | frozenset[int] = frozenset(),
+    ) -> None:
+        self.host = host
+        self.total = len(ports)
+        self.block_size = block_size
+        if block_size and done_blocks:
+            self.ports = ((index, port) for index, port in enumerate(ports) if index // block_size not in done_blocks)
+        else:
+            self.ports = enumerate(ports)
+        self.last_index = -1
+        self.pending: dict[int, int] = {}
+        self.in_flight = 0
+        self.unresolved = False
+        self.limiter = RateLimiter(rate)
+        self.timing = timing
+        self._address: asyncio.Future | None = None
+
+    async def address(self) -> tuple[int, tuple]:
+        if self._address is None:
+            self._address = asyncio.ensure_future(_resolve(self.host))
+        return await self._address
+
+    def launched(self, index: int) -> None:
+        self.last_index = index
+        if self.block_size:
+            block = index // self.block_size
+            self.pending[block] = self.pending.get(block, 0) + 1
+
+    def finished(self, index: int) -> int | None:
+        """Record a finished probe; return its block if that completes the block.
+
+        Blocks of a host that could not be resolved are never complete.
+        """
+        if not self.block_size or self.unresolved:
+            return None
+        block = index // self.block_size
+        self.pending[block] -= 1
+        block_end = min((block + 1) * self.block_size, self.total) - 1
+        if self.pending[block] or self.last_index < block_end:
+            return None
+        del self.pending[block]
+        return block
+
+
+class Scanner:
+    """Scan many hosts and ports at once under global and per-host limits.
+
+    At most ``max_sockets`` connection attempts are open in total and at
+    most ``per_host`` against any one host, which may also be limited to
+    ``rate`` attempts per second.  Hosts are served round-robin, one port at
+    a time, so a slow or filtered host only ever holds its own share of the
+    sockets.  Hosts that cannot be resolved are listed in ``unresolved``.
+    ``max_sockets`` is capped by :func:`socket_limit` so the scan stays
+    within the process's file descriptor limit.
+
+    With ``adaptive=True`` each probe waits for the timeout of the host's
+    :class:`RttEstimator` instead of the fixed ``timeout`` (which is then
+    only the initial value).  Probes left unanswered are retried up to
+    ``retries`` times, doubling the timeout each time; refused connections
+    are definite and never retried.  With ``keep_timings=True`` the
+    estimators of all scanned hosts are kept in ``timings``; otherwise each
+    is dropped with its host once its ports are done, so memory does not
+    grow with the number of hosts.  ``connector`` replaces
+    :func:`connect_port`, e.g. to simulate network conditions.
+
+    With ``keep_open=True`` the sockets of open ports are not closed but
+    handed over in :attr:`ScanResult.connection`, so that a later stage such
+    as :class:`BannerGrabber` can reuse them instead of connecting again.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 0.5,
+        max_sockets: int = DEFAULT_CONCURRENCY,
+        per_host: int | None = None,
+        rate: float | None = None,
+        adaptive: bool = False,
+        retries: int = 0,
+        min_timeout: float = DEFAULT_MIN_TIMEOUT,
+        max_timeout: float = DEFAULT_MAX_TIMEOUT,
+        connector: Callable[[int, tuple, int, float], Awaitable[tuple[bool | None, float]]] | None = None,
+        keep_open: bool = False,
+        keep_timings: bool = False,
+    ) -> None:
+        per_host = max_sockets if per_host is None else per_host
+        if max_sockets <= 0 or per_host <= 0:
+            raise ValueError("max_sockets and per_host must be positive")
+        limit = socket_limit()
+        if limit is not None and max_sockets > limit:
+            max_sockets = limit
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        self.timeout = timeout
+        self.max_sockets = max_sockets
+        self.per_host = per_host
+        self.rate = rate
+        self.adaptive = adaptive
+        self.retries = retries
+        self.min_timeout = min_timeout
+        self.max_timeout = max(max_timeout, timeout)
+        self.connector = connector
+        self.keep_open = keep_open
+        self.keep_timings = keep_timings
+        self.unresolved: list[str] = []
+        self.timings: dict[str, RttEstimator] = {}
+        self._unacknowledged: dict[tuple[str, int], tuple[ScanCheckpoint, int]] = {}
+
+    def _target(self, host: str, ports: list[int], checkpoint: ScanCheckpoint | None) -> _Target:
+        timing = RttEstimator(self.timeout, self.min_timeout, self.max_timeout)
+        if self.keep_timings:
+            timing = self.timings.setdefault(host, timing)
+        if checkpoint is None:
+            return _Target(host, ports, self.rate, timing)
+        done = checkpoint.completed.get(host, frozenset())
+        return _Target(host, ports, self.rate, timing, checkpoint.block_size, done)
+
+    async def _probe(self, target: _Target, port: int) -> ScanResult | None:
+        try:
+            family, address = await target.address()
+        except OSError:
+            if not target.unresolved:
+                target.unresolved = True
+                target.ports = iter(())
+                target.pending.clear()
+                if target.host not in self.unresolved:
+                    self.unresolved.append(target.host)
+            return None
+        connector = self.connector or connect_port
+        timing = target.timing
+        for attempt in range(self.retries + 1):
+            timeout = self.timeout
+            if self.adaptive:
+                timeout = min(timing.timeout * 2**attempt, self.max_timeout)
+            await target.limiter.wait()
+            timing.probes += 1
+            timing.retries += attempt > 0
+            if self.keep_open and self.connector is None:
+                state, elapsed, sock = await open_port(family, address, port, timeout)
+            else:
+                (state, elapsed), sock = await connector(family, address, port, timeout), None
+            if state is not None:
+                timing.observe(elapsed)
+                return ScanResult(target.host, port, elapsed, time.time(), sock) if state else None
+        timing.timeouts += 1
+        return None
+
+    def acknowledge(self, result: ScanResult) -> None:
+        """Tell a ``scan(..., acknowledge=True)`` that ``result`` has been fully handled."""
+        held = self._unacknowledged.pop((result.host, result.port), None)
+        if held is not None:
+            checkpoint, block = held
+            checkpoint.release(result.host, block)
+
+    async def scan(
+        self,
+        hosts: Iterable[str],
+        ports: Iterable[int],
+        checkpoint: ScanCheckpoint | None = None,
+        acknowledge: bool = False,
+    ) -> AsyncIterator[ScanResult]:
+        """Yield a :class:`ScanResult` for every open port, as soon as it is found.
+
+        ``hosts`` is consumed lazily: at most ``max_sockets`` hosts are
+        being scanned at any time.  Blocks already recorded in
+        ``checkpoint`` are skipped and newly finished ones are recorded; the
+        checkpoint is saved when the scan ends or is interrupted.
+
+        A result counts as handled once the consumer asks for the next one,
+        or, with ``acknowledge=True``, once it is passed to
+        :meth:`acknowledge`; a block is only recorded after all of its
+        results were handled.  Use the latter when results are queued for a
+        later stage such as :meth:`BannerGrabber.pipeline`.
+        """
+        ports = list(ports)
+        pending_hosts = iter(hosts)
+        ready: deque[_Target] = deque()
+        in_flight: dict[asyncio.Future, tuple[_Target, int]] = {}
+        try:
+            while True:
+                launched = True
+                while launched and len(in_flight) < self.max_sockets:
+                    launched = False
+                    while len(ready) < self.max_sockets:
+                        host = next(pending_hosts, None)
+                        if host is None:
+                            break
+                        ready.append(self._target(host, ports, checkpoint))
+                    for _ in range(len(ready)):
+                        if len(in_flight) >= self.max_sockets:
+                            break
+                        target = ready.popleft()
+                        if target.in_flight >= self.per_host:
+                            ready.append(target)
+                            continue
+                        item = next(target.ports, None)
+                        if item is None:
+                            continue
+                        ready.append(target)
+                        index, port = item
+                        target.launched(index)
+                        target.in_flight += 1
+                        in_flight[asyncio.ensure_future(self._probe(target, port))] = (target, index)
+                        launched = True
+                if not in_flight:
+                    return
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    target, index = in_flight.pop(task)
+                    target.in_flight -= 1
+                    result = task.result()
+                    if result is not None:
+                        if acknowledge and target.block_size:
+                            block = index // target.block_size
+                            checkpoint.hold(target.host, block)
+                            self._unacknowledged[target.host, result.port] = (checkpoint, block)
+                        yield result
+                    block = target.finished(index)
+                    if block is not None:
+                        checkpoint.mark(target.host, block)
+        finally:
+            for task in in_flight:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and task.result() is not None:
+                    if task.result().connection is not None:
+                        task.result().connection.close()
+            if checkpoint is not None:
+                checkpoint.save()
+
+
+def identify_service(banner: bytes) -> str | None:
+    """Return the name of the first :data:`SERVICE_SIGNATURES` entry matching ``banner``."""
+    match = _SIGNATURE_RE.match(banner)
+    return match.lastgroup if match else None
+
+
+def _banner_text(data: bytes, service: str | None, limit: int = 200) -> str:
+    """Return the first line of ``data`` (plus the Server header for HTTP) as printable text."""
+    line = data.split(b"\n", 1)[0].strip()
+    if service == "http":
+        server = _SERVER_HEADER_RE.search(data)
+        if server and server.group(1).strip():
+            line += b" (" + server.group(1).strip() + b")"
+    text = line.decode("utf-8", "replace")
+    return "".join(ch if ch.isprintable() else "?" for ch in text[:limit])
+
+
+class BannerGrabber:
+    """Identify the services behind open ports from what they send back.
+
+    Each port is first given ``greeting_timeout`` seconds to greet on its
+    own (SSH, SMTP, FTP, POP3, IMAP...); silent ports are sent
+    :data:`HTTP_PROBE` and given ``timeout`` seconds to answer.  At most
+    ``max_bytes`` are read per port and the response is matched against
+    :data:`SERVICE_SIGNATURES`, compiled into a single pattern.
+
+    :meth:`pipeline` runs as a consumer of :meth:`Scanner.scan`: results are
+    grabbed by ``workers`` concurrent tasks while discovery goes on, through
+    a queue of ``queue_size`` results that slows the scan down when the
+    grabbers fall behind.  Sockets kept open by the scanner are reused;
+    other results are connected to again.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_BANNER_TIMEOUT,
+        greeting_timeout: float = DEFAULT_GREETING_TIMEOUT,
+        max_bytes: int = DEFAULT_BANNER_BYTES,
+        workers: int = DEFAULT_BANNER_WORKERS,
+        queue_size: int | None = None,
+    ) -> None:
+        if max_bytes <= 0 or workers <= 0:
+            raise ValueError("max_bytes and workers must be positive")
+        self.timeout = timeout
+        self.greeting_timeout = min(greeting_timeout, timeout)
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.queue_size = queue_size or workers
+
+    async def _recv(self, sock: socket.socket, timeout: float) -> bytes:
+        """Read until a full greeting line or HTTP header, ``max_bytes``, EOF or ``timeout``."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        buffer = bytearray()
+        while len(buffer) < self.max_bytes:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(loop.sock_recv(sock, self.max_bytes - len(buffer)), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                break
+            buffer += chunk
+            if b"\r\n\r\n" in buffer or (b"\n" in buffer and not buffer.startswith(b"HTTP/")):
+                break
+        return bytes(buffer)
+
+    async def grab(self, result: ScanResult) -> ServiceResult:
+        """Read the banner of the open port in ``result`` and close its connection."""
+        sock = result.connection
+        if sock is None:
+            try:
+                family, address = await _resolve(result.host)
+                _, _, sock = await open_port(family, address, result.port, self.timeout)
+            except OSError:
+                sock = None
+        data = b""
+        if sock is not None:
+            try:
+                data = await self._recv(sock, self.greeting_timeout)
+                if not data:
+                    loop = asyncio.get_running_loop()
+                    await asyncio.wait_for(loop.sock_sendall(sock, HTTP_PROBE % result.host.encode()), self.timeout)
+                    data = await self._recv(sock, self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                pass
+            finally:
+                sock.close()
+        service = identify_service(data)
+        return ServiceResult(
+            result.host, result.port, result.latency, result.timestamp, service, _banner_text(data, service)
+        )
+
+    async def pipeline(
+        self,
+        results: AsyncGenerator[ScanResult, None],
+        acknowledge: Callable[[ScanResult], None] | None = None,
+    ) -> AsyncIterator[ServiceResult]:
+        """Yield a :class:`ServiceResult` for each of ``results``, in the order they are identified.
+
+        ``acknowledge``, typically :meth:`Scanner.acknowledge`, is called
+        with each scan result once its service result has been consumed.
+        """
+        pending: asyncio.Queue[ScanResult | None] = asyncio.Queue(self.queue_size)
+        identified: asyncio.Queue[tuple[ScanResult, ServiceResult] | None] = asyncio.Queue(self.queue_size)
+
+        async def produce() -> None:
+            try:
+                async with aclosing(results):
+                    async for result in results:
+                        await pending.put(result)
+            except asyncio.CancelledError:
+                raise  # the workers are being cancelled too; nobody would take the sentinels
+            except BaseException:
+                for _ in range(self.workers):
+                    await pending.put(None)
+                raise
+            for _ in range(self.workers):
+                await pending.put(None)
+
+        async def work() -> None:
+            while (result := await pending.get()) is not None:
+                await identified.put((result, await self.grab(result)))
+            await identified.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        tasks = [producer] + [asyncio.ensure_future(work()) for _ in range(self.workers)]
+        try:
+            running = self.workers
+            while running:
+                item = await identified.get()
+                if item is None:
+                    running -= 1
+                    continue
+                result, service = item
+                yield service
+                if acknowledge is not None:
+                    acknowledge(result)
+            await producer
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            for task in tasks[1:]:
+                task.cancel()
+            await asyncio.gather(*tasks[1:], return_exceptions=True)
+            while not pending.empty():
+                result = pending.get_nowait()
+                if result is not None and result.connection is not None:
+                    result.connection.close()
+
+
+async def scan_ports_async(
+    host: str,
+    start: int,
+    end: int,
+    timeout: float = 0.5,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float | None = None,
+) -> list[int]:
+    """Return the open TCP ports on ``host`` between ``start`` and ``end``.
+
+    Up to ``concurrency`` connection attempts are in flight at once and, if
+    ``rate`` is given, no more than ``rate`` are started per second.
+    """
+    scanner = Scanner(timeout, concurrency, rate=rate)
+    open_ports = [result.port async for result in scanner.scan([host], range(start, end + 1))]
+    if scanner.unresolved:
+        raise OSError(f"Could not resolve host '{host}'")
+    return sorted(open_ports)
+
+
+def scan_ports_concurrent(
+    host: str,
+    start: int,
+    end: int,
+    timeout: float = 0.5,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float | None = None,
+) -> list[int]:
+    """Synchronous wrapper around :func:`scan_ports_async`."""
+    return asyncio.run(scan_ports_async(host, start, end, timeout, concurrency, rate))
+
+
+async def _print_results(
+    scanner: Scanner,
+    hosts: Iterable[str],
+    ports: list[int],
+    writer: ResultWriter | None = None,
+    checkpoint: ScanCheckpoint | None = None,
+    grabber: BannerGrabber | None = None,
+) -> int:
+    found = 0
+    results = scanner.scan(hosts, ports, checkpoint, acknowledge=grabber is not None)
+    if grabber is not None:
+        results = grabber.pipeline(results, scanner.acknowledge)
+    try:
+        async with aclosing(results):
+            async for result in results:
+                found += 1
+                line = f"{result.host}:{result.port} open ({result.latency * 1000:.1f} ms)"
+                if grabber is not None:
+                    line += f" {result.service or 'unknown'}" + (f": {result.banner}" if result.banner else "")
+                print(line, flush=True)
+                if writer is not None:
+                    writer.write(result)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()  # blocks acknowledged after the scan itself ended
+    return found
+
+
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Scan a host for open TCP ports")
-    parser.add_argument("host", help="Host name or IP address to scan")
+    parser = argparse.ArgumentParser(description="Scan hosts for open TCP ports")
+    parser.add_argument("targets", nargs="*", help="Host names, IP addresses or CIDR networks to scan")
+    parser.add_argument("--hosts-file", help="File with one target per line")
     parser.add_argument("--start", type=int, default=1, help="Starting port (default: 1)")
     parser.add_argument("--end", type=int, default=1024, help="Ending port (default: 1024)")
+    parser.add_argument("--ports", help="Port list such as 22,80,443,8000-8100 (overrides --start/--end)")
+    parser.add_argument("--timeout", type=float, default=0.5, help="Seconds to wait per port (default: 0.5)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Connection attempts in flight in total (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument("--per-host", type=int, help="Connection attempts in flight per host (default: no limit)")
+    parser.add_argument("--rate", type=float, help="Maximum connection attempts per second per host")
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Derive each host's timeout from its measured RTT (--timeout is the initial value)",
+    )
+    parser.add_argument("--retries", type=int, default=0, help="Retries for unanswered probes (default: 0)")
+    parser.add_argument("--stats", action="store_true", help="Print per-host timing statistics at the end")
+    parser.add_argument("--output", help="Also stream open ports to this JSON Lines or CSV file")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="Format of --output (default: from its extension)")
+    parser.add_argument("--checkpoint", help="File recording finished port blocks, to resume an interrupted scan")
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help=f"Ports per checkpointed block (default: {DEFAULT_BLOCK_SIZE})",
+    )
+    parser.add_argument(
+        "--banners", action="store_true", help="Read the banner of every open port and identify its service"
+    )
+    parser.add_argument(
+        "--banner-timeout",
+        type=float,
+        default=DEFAULT_BANNER_TIMEOUT,
+        help=f"Seconds to wait for a banner (default: {DEFAULT_BANNER_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--banner-workers",
+        type=int,
+        default=DEFAULT_BANNER_WORKERS,
+        help=f"Banners read at once (default: {DEFAULT_BANNER_WORKERS})",
+    )
     args = parser.parse_args()
 
-    print(f"Scanning {args.host} from port {args.start} to {args.end}...")
-    open_ports = scan_ports(args.host, args.start, args.end)
-    if open_ports:
-        print("Open ports found:")
-        for port in open_ports:
-            print(port)
+    try:
+        targets = args.targets + (read_host_file(args.hosts_file) if args.hosts_file else [])
+        ports = parse_ports(args.ports) if args.ports else list(range(args.start, args.end + 1))
+        hosts = expand_targets(targets)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    first = next(hosts, None)
+    if first is None:
+        parser.error("no targets to scan")
+    hosts = itertools.chain([first], hosts)
+
+    described = args.ports or f"{args.start} to {args.end}"
+    print(f"Scanning {', '.join(targets)} on ports {described}...")
+    scanner = Scanner(
+        args.timeout,
+        args.concurrency,
+        args.per_host,
+        args.rate,
+        adaptive=args.adaptive,
+        retries=args.retries,
+        keep_open=args.banners,
+        keep_timings=args.stats,
+    )
+    if scanner.max_sockets < args.concurrency:
+        print(f"Note: limiting concurrency to {scanner.max_sockets} (open file limit).")
+    grabber = BannerGrabber(args.banner_timeout, workers=args.banner_workers) if args.banners else None
+    checkpoint = ScanCheckpoint(args.checkpoint, ports, args.block_size) if args.checkpoint else None
+    if checkpoint is not None and checkpoint.resumed:
+        blocks = sum(len(done) for done in checkpoint.completed.values())
+        print(f"Resuming from '{args.checkpoint}': {blocks} port block(s) already scanned.")
+    writer = None
+    if args.output:
+        append = bool(checkpoint and checkpoint.resumed)
+        writer = ResultWriter(args.output, args.format, append=append, services=args.banners)
+    try:
+        found = asyncio.run(_print_results(scanner, hosts, ports, writer, checkpoint, grabber))
+    except KeyboardInterrupt:
+        print("Interrupted." + (f" Resume with --checkpoint {args.checkpoint}." if checkpoint else ""))
+        return
+    finally:
+        if writer is not None:
+            writer.close()
+    if checkpoint is not None and not scanner.unresolved:
+        os.remove(checkpoint.path)
+    for host in scanner.unresolved:
+        print(f"Error: could not resolve '{host}'.")
+    if args.stats:
+        for host, timing in scanner.timings.items():
+            srtt = "-" if timing.srtt is None else f"{timing.srtt * 1000:.1f} ms"
+            print(
+                f"{host}: srtt {srtt}, rttvar {timing.rttvar * 1000:.1f} ms, timeout {timing.timeout * 1000:.0f} ms, "
+                f"{timing.probes} probes, {timing.retries} retries, {timing.timeouts} unanswered"
+            )
+    if found:
+        print(f"{found} open port(s) found.")
+    elif checkpoint is not None and checkpoint.resumed:
+        print("No further open ports found.")
     else:
         print("No open ports found in the specified range.")
 
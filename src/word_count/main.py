@@ -3,31 +3,690 @@
 from __future__ import annotations
 
 import argparse
+import heapq
+import io
+import json
+import math
+import os
 import re
-from collections import Counter
+import sqlite3
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, TextIO
 from typing import Counter as CounterType
 
+DEFAULT_CHUNK_SIZE = 1 << 20
+"""Characters (bytes for :class:`TokenPipeline`) read per chunk."""
+
+DEFAULT_SHARD_SIZE = 64 << 20
+"""Target size in bytes of the shards counted by :func:`count_files_parallel`."""
+
+DEFAULT_CAPACITY = 10_000
+"""Words tracked by :class:`SpaceSaving` unless told otherwise."""
+
+WORD_RE = re.compile(r"\b\w+\b")
+ASCII_WORD_RE = re.compile(rb"\b\w+\b")
+
+# Chunks are split after the last of these characters.  A whitespace
+# character is never part of a word and never changes how its neighbours
+# are lowercased, so counting the pieces separately gives the same result
+# as counting the whole text.
+_SPLIT_CHARS = (" ", "\n", "\t", "\r", "\f", "\v")
+_SPLIT_BYTES = frozenset(char.encode("ascii")[0] for char in _SPLIT_CHARS)
+
 
 def count_words(text: str) -> CounterType[str]:
     """Return a frequency mapping of words in ``text``."""
-    words = re.findall(r"\b\w+\b", text.lower())
+    words = WORD_RE.findall(text.lower())
     return Counter(words)
 
 
+def _split_point(chunk: str) -> int:
+    """Return the index just past the last whitespace in ``chunk`` (0 if none)."""
+    return max(chunk.rfind(char) for char in _SPLIT_CHARS) + 1
+
+
+def _stream_words(stream: TextIO, chunk_size: int) -> Iterator[list[str]]:
+    """Yield the lowercased words of ``stream`` one chunk at a time.
+
+    The trailing partial word of each chunk is carried over to the next one,
+    so the concatenated lists equal ``WORD_RE.findall(stream.read().lower())``.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    carry = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        split = _split_point(chunk)
+        if split:
+            yield WORD_RE.findall((carry + chunk[:split]).lower())
+            carry = chunk[split:]
+        else:
+            carry += chunk
+    if carry:
+        yield WORD_RE.findall(carry.lower())
+
+
+def count_words_stream(
+    stream: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    counts: CounterType[str] | None = None,
+) -> CounterType[str]:
+    """Count the words read from ``stream`` in chunks of ``chunk_size`` characters.
+
+    The result equals ``count_words(stream.read())`` while memory stays
+    bounded by the chunk size plus the vocabulary (and the longest run of
+    text without whitespace).  Counts are added to ``counts`` when given.
+    """
+    counts = Counter() if counts is None else counts
+    for words in _stream_words(stream, chunk_size):
+        counts.update(words)
+    return counts
+
+
+def count_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> CounterType[str]:
+    """Count the words of the UTF-8 file at ``path`` without loading it whole."""
+    with open(path, "r", encoding="utf-8") as fh:
+        return count_words_stream(fh, chunk_size)
+
+
+def tokenize_regex(text: str) -> list[str]:
+    """Tokenize like :func:`count_words`: one ``findall`` over the lowercased text."""
+    return WORD_RE.findall(text.lower())
+
+
+def tokenize_finditer(text: str) -> Iterator[str]:
+    """Yield the words of ``text`` lazily, without building a list."""
+    return (match.group() for match in WORD_RE.finditer(text.lower()))
+
+
+def tokenize_ascii(data: bytes) -> list[bytes]:
+    """Tokenize ASCII ``data`` without decoding it.
+
+    On ASCII input ``bytes.lower`` and the bytes ``\\w`` class agree with their
+    ``str`` counterparts, so the tokens are the same as :func:`tokenize_regex`
+    would return, only as ``bytes``.
+    """
+    return ASCII_WORD_RE.findall(data.lower())
+
+
+TOKENIZERS: dict[str, Callable[[str], Iterable[str]]] = {
+    "regex": tokenize_regex,
+    "finditer": tokenize_finditer,
+}
+"""Text tokenizers by name; ``"ascii"`` is handled by :class:`TokenPipeline`."""
+
+
+def _byte_pieces(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Yield ``stream`` in chunks of about ``chunk_size`` bytes that end on whitespace."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    carry = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        split = max(chunk.rfind(byte) for byte in _SPLIT_BYTES) + 1
+        if split:
+            yield carry + chunk[:split]
+            carry = chunk[split:]
+        else:
+            carry += chunk
+    if carry:
+        yield carry
+
+
+@dataclass
+class TokenPipeline:
+    """Tokenizer plus filters applied in a single pass over a binary stream.
+
+    ``tokenizer`` is ``"regex"``, ``"finditer"`` or ``"ascii"``; the latter
+    counts pure-ASCII chunks as ``bytes`` and only decodes the vocabulary,
+    falling back to ``"regex"`` for chunks with other characters.  Words in
+    ``stop_words`` or shorter than ``min_length`` are dropped before
+    ``ngram``-word sequences (joined by a space) are formed.  The defaults
+    reproduce :func:`count_words`.
+    """
+
+    tokenizer: str = "regex"
+    stop_words: frozenset[str] = frozenset()
+    min_length: int = 1
+    ngram: int = 1
+
+    def __post_init__(self) -> None:
+        if self.tokenizer != "ascii" and self.tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{self.tokenizer}'")
+        if self.min_length < 1 or self.ngram < 1:
+            raise ValueError("min_length and ngram must be positive")
+        self.stop_words = frozenset(word.lower() for word in self.stop_words)
+        self._stop_bytes = frozenset(word.encode("ascii") for word in self.stop_words if word.isascii())
+
+    def _tokens(self, piece: bytes, window: deque) -> tuple[Iterable[str | bytes], bool]:
+        """Return the filtered tokens of ``piece`` and whether they are ``bytes``."""
+        if self.tokenizer == "ascii" and piece.isascii():
+            tokens: Iterable = tokenize_ascii(piece)
+            stop_words, as_bytes = self._stop_bytes, True
+        else:
+            tokens = TOKENIZERS.get(self.tokenizer, tokenize_regex)(piece.decode("utf-8"))
+            stop_words, as_bytes = self.stop_words, False
+        if stop_words or self.min_length > 1:
+            min_length = self.min_length
+            tokens = (token for token in tokens if len(token) >= min_length and token not in stop_words)
+        if self.ngram > 1:
+            tokens = self._ngrams(tokens, window, b" " if as_bytes else " ")
+        return tokens, as_bytes
+
+    @staticmethod
+    def _ngrams(tokens: Iterable, window: deque, separator: str | bytes) -> Iterator:
+        """Yield n-grams of ``tokens``, continuing from the words left in ``window``."""
+        if window and type(window[0]) is not type(separator):
+            convert = bytes.decode if isinstance(separator, str) else str.encode
+            converted = [convert(token) for token in window]
+            window.clear()
+            window.extend(converted)
+        for token in tokens:
+            window.append(token)
+            if len(window) == window.maxlen:
+                yield separator.join(window)
+
+    def _window(self) -> deque:
+        return deque(maxlen=self.ngram)
+
+    def batches(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[CounterType[str]]:
+        """Yield one ``Counter`` of tokens per chunk of ``stream``."""
+        window = self._window()
+        for piece in _byte_pieces(stream, chunk_size):
+            tokens, as_bytes = self._tokens(piece, window)
+            batch = Counter(tokens)
+            if as_bytes:
+                batch = Counter({token.decode("utf-8"): count for token, count in batch.items()})
+            yield batch
+
+    def count(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        counts: CounterType[str] | None = None,
+    ) -> CounterType[str]:
+        """Count the tokens of ``stream``, adding them to ``counts`` when given."""
+        counts = Counter() if counts is None else counts
+        counts_bytes: CounterType[bytes] = Counter()
+        window = self._window()
+        for piece in _byte_pieces(stream, chunk_size):
+            tokens, as_bytes = self._tokens(piece, window)
+            (counts_bytes if as_bytes else counts).update(tokens)
+        for token, count in counts_bytes.items():
+            counts[token.decode("utf-8")] += count
+        return counts
+
+
+class _ByteRange(io.RawIOBase):
+    """Raw reader limited to ``length`` bytes from the current position of ``fh``."""
+
+    def __init__(self, fh: BinaryIO, length: int) -> None:
+        super().__init__()
+        self._fh = fh
+        self._remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        read = self._fh.readinto(memoryview(buffer)[:size])
+        self._remaining -= read
+        return read
+
+
+def _next_split(fh: BinaryIO, position: int, size: int, block: int = 1 << 16) -> int:
+    """Return the offset just past the first whitespace byte at or after ``position``."""
+    fh.seek(position)
+    while position < size:
+        data = fh.read(block)
+        for index, byte in enumerate(data):
+            if byte in _SPLIT_BYTES:
+                return position + index + 1
+        position += len(data)
+    return size
+
+
+def split_into_shards(path: str, shard_size: int = DEFAULT_SHARD_SIZE) -> list[tuple[int, int]]:
+    """Split the file at ``path`` into byte ranges ``(start, end)`` of about ``shard_size`` bytes.
+
+    Every range ends just after an ASCII whitespace byte (or at the end of
+    the file), which in UTF-8 is always a character and word boundary, so
+    the shards can be counted independently.
+    """
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    shards: list[tuple[int, int]] = []
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        start = 0
+        while start < size:
+            end = _next_split(fh, min(start + shard_size, size) - 1, size)
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def _count_shard(
+    path: str, start: int, end: int, chunk_size: int, pipeline: TokenPipeline | None = None
+) -> CounterType[str]:
+    """Process pool entry point: count the words in bytes ``[start, end)`` of ``path``."""
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        reader = io.BufferedReader(_ByteRange(fh, end - start))
+        if pipeline is not None:
+            return pipeline.count(reader, chunk_size)
+        with io.TextIOWrapper(reader, encoding="utf-8") as text:
+            return count_words_stream(text, chunk_size)
+
+
+def merge_counts(parts: Iterable[CounterType[str]]) -> CounterType[str]:
+    """Merge partial counts pairwise, in rounds, until one ``Counter`` is left.
+
+    The tree shape keeps each merge between counters of similar size instead
+    of repeatedly folding small counters into one ever-growing total.
+    """
+    level = list(parts)
+    if not level:
+        return Counter()
+    while len(level) > 1:
+        merged = []
+        for index in range(0, len(level) - 1, 2):
+            left, right = level[index], level[index + 1]
+            if len(left) < len(right):
+                left, right = right, left
+            left.update(right)
+            merged.append(left)
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
+
+
+def count_files_parallel(
+    paths: Iterable[str],
+    processes: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: TokenPipeline | None = None,
+) -> CounterType[str]:
+    """Count the words of all ``paths`` in a pool of ``processes`` workers.
+
+    Each file is split with :func:`split_into_shards`, the shards are
+    counted in parallel and the partial counts are combined with
+    :func:`merge_counts`.  The result is identical to counting every file
+    serially with :func:`count_file` (or ``pipeline.count``).  A pipeline
+    counting n-grams keeps each file whole, since n-grams cross shards.
+    """
+    whole_files = pipeline is not None and pipeline.ngram > 1
+    tasks = [
+        (path, start, end, chunk_size, pipeline)
+        for path in paths
+        for start, end in ([(0, os.path.getsize(path))] if whole_files else split_into_shards(path, shard_size))
+    ]
+    if processes == 1 or len(tasks) <= 1:
+        parts = [_count_shard(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(executor.map(_count_shard, *zip(*tasks)))
+    return merge_counts(parts)
+
+
+class HeavyHitter(NamedTuple):
+    """A word reported by :class:`SpaceSaving`.
+
+    The true frequency lies between ``count - error`` and ``count``.
+    """
+
+    word: str
+    count: int
+    error: int
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitters sketch tracking at most ``capacity`` words.
+
+    Counts are fed in batches (one ``Counter`` per chunk).  Words already
+    tracked are counted exactly; a new word starts at the current floor (the
+    largest count evicted so far) plus its batch count, with the floor as its
+    error.  When more than ``capacity`` words are tracked the smallest are
+    evicted.  Every reported count overestimates the true one by at most its
+    error, and every error is at most ``total / capacity``.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self.floor = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    @classmethod
+    def for_error(cls, max_error: float) -> "SpaceSaving":
+        """Return a sketch whose errors stay below ``max_error`` times the total."""
+        if not 0 < max_error < 1:
+            raise ValueError("max_error must be between 0 and 1")
+        return cls(math.ceil(1 / max_error))
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def update(self, batch: CounterType[str]) -> None:
+        """Add the word frequencies in ``batch``."""
+        counts, errors, floor = self._counts, self._errors, self.floor
+        for word, weight in batch.items():
+            if word in counts:
+                counts[word] += weight
+            else:
+                counts[word] = floor + weight
+                errors[word] = floor
+        self.total += sum(batch.values())
+        if len(counts) > self.capacity:
+            self._evict()
+
+    def _evict(self) -> None:
+        # The (capacity + 1)-th largest count becomes the new floor: words
+        # above it are kept, words at it fill the remaining slots.
+        cut = sorted(self._counts.values(), reverse=True)[self.capacity]
+        kept = {word: count for word, count in self._counts.items() if count > cut}
+        for word, count in self._counts.items():
+            if len(kept) == self.capacity:
+                break
+            if count == cut:
+                kept[word] = count
+        self.floor = cut
+        self._errors = {word: self._errors[word] for word in kept}
+        self._counts = kept
+
+    def top(self, n: int) -> list[HeavyHitter]:
+        """Return the ``n`` words with the highest estimated counts."""
+        best = heapq.nlargest(n, self._counts.items(), key=lambda item: item[1])
+        return [HeavyHitter(word, count, self._errors[word]) for word, count in best]
+
+
+def top_words_approximate(
+    stream: TextIO,
+    n: int,
+    capacity: int = DEFAULT_CAPACITY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[HeavyHitter]:
+    """Return the approximate ``n`` most common words of ``stream``.
+
+    Memory is bounded by ``capacity`` tracked words plus one chunk, however
+    large the vocabulary is; see :class:`SpaceSaving` for the error bounds.
+    """
+    sketch = SpaceSaving(capacity)
+    for words in _stream_words(stream, chunk_size):
+        sketch.update(Counter(words))
+    return sketch.top(n)
+
+
+class IndexUpdate(NamedTuple):
+    """Files counted, skipped as unchanged and dropped by :meth:`WordIndex.update`."""
+
+    counted: int
+    skipped: int
+    removed: int
+
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_words (
+    file_id INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (file_id, word)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS totals (word TEXT PRIMARY KEY, count INTEGER NOT NULL) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS totals_by_count ON totals (count DESC, word);
+"""
+
+
+def _collect_files(paths: Iterable[str], pattern: str) -> list[str]:
+    """Expand directories in ``paths`` to the files matching ``pattern`` below them.
+
+    Each file is listed once, at its first position, even if it is named
+    directly and also found inside a directory.
+    """
+    files: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(str(match) for match in sorted(Path(path).rglob(pattern)) if match.is_file())
+        else:
+            files.append(path)
+    return list(dict.fromkeys(os.path.abspath(path) for path in files))
+
+
+class WordIndex:
+    """Word frequencies of a set of files, kept in a SQLite database at ``path``.
+
+    Counts are stored per file together with its mtime and size, plus a
+    running total per word, so :meth:`update` only re-counts files that
+    changed and :meth:`top` and :meth:`frequency` are single indexed
+    queries.  Changing the ``pipeline`` settings rebuilds the index.
+    """
+
+    def __init__(self, path: str, pipeline: TokenPipeline | None = None) -> None:
+        self.pipeline = pipeline if pipeline is not None else TokenPipeline()
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_INDEX_SCHEMA)
+        settings = json.dumps(
+            {
+                "tokenizer": self.pipeline.tokenizer,
+                "stop_words": sorted(self.pipeline.stop_words),
+                "min_length": self.pipeline.min_length,
+                "ngram": self.pipeline.ngram,
+            },
+            sort_keys=True,
+        )
+        with self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'pipeline'").fetchone()
+            if row is not None and row[0] != settings:
+                self._conn.executescript("DELETE FROM file_words; DELETE FROM totals; DELETE FROM files;")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('pipeline', ?)", (settings,))
+
+    def __enter__(self) -> "WordIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _forget(self, file_id: int, delta: CounterType[str]) -> None:
+        """Drop the counts of ``file_id``, subtracting them from ``delta``."""
+        delta.subtract(
+            dict(self._conn.execute("SELECT word, count FROM file_words WHERE file_id = ?", (file_id,)))
+        )
+        self._conn.execute("DELETE FROM file_words WHERE file_id = ?", (file_id,))
+
+    def update(
+        self,
+        paths: Iterable[str],
+        pattern: str = "*.txt",
+        processes: int | None = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> IndexUpdate:
+        """Bring the index up to date with ``paths`` (files or directories).
+
+        Files whose mtime and size match the index are skipped; the others
+        are counted (in ``processes`` workers when it is not 1).  Indexed
+        files that no longer exist are removed.
+        """
+        known = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in self._conn.execute("SELECT id, path, mtime_ns, size FROM files")
+        }
+        changed: list[tuple[str, os.stat_result]] = []
+        skipped = 0
+        for path in _collect_files(paths, pattern):
+            stat = os.stat(path)
+            entry = known.get(path)
+            if entry is not None and entry[1:] == (stat.st_mtime_ns, stat.st_size):
+                skipped += 1
+            else:
+                changed.append((path, stat))
+
+        tasks = [(path, 0, stat.st_size, chunk_size, self.pipeline) for path, stat in changed]
+        removed = [entry[0] for path, entry in known.items() if not os.path.exists(path)]
+        # Everything happens in one transaction, and the totals (with their
+        # count index) are touched once per word rather than once per file.
+        delta: CounterType[str] = Counter()
+        with self._conn:
+            if processes == 1 or len(tasks) <= 1:
+                self._store(changed, map(_count_shard, *zip(*tasks)) if tasks else (), known, delta)
+            else:
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    self._store(changed, executor.map(_count_shard, *zip(*tasks)), known, delta)
+            for file_id in removed:
+                self._forget(file_id, delta)
+                self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+            self._conn.executemany(
+                "INSERT INTO totals (word, count) VALUES (?, ?) "
+                "ON CONFLICT (word) DO UPDATE SET count = count + excluded.count",
+                ((word, count) for word, count in delta.items() if count),
+            )
+            self._conn.execute("DELETE FROM totals WHERE count <= 0")
+        return IndexUpdate(len(changed), skipped, len(removed))
+
+    def _store(self, changed, counted: Iterable[CounterType[str]], known, delta: CounterType[str]) -> None:
+        for (path, stat), counts in zip(changed, counted):
+            entry = known.get(path)
+            if entry is not None:
+                self._forget(entry[0], delta)
+            self._conn.execute(
+                "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size",
+                (path, stat.st_mtime_ns, stat.st_size),
+            )
+            file_id = self._conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO file_words (file_id, word, count) VALUES (?, ?, ?)",
+                ((file_id, word, count) for word, count in counts.items()),
+            )
+            delta.update(counts)
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """Return the ``n`` most frequent words across all indexed files."""
+        return self._conn.execute(
+            "SELECT word, count FROM totals ORDER BY count DESC, word LIMIT ?", (n,)
+        ).fetchall()
+
+    def frequency(self, word: str) -> int:
+        """Return how many times ``word`` (lowercased) occurs in the indexed files."""
+        row = self._conn.execute("SELECT count FROM totals WHERE word = ?", (word.lower(),)).fetchone()
+        return row[0] if row else 0
+
+
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Count word frequency in a text file")
-    parser.add_argument("file", help="Path to the text file")
+    parser = argparse.ArgumentParser(description="Count word frequency in text files")
+    parser.add_argument("files", nargs="*", help="Paths to the text files (or directories with --index)")
     parser.add_argument("--top", type=int, default=10, help="Show top N words")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Bytes read at a time (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        choices=["regex", "finditer", "ascii"],
+        default="regex",
+        help="Tokenizer to use (default: regex)",
+    )
+    parser.add_argument("--stop-words", help="File with words to ignore, separated by whitespace")
+    parser.add_argument("--min-length", type=int, default=1, help="Ignore words shorter than this")
+    parser.add_argument("--ngram", type=int, default=1, help="Count sequences of N words (default: 1)")
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Estimate the top words with a bounded-memory Space-Saving sketch",
+    )
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help=f"Words tracked in --approximate mode (default: {DEFAULT_CAPACITY})",
+    )
+    parser.add_argument(
+        "--index",
+        help="SQLite index to update with the given files and answer queries from",
+    )
+    parser.add_argument("--pattern", default="*.txt", help="Files indexed inside directories (default: *.txt)")
+    parser.add_argument("--word", help="With --index, print the frequency of this word")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes; 0 uses every core (default: 1, serial)",
+    )
     args = parser.parse_args()
+    if not args.files and not args.index:
+        parser.error("at least one file is required without --index")
+
+    for path in [*args.files, *([args.stop_words] if args.stop_words else [])]:
+        if not (os.path.isfile(path) or (args.index and os.path.isdir(path))):
+            print(f"Error: File '{path}' not found.")
+            return
+
+    stop_words: frozenset[str] = frozenset()
+    if args.stop_words:
+        with open(args.stop_words, "r", encoding="utf-8") as fh:
+            stop_words = frozenset(fh.read().split())
+    pipeline = TokenPipeline(args.tokenizer, stop_words, args.min_length, args.ngram)
 
-    try:
-        with open(args.file, "r", encoding="utf-8") as fh:
-            content = fh.read()
-    except FileNotFoundError:
-        print(f"Error: File '{args.file}' not found.")
+    if args.index:
+        with WordIndex(args.index, pipeline) as index:
+            if args.files:
+                counted, skipped, removed = index.update(
+                    args.files, args.pattern, args.processes or None, args.chunk_size
+                )
+                print(f"Indexed {counted} file(s), {skipped} unchanged, {removed} removed.")
+            if args.word:
+                print(f"{args.word}: {index.frequency(args.word)}")
+            else:
+                for word, freq in index.top(args.top):
+                    print(f"{word}: {freq}")
         return
 
-    counts = count_words(content)
+    if args.approximate:
+        sketch = SpaceSaving(args.capacity)
+        for path in args.files:
+            with open(path, "rb") as fh:
+                for batch in pipeline.batches(fh, args.chunk_size):
+                    sketch.update(batch)
+        for word, count, error in sketch.top(args.top):
+            print(f"{word}: {count} (±{error})")
+        return
+
+    if args.processes == 1:
+        counts: CounterType[str] = Counter()
+        for path in args.files:
+            with open(path, "rb") as fh:
+                pipeline.count(fh, args.chunk_size, counts)
+    else:
+        counts = count_files_parallel(
+            args.files, args.processes or None, chunk_size=args.chunk_size, pipeline=pipeline
+        )
+
     for word, freq in counts.most_common(args.top):
         print(f"{word}: {freq}")
 
@@ -0,0 +1,105 @@
+import json
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from achievements.main import (
+    AchievementStore,
+    add_achievement,
+    find_achievements,
+    list_achievements,
+    load_achievements,
+    open_store,
+    remove_achievement,
+    save_achievements,
+)
+
+
+def test_store_add_iterate_find(tmp_path):
+    path = tmp_path / "achievements.db"
+    with AchievementStore(path) as store:
+        store.add("Maratona", "Correu 42 km")
+        store.add("Leitor", "Leu 10 livros")
+        store.add("Maratona", "De novo")
+    with AchievementStore(path) as store:
+        assert list(store) == [
+            {"title": "Maratona", "description": "Correu 42 km"},
+            {"title": "Leitor", "description": "Leu 10 livros"},
+            {"title": "Maratona", "description": "De novo"},
+        ]
+        assert len(store) == 3
+        assert [ach["description"] for ach in store.find("Maratona")] == ["Correu 42 km", "De novo"]
+        assert store.find("Nada") == []
+        plan = store._conn.execute("EXPLAIN QUERY PLAN SELECT * FROM achievements WHERE title = 'x'").fetchall()
+        assert "achievements_by_title" in str(plan)
+
+
+def test_store_remove_compacts(tmp_path):
+    path = tmp_path / "achievements.db"
+    with AchievementStore(path) as store:
+        store.import_achievements([{"title": f"t{idx % 2}", "description": "x" * 500} for idx in range(2000)])
+        size = path.stat().st_size
+        assert store.remove("t0") == 1000
+        assert path.stat().st_size < size * 3 // 4
+        assert store.remove("t0") == 0
+        assert len(store) == 1000
+
+
+def test_open_store_imports_legacy_json(tmp_path, capsys):
+    save_achievements(tmp_path / "achievements.json", [{"title": "Antigo", "description": "Do JSON"}])
+    with open_store(tmp_path / "achievements.db") as store:
+        assert list(store) == [{"title": "Antigo", "description": "Do JSON"}]
+    assert "Imported 1" in capsys.readouterr().out
+    with open_store(tmp_path / "achievements.db") as store:
+        assert len(store) == 1
+
+
+def test_failed_import_leaves_no_store(tmp_path, capsys):
+    legacy = tmp_path / "achievements.json"
+    save_achievements(legacy, [{"title": "Antigo", "description": "Do JSON"}, {"title": "Sem descrição"}])
+    with pytest.raises(KeyError):
+        open_store(tmp_path / "achievements.db")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["achievements.json"]
+    save_achievements(legacy, [{"title": "Antigo", "description": "Do JSON"}])
+    with open_store(tmp_path / "achievements.db") as store:
+        assert list(store) == [{"title": "Antigo", "description": "Do JSON"}]
+    assert "Imported 1" in capsys.readouterr().out
+
+
+def test_cli_functions_on_both_backends(tmp_path, capsys):
+    for name in ("achievements.json", "achievements.db"):
+        file = tmp_path / "both" / name
+        file.parent.mkdir(exist_ok=True)
+        add_achievement(file, "Leitor", "Leu 10 livros")
+        add_achievement(file, "Maratona", "Correu 42 km")
+        remove_achievement(file, "Leitor")
+        find_achievements(file, "Maratona")
+        list_achievements(file)
+        output = capsys.readouterr().out
+        assert "Removed 1 achievement(s) named 'Leitor'." in output
+        assert output.endswith("Maratona: Correu 42 km\n1. Maratona: Correu 42 km\n")
+        (tmp_path / "both" / "achievements.json").unlink(missing_ok=True)
+
+
+def test_read_actions_do_not_create_the_store(tmp_path, capsys):
+    file = tmp_path / "achievements.db"
+    list_achievements(file)
+    find_achievements(file, "Leitor")
+    assert capsys.readouterr().out == "No achievements yet.\nNo achievement named 'Leitor'.\n"
+    save_achievements(tmp_path / "achievements.json", [{"title": "Leitor", "description": "Leu 10 livros"}])
+    list_achievements(file)
+    find_achievements(file, "Leitor")
+    assert capsys.readouterr().out == "1. Leitor: Leu 10 livros\nLeitor: Leu 10 livros\n"
+    assert not file.exists()
+
+
+def test_save_achievements_replaces_file(tmp_path):
+    file = tmp_path / "achievements.json"
+    save_achievements(file, [{"title": "a", "description": "b"}])
+    save_achievements(file, [])
+    assert json.loads(file.read_text(encoding="utf-8")) == []
+    assert load_achievements(file) == []
+    assert [path.name for path in tmp_path.iterdir()] == ["achievements.json"]
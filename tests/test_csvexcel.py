@@ -0,0 +1,229 @@
+import pathlib
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from csvexcel.main import (
+    ColumnWidthEstimator,
+    SheetPartitioner,
+    apply_excel_formatting,
+    convert_csv_files,
+    generate_excel_from_csv,
+    infer_csv_schema,
+    load_csv_schema,
+    read_spilled_frames,
+    schema_path,
+)
+
+
+CSV_CONTENT = "Filial,Produto,Qtd\nSP,Caneta,3\nRJ,Lapis,5\nSP,Borracha,1\nMG,Caderno,2\nRJ,Caneta,4\n"
+
+
+def _sheet_values(path):
+    workbook = openpyxl.load_workbook(path)
+    return {
+        name: [list(row) for row in workbook[name].iter_rows(values_only=True)]
+        for name in workbook.sheetnames
+    }
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding="utf-8")
+    return path
+
+
+def test_streaming_matches_default_mode(csv_file, tmp_path):
+    default_out = tmp_path / "default.xlsx"
+    streaming_out = tmp_path / "streaming.xlsx"
+    assert generate_excel_from_csv(str(csv_file), str(default_out))
+    assert generate_excel_from_csv(str(csv_file), str(streaming_out), streaming=True, chunksize=2)
+    assert _sheet_values(streaming_out) == _sheet_values(default_out)
+
+
+def test_streaming_split_keeps_sheet_order(csv_file, tmp_path):
+    default_out = tmp_path / "default.xlsx"
+    streaming_out = tmp_path / "streaming.xlsx"
+    assert generate_excel_from_csv(str(csv_file), str(default_out), split_column_name="Filial")
+    assert generate_excel_from_csv(
+        str(csv_file), str(streaming_out), split_column_name="Filial", streaming=True, chunksize=2
+    )
+    streamed = _sheet_values(streaming_out)
+    assert list(streamed) == ["SP", "RJ", "MG"]
+    assert streamed == _sheet_values(default_out)
+
+
+def test_streaming_formats_header(csv_file, tmp_path):
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(str(csv_file), str(out), streaming=True)
+    worksheet = openpyxl.load_workbook(out)["Dados"]
+    assert worksheet["A1"].font.bold
+    assert worksheet.column_dimensions["B"].width == len("Borracha") + 2
+
+
+def test_streaming_header_only_csv(tmp_path):
+    path = tmp_path / "vazio.csv"
+    path.write_text("a,b\n", encoding="utf-8")
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(str(path), str(out), streaming=True)
+    assert _sheet_values(out) == {"Dados": [["a", "b"]]}
+
+
+def test_partitioner_spills_and_preserves_order():
+    frame = pd.DataFrame({"k": ["b", "a", "b", "c", "a"], "v": [1, 2, 3, 4, 5]})
+    with SheetPartitioner("k", max_buffered_rows=2) as partitioner:
+        partitioner.add(frame.iloc[:3])
+        partitioner.add(frame.iloc[3:])
+        result = {
+            value: pd.concat(list(frames))["v"].tolist()
+            for value, frames in partitioner.partitions()
+        }
+    assert list(result) == ["b", "a", "c"]
+    assert result == {"b": [1, 3], "a": [2, 5], "c": [4]}
+
+
+def test_partitioner_hands_out_spill_offsets(tmp_path):
+    frame = pd.DataFrame({"k": ["b", "a", "b", "c", "a"], "v": [1, 2, 3, 4, 5]})
+    with SheetPartitioner("k", max_buffered_rows=2, spill_dir=str(tmp_path)) as partitioner:
+        partitioner.add(frame.iloc[:3])
+        partitioner.add(frame.iloc[3:])
+        spill_path, partitions = partitioner.spilled_partitions()
+        result = {
+            value: pd.concat(list(read_spilled_frames(spill_path, offsets)))["v"].tolist()
+            for value, offsets in partitions
+        }
+    assert list(result) == ["b", "a", "c"]
+    assert result == {"b": [1, 3], "a": [2, 5], "c": [4]}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_streaming_split_with_spill_matches_default(csv_file, tmp_path):
+    default_out = tmp_path / "default.xlsx"
+    streaming_out = tmp_path / "streaming.xlsx"
+    assert generate_excel_from_csv(str(csv_file), str(default_out), split_column_name="Filial")
+    assert generate_excel_from_csv(
+        str(csv_file), str(streaming_out), split_column_name="Filial",
+        streaming=True, chunksize=2, max_buffered_rows=1,
+    )
+    assert _sheet_values(streaming_out) == _sheet_values(default_out)
+
+
+def test_width_estimator_matches_cell_scan(csv_file, tmp_path):
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(str(csv_file), str(out))
+    worksheet = openpyxl.load_workbook(out)["Dados"]
+    estimated = [worksheet.column_dimensions[letter].width for letter in "ABC"]
+    apply_excel_formatting(worksheet)
+    scanned = [worksheet.column_dimensions[letter].width for letter in "ABC"]
+    assert estimated == scanned
+
+
+def test_width_estimator_sample_and_quantile():
+    frame = pd.DataFrame({"nome": ["ab", "abcd", "x" * 40, "abc"]})
+    sampled = ColumnWidthEstimator(frame.columns, sample_rows=2)
+    sampled.update(frame)
+    assert sampled.complete
+    assert sampled.widths() == [len("abcd") + 2]
+
+    quantile = ColumnWidthEstimator(frame.columns, quantile=0.5)
+    quantile.update(frame)
+    assert quantile.widths() == [len("abcd") + 2]
+
+
+def test_streaming_split_widths_cover_whole_partition(csv_file, tmp_path):
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(
+        str(csv_file), str(out), split_column_name="Filial", streaming=True, chunksize=1
+    )
+    worksheet = openpyxl.load_workbook(out)["SP"]
+    assert worksheet.column_dimensions["B"].width == len("Borracha") + 2
+
+
+def test_parallel_split_matches_serial(csv_file, tmp_path):
+    serial_out = tmp_path / "serial.xlsx"
+    parallel_out = tmp_path / "parallel.xlsx"
+    assert generate_excel_from_csv(str(csv_file), str(serial_out), split_column_name="Filial")
+    assert generate_excel_from_csv(
+        str(csv_file), str(parallel_out), split_column_name="Filial", chunksize=2, workers=2
+    )
+    assert _sheet_values(parallel_out) == _sheet_values(serial_out)
+    worksheet = openpyxl.load_workbook(parallel_out)["SP"]
+    assert worksheet["A1"].font.bold
+    assert worksheet.column_dimensions["B"].width == len("Borracha") + 2
+
+
+def test_convert_csv_files_reports_each_file(csv_file, tmp_path):
+    broken = tmp_path / "quebrado.csv"
+    broken.write_text("", encoding="utf-8")
+    output_dir = tmp_path / "saida"
+    results = convert_csv_files([str(tmp_path)], output_dir=str(output_dir), processes=2)
+    assert [pathlib.Path(r.csv_path).name for r in results] == ["quebrado.csv", "vendas.csv"]
+    failed, converted = results
+    assert not failed.success and "vazio" in failed.messages
+    assert converted.success and converted.seconds >= 0
+    assert (output_dir / "vendas_formatado.xlsx").exists()
+
+
+def test_infer_csv_schema_keeps_ids_exact(tmp_path):
+    path = tmp_path / "ids.csv"
+    path.write_text("id,codigo,valor,filial\n1,007,1.5,SP\n,010,2,RJ\n3,011,,SP\n", encoding="utf-8")
+    assert infer_csv_schema(str(path), categorical_columns=["filial"]) == {
+        "id": "Int64", "codigo": "str", "valor": "float64", "filial": "category",
+    }
+
+
+def test_schema_is_cached_and_used(tmp_path):
+    path = tmp_path / "ids.csv"
+    path.write_text("id,codigo,filial\n1,007,SP\n,010,RJ\n3,011,SP\n", encoding="utf-8")
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(str(path), str(out), split_column_name="filial", schema=True)
+    assert pathlib.Path(schema_path(str(path))).exists()
+    assert load_csv_schema(str(path), categorical_columns=["filial"])["filial"] == "category"
+    values = _sheet_values(out)
+    assert values["SP"] == [["id", "codigo", "filial"], [1, "007", "SP"], [3, "011", "SP"]]
+    assert values["RJ"] == [["id", "codigo", "filial"], [None, "010", "RJ"]]
+
+
+def test_stale_schema_falls_back_to_default_inference(tmp_path, capsys):
+    path = tmp_path / "dados.csv"
+    path.write_text("id,nome\n1,a\n2,b\n", encoding="utf-8")
+    load_csv_schema(str(path))
+    path.write_text("id,nome\n1,a\nx,b\n", encoding="utf-8")
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(str(path), str(out), schema=True, streaming=True)
+    assert "esquema" in capsys.readouterr().out
+    assert _sheet_values(out)["Dados"][2] == ["x", "b"]
+
+
+def test_convert_csv_files_rejects_colliding_outputs(tmp_path):
+    for folder in ("a", "b"):
+        (tmp_path / "d" / folder).mkdir(parents=True)
+        (tmp_path / "d" / folder / "x.csv").write_text(CSV_CONTENT, encoding="utf-8")
+    output_dir = tmp_path / "out"
+    results = convert_csv_files(
+        [str(tmp_path / "d" / "**" / "*.csv")], output_dir=str(output_dir), processes=2
+    )
+    first, second = results
+    assert first.success and pathlib.Path(first.csv_path).parent.name == "a"
+    assert not second.success and "já é gerada" in second.messages
+    assert _sheet_values(output_dir / "x_formatado.xlsx")["Dados"][1] == ["SP", "Caneta", 3]
+
+
+@pytest.mark.parametrize("late_value, widened", [("", "Int64"), ("2.5", "float64")])
+def test_schema_mismatch_widens_cached_column(tmp_path, capsys, late_value, widened):
+    path = tmp_path / "dados.csv"
+    path.write_text("id,nome\n1,a\n2,b\n" + f"{late_value},c\n", encoding="utf-8")
+    assert load_csv_schema(str(path), sample_rows=2)["id"] == "int64"
+    out = tmp_path / "out.xlsx"
+    assert generate_excel_from_csv(str(path), str(out), schema=True, streaming=True)
+    assert "Ampliando" in capsys.readouterr().out
+    assert load_csv_schema(str(path))["id"] == widened
+    assert generate_excel_from_csv(str(path), str(out), schema=True)
+    assert "Aviso" not in capsys.readouterr().out
+    assert _sheet_values(out)["Dados"][3] == [None if late_value == "" else 2.5, "c"]
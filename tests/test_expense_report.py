@@ -0,0 +1,241 @@
+import json
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from expense_report.main import (
+    agregar_colunar,
+    agregar_csv,
+    agregar_grupos,
+    calcular_rollup,
+    agregar_arquivos,
+    agregar_incremental,
+    caminho_checkpoint,
+    converter_centavos,
+    dividir_em_fatias,
+    gerar_agregacoes,
+    gerar_relatorio,
+    parse_args,
+)
+
+
+LINHAS = [
+    "Data,Categoria,Valor\n",
+    "2024-01-01,Transporte,\"10,50\"\n",
+    "2024-01-02,Alimentação,25.00\n",
+    "2024-01-03,Transporte,abc\n",
+    "2024-01-04,Moradia,1200\n",
+]
+
+
+@pytest.fixture
+def razao(tmp_path):
+    caminho = tmp_path / "despesas.csv"
+    caminho.write_text("".join(LINHAS), encoding="utf-8")
+    return caminho
+
+
+def _saida(capsys, caminho, **kwargs):
+    assert gerar_relatorio(caminho if isinstance(caminho, list) else str(caminho), **kwargs)
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("motor", ["csv", "colunar"])
+def test_gerar_relatorio_imprime_totais(razao, capsys, motor):
+    if motor == "colunar":
+        pytest.importorskip("pandas")
+    assert _saida(capsys, razao, motor=motor) == (
+        "--- Resumo de Despesas ---\n"
+        "Moradia: 1200.00\n"
+        "Alimentação: 25.00\n"
+        "Transporte: 10.50\n"
+        "Total: 1235.50\n"
+    )
+
+
+def test_incremental_igual_ao_completo(razao, capsys):
+    completo = _saida(capsys, razao)
+    assert _saida(capsys, razao, incremental=True) == completo
+    assert pathlib.Path(caminho_checkpoint(str(razao))).exists()
+
+
+def test_incremental_processa_apenas_linhas_novas(razao, capsys):
+    agregar_incremental(str(razao))
+    with razao.open("a", encoding="utf-8") as fh:
+        fh.write("2024-01-05,Alimentação,5\n2024-01-06,Lazer,7")
+    totais, total = agregar_incremental(str(razao))
+    assert totais["Alimentação"] == 30.0
+    assert "Lazer" not in totais  # linha incompleta fica para a próxima execução
+    with razao.open("a", encoding="utf-8") as fh:
+        fh.write("\n")
+    totais, total = agregar_incremental(str(razao))
+    assert totais["Lazer"] == 7.0
+    assert total == 1242.5 + 5
+
+
+def test_incremental_reprocessa_arquivo_reescrito(razao, capsys):
+    agregar_incremental(str(razao))
+    razao.write_text("".join(LINHAS[:3]).replace("25.00", "30.00"), encoding="utf-8")
+    totais, total = agregar_incremental(str(razao))
+    assert "reprocessando" in capsys.readouterr().out
+    assert dict(totais) == {"Transporte": 10.5, "Alimentação": 30.0}
+    assert total == 40.5
+
+
+def test_motor_colunar_identico_ao_csv(tmp_path):
+    pytest.importorskip("pandas")
+    caminho = tmp_path / "razao.csv"
+    valores = ["0,1", "0.2", "1e3", "", "1_000", " 7 ", "abc", "3,333", ".5", "-2"]
+    categorias = ["A", "B", "", "C"]
+    linhas = ["Categoria,Valor"]
+    for idx in range(500):
+        linhas.append(f'{categorias[idx % 4]},"{valores[idx % len(valores)]}"')
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    esperado = agregar_csv(str(caminho))
+    obtido = agregar_colunar(str(caminho), tamanho_bloco=37)
+    assert list(obtido[0].items()) == list(esperado[0].items())
+    assert obtido[1] == esperado[1]
+
+
+def test_dividir_em_fatias_alinha_em_linhas(razao):
+    dados = razao.read_bytes()
+    fatias = dividir_em_fatias(str(razao), tamanho_fatia=10)
+    assert fatias[0][0] == len(LINHAS[0].encode("utf-8"))
+    assert fatias[-1][1] == len(dados)
+    for inicio, fim in fatias:
+        assert dados[inicio - 1:inicio] == b"\n"
+        assert dados[fim - 1:fim] == b"\n"
+
+
+@pytest.mark.parametrize("motor", ["csv", "colunar"])
+def test_agregar_arquivos_mescla_fatias_e_arquivos(razao, tmp_path, motor):
+    if motor == "colunar":
+        pytest.importorskip("pandas")
+    outro = tmp_path / "outro.csv"
+    outro.write_text("Categoria,Valor\nLazer,7\nMoradia,\"0,5\"\n", encoding="utf-8")
+    totais, total, por_arquivo = agregar_arquivos(
+        [str(tmp_path / "*.csv")], motor=motor, processos=2, tamanho_fatia=16
+    )
+    assert dict(totais) == {"Transporte": 10.5, "Alimentação": 25.0, "Moradia": 1200.5, "Lazer": 7.0}
+    assert total == 1243.0
+    assert list(por_arquivo) == [str(razao), str(outro)]
+    assert por_arquivo[str(outro)][1] == 7.5
+
+
+def test_gerar_relatorio_por_arquivo(razao, capsys):
+    saida = _saida(capsys, [str(razao)], por_arquivo=True, processos=1, motor="csv")
+    assert f"--- Resumo de Despesas ({razao}) ---" in saida
+    assert saida.endswith("Total: 1235.50\n")
+
+
+RAZAO_CENTROS = (
+    "Data,Categoria,Centro,Valor\n"
+    "2024-01-05,Viagem,TI,100\n"
+    "15/01/2024,Viagem,TI,\"50,5\"\n"
+    "2024-02-01,Viagem,RH,30\n"
+    "2024-02-03,Material,TI,10\n"
+    "2024-02-04,Material,TI,x\n"
+)
+
+
+def test_agregar_grupos_multidimensional(tmp_path):
+    caminho = tmp_path / "centros.csv"
+    caminho.write_text(RAZAO_CENTROS, encoding="utf-8")
+    grupos = agregar_grupos(str(caminho), ["Categoria", "Centro"], coluna_data="Data", periodo="mes")
+    assert list(grupos) == [("Viagem", "TI", "2024-01"), ("Viagem", "RH", "2024-02"), ("Material", "TI", "2024-02")]
+    viagem_ti = grupos[("Viagem", "TI", "2024-01")]
+    assert viagem_ti.como_dict() == {"quantidade": 2, "soma": 150.5, "minimo": 50.5, "maximo": 100.0, "media": 75.25}
+
+    rollup = calcular_rollup(grupos)
+    assert rollup[("Viagem", None, None)].soma == 180.5
+    assert rollup[(None, None, None)].quantidade == 4
+
+
+def test_gerar_agregacoes_em_json_e_csv(tmp_path):
+    caminho = tmp_path / "centros.csv"
+    caminho.write_text(RAZAO_CENTROS, encoding="utf-8")
+    saida_json = tmp_path / "grupos.json"
+    assert gerar_agregacoes(str(caminho), ["Centro"], rollup=True, formato="json", saida=str(saida_json))
+    linhas = json.loads(saida_json.read_text(encoding="utf-8"))
+    assert linhas[-1] == {"Centro": None, "quantidade": 4, "soma": 190.5, "minimo": 10.0, "maximo": 100.0,
+                          "media": 47.625}
+
+    saida_csv = tmp_path / "grupos.csv"
+    assert gerar_agregacoes(str(caminho), ["Categoria"], coluna_data="Data", periodo="ano", formato="csv",
+                            saida=str(saida_csv))
+    assert saida_csv.read_text(encoding="utf-8").splitlines() == [
+        "Categoria,Data (ano),quantidade,soma,minimo,maximo,media",
+        "Viagem,2024,3,180.5,30.0,100.0,60.166666666666664",
+        "Material,2024,1,10.0,10.0,10.0,10.0",
+    ]
+
+
+@pytest.mark.parametrize("colunas", [["soma"], ["Categoria", "Categoria"]])
+def test_gerar_agregacoes_rejeita_dimensoes_conflitantes(tmp_path, capsys, colunas):
+    caminho = tmp_path / "conflito.csv"
+    caminho.write_text("Categoria,soma,Valor\nViagem,x,10\n", encoding="utf-8")
+    saida = tmp_path / "grupos.json"
+    assert not gerar_agregacoes(str(caminho), colunas, formato="json", saida=str(saida))
+    assert capsys.readouterr().out.startswith("Erro: ")
+    assert not saida.exists()
+
+
+@pytest.mark.parametrize("opcao", [["--centavos"], ["--motor", "csv"], ["--processos", "2"], ["--incremental"]])
+def test_agrupamento_recusa_opcoes_do_resumo(monkeypatch, capsys, opcao):
+    monkeypatch.setattr(sys, "argv", ["expense_report", "gastos.csv", "--agrupar", "Categoria", *opcao])
+    with pytest.raises(SystemExit):
+        parse_args()
+    assert f"{opcao[0]} não se aplica(m) aos agrupamentos" in capsys.readouterr().err
+    monkeypatch.setattr(sys, "argv", ["expense_report", "gastos.csv", *opcao])
+    assert parse_args().arquivos == ["gastos.csv"]
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("1.234,56", 123456), ("1,234.56", 123456), ("10,50", 1050), ("25.00", 2500),
+    ("1.234", 123400), ("1,234,567", 123456700), ("0,125", 13), ("-1.234,565", -123457),
+    (" 1200 ", 120000), ("1.23.4", None), ("abc", None), ("", None), (None, None),
+])
+def test_converter_centavos_aceita_os_dois_estilos(texto, esperado):
+    assert converter_centavos(texto) == esperado
+
+
+@pytest.mark.parametrize("motor", ["csv", "colunar"])
+def test_centavos_soma_exata(tmp_path, capsys, motor):
+    if motor == "colunar":
+        pytest.importorskip("pandas")
+    caminho = tmp_path / "centavos.csv"
+    caminho.write_text("Categoria,Valor\n" + "A,0.10\n" * 3 + "B,\"1.234,56\"\nB,\"1,000.01\"\n", encoding="utf-8")
+    assert agregar_csv(str(caminho), centavos=True) == ({"A": 30, "B": 223457}, 223487)
+    assert agregar_arquivos([str(caminho)], motor=motor, tamanho_fatia=8, centavos=True)[:2] == (
+        {"A": 30, "B": 223457}, 223487
+    )
+    assert _saida(capsys, caminho, motor=motor, centavos=True) == (
+        "--- Resumo de Despesas ---\n"
+        "B: 2234.57\n"
+        "A: 0.30\n"
+        "Total: 2234.87\n"
+    )
+    assert _saida(capsys, caminho, incremental=True, centavos=True).endswith("Total: 2234.87\n")
+
+
+def test_centavos_em_lote_igual_a_conversao_por_valor(tmp_path, monkeypatch):
+    import expense_report.main as modulo
+
+    monkeypatch.setattr(modulo, "TAMANHO_LOTE_CENTAVOS", 4)
+    valores = ["10,50", "0.99", "1.234,56", "-3,00", "abc", "007,10", "1\n2,34", "12", "", "5.5"]
+    linhas = [f"{'AB'[indice % 2]},\"{valor}\"" for indice, valor in enumerate(valores)] + ["A"]
+    caminho = tmp_path / "lotes.csv"
+    caminho.write_text("Categoria,Valor\n" + "\n".join(linhas) + "\n", encoding="utf-8")
+    esperado = {"A": 0, "B": 0}
+    for indice, valor in enumerate(valores):
+        centavos = converter_centavos(valor)
+        if centavos is not None:
+            esperado["AB"[indice % 2]] += centavos
+    totais, total = agregar_csv(str(caminho), centavos=True)
+    assert (dict(totais), total) == (esperado, sum(esperado.values()))
+    assert agregar_incremental(str(caminho), arquivo_checkpoint=str(tmp_path / "ck.json"), centavos=True) == (
+        totais, total
+    )
@@ -0,0 +1,282 @@
+import pathlib
+import random
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from ram.main import RAM, MappedRAM, SparseRAM
+
+
+def test_read_write_and_errors():
+    ram = RAM(8)
+    ram.write(3, 0xAB)
+    assert ram.read(3) == 0xAB
+    assert ram.read(0) == 0
+    with pytest.raises(IndexError):
+        ram.read(8)
+    with pytest.raises(IndexError):
+        ram.write(-1, 1)
+    with pytest.raises(ValueError):
+        ram.write(0, 256)
+    with pytest.raises(ValueError):
+        RAM(0)
+
+
+def test_storage_is_one_byte_per_address():
+    ram = RAM(1 << 20)
+    assert isinstance(ram.memory, bytearray)
+    assert sys.getsizeof(ram.memory) < (1 << 20) + 1024
+
+
+def test_load_keeps_partial_write_semantics():
+    ram = RAM(4)
+    with pytest.raises(IndexError, match="Address 4"):
+        ram.load([1, 2, 3], start_address=2)
+    assert [ram.read(a) for a in range(4)] == [0, 0, 1, 2]
+    with pytest.raises(ValueError):
+        ram.load([5, 300])
+    assert ram.read(0) == 5
+
+
+def test_dump_yields_valid_prefix_then_raises():
+    ram = RAM(4)
+    ram.load([1, 2, 3, 4])
+    assert list(ram.dump(1, 3)) == [(1, 2), (2, 3)]
+    assert list(ram.dump(3, 1)) == []
+    assert list(ram.dump(20, 18)) == []
+    seen = []
+    with pytest.raises(IndexError, match="Address 4"):
+        for item in ram.dump(2, 6):
+            seen.append(item)
+    assert seen == [(2, 3), (3, 4)]
+    with pytest.raises(IndexError, match="Address -1"):
+        list(ram.dump(-1, 2))
+
+
+def test_view_is_zero_copy():
+    ram = RAM(16)
+    view = ram.view(4, 8)
+    ram.write(5, 7)
+    assert view[1] == 7
+    view[2] = 9
+    assert ram.read(6) == 9
+    assert bytes(ram.view()) == bytes(ram.memory)
+    with pytest.raises(IndexError):
+        ram.view(8, 17)
+    view.release()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs Python 3.12")
+def test_buffer_protocol():
+    ram = RAM(4)
+    ram.write(1, 2)
+    assert bytes(memoryview(ram)) == b"\x00\x02\x00\x00"
+
+
+def test_block_transfers():
+    ram = RAM(16)
+    ram.write_block(4, b"\x01\x02\x03")
+    assert ram.read_block(3, 5) == b"\x00\x01\x02\x03\x00"
+    ram.write_block(0, bytearray(b"\xff"))
+    ram.write_block(8, memoryview(b"abcd")[1:3])
+    assert ram.read_block(0, 1) == b"\xff"
+    assert ram.read_block(8, 2) == b"bc"
+    with pytest.raises(IndexError):
+        ram.write_block(14, b"xyz")
+    assert ram.read_block(14, 2) == b"\x00\x00"
+    with pytest.raises(IndexError):
+        ram.read_block(10, 7)
+
+
+def test_fill():
+    ram = RAM(8)
+    ram.fill(2, 4, 0xAA)
+    assert ram.read_block(0, 8) == b"\x00\x00\xaa\xaa\xaa\xaa\x00\x00"
+    with pytest.raises(ValueError):
+        ram.fill(0, 1, 256)
+    with pytest.raises(IndexError):
+        ram.fill(6, 3)
+
+
+@pytest.mark.parametrize("dest, src", [(2, 0), (0, 2), (8, 0)])
+def test_copy_handles_overlap(dest, src):
+    ram = RAM(16)
+    data = bytes(range(1, 9))
+    ram.write_block(src, data)
+    ram.copy(dest, src, len(data))
+    assert ram.read_block(dest, len(data)) == data
+    with pytest.raises(IndexError):
+        ram.copy(10, 0, 8)
+
+
+def test_bulk_load_matches_per_byte_load():
+    for data in (b"\x01\x02\x03", [1, 2, 3], (1, 2, 3), iter([1, 2, 3])):
+        ram = RAM(4)
+        with pytest.raises(IndexError, match="Address 4"):
+            ram.load(data, start_address=2)
+        assert ram.read_block(0, 4) == b"\x00\x00\x01\x02"
+    ram = RAM(4)
+    ram.load([])
+    with pytest.raises(IndexError, match="Address 9"):
+        ram.load(b"\x01", start_address=9)
+
+
+def test_mapped_ram_persists_in_its_file(tmp_path):
+    path = str(tmp_path / "memory.bin")
+    with MappedRAM(1 << 16, path) as ram:
+        ram.write_block(100, b"persist")
+        ram.load([1, 2], start_address=4)
+    assert (tmp_path / "memory.bin").stat().st_size == 1 << 16
+    with MappedRAM(1 << 16, path) as ram:
+        assert ram.read_block(100, 7) == b"persist"
+        assert list(ram.dump(3, 7)) == [(3, 0), (4, 1), (5, 2), (6, 0)]
+
+
+@pytest.mark.parametrize("backed", [True, False])
+def test_mapped_ram_snapshot_and_restore(tmp_path, backed):
+    snapshot = str(tmp_path / "snapshot.bin")
+    with MappedRAM(1 << 22, str(tmp_path / "memory.bin") if backed else None) as ram:
+        ram.write_block(1 << 21, b"before")
+        ram.snapshot(snapshot)
+        ram.fill(0, 1 << 22, 0x11)
+        ram.restore(snapshot)
+        assert ram.read_block((1 << 21) - 1, 8) == b"\x00before\x00"
+        assert ram.read_block(0, 4) == bytes(4)
+        with pytest.raises(ValueError):
+            MappedRAM(1 << 10).restore(snapshot)
+
+
+def test_mapped_ram_page_stats(tmp_path):
+    with MappedRAM(1 << 30, str(tmp_path / "memory.bin")) as ram:
+        ram.write(12345, 1)
+        stats = ram.page_stats()
+        assert stats.pages == (1 << 30) // stats.page_size
+        assert 1 <= stats.resident < stats.pages
+
+
+def test_sparse_ram_matches_ram():
+    rng = random.Random(7)
+    dense, sparse = RAM(1000), SparseRAM(1000, page_size=64)
+    for _ in range(300):
+        op, start = rng.randrange(5), rng.randrange(1000)
+        length = rng.randrange(0, 1000 - start + 1)
+        if op == 0:
+            value = rng.randrange(256)
+            dense.write(start, value)
+            sparse.write(start, value)
+        elif op == 1:
+            data = rng.randbytes(length)
+            dense.write_block(start, data)
+            sparse.write_block(start, data)
+        elif op == 2:
+            value = rng.choice([0, rng.randrange(256)])
+            dense.fill(start, length, value)
+            sparse.fill(start, length, value)
+        elif op == 3:
+            dest = rng.randrange(1000 - length + 1)
+            dense.copy(dest, start, length)
+            sparse.copy(dest, start, length)
+        else:
+            assert sparse.read_block(start, length) == dense.read_block(start, length)
+    assert list(sparse.dump()) == list(dense.dump())
+    with pytest.raises(IndexError, match="Address 1000"):
+        sparse.read(1000)
+    with pytest.raises(IndexError, match="Address 1000"):
+        sparse.load(b"abc", start_address=998)
+    assert sparse.read_block(998, 2) == b"ab"
+
+
+def test_sparse_ram_allocates_pages_on_write():
+    ram = SparseRAM(1 << 64)
+    assert ram.read((1 << 64) - 1) == 0
+    assert ram.page_stats().resident == 0
+    ram.write_block((1 << 40) - 2, b"span")
+    assert ram.read_block((1 << 40) - 4, 8) == b"\x00\x00span\x00\x00"
+    assert ram.page_stats().resident == 2
+    ram.fill(1 << 40, 4096)
+    assert ram.page_stats().resident == 1
+    assert ram.page_stats().resident_bytes == 4096
+    with pytest.raises(ValueError):
+        ram.view((1 << 40) - 2, (1 << 40) + 2)
+    view = ram.view(0, 4)
+    view[0] = 5
+    assert ram.read(0) == 5
+
+
+@pytest.mark.parametrize("make", [lambda: RAM(64), lambda: SparseRAM(64, page_size=16), lambda: MappedRAM(64)])
+def test_typed_access(make):
+    ram = make()
+    ram.write_u32(14, 0x11223344)
+    assert ram.read_block(14, 4) == b"\x44\x33\x22\x11"
+    assert ram.read_u32(14) == 0x11223344
+    assert ram.read_u32(14, "big") == 0x44332211
+    ram.write_u64(30, 0x0102030405060708, "big")
+    assert ram.read_block(30, 8) == bytes(range(1, 9))
+    assert ram.read_u64(30, "big") == 0x0102030405060708
+    ram.write_u16(0, 0xBEEF)
+    assert ram.read_u16(0) == 0xBEEF
+    assert ram.read_int(0, 1) == 0xEF
+    with pytest.raises(IndexError):
+        ram.read_u64(60)
+    with pytest.raises(ValueError):
+        ram.write_u16(0, 1 << 16)
+    with pytest.raises(ValueError):
+        ram.read_int(0, 3)
+    with pytest.raises(ValueError):
+        ram.read_u32(0, "middle")
+
+
+@pytest.mark.parametrize("byteorder", ["little", "big"])
+def test_array_access(byteorder):
+    ram = SparseRAM(256, page_size=32)
+    values = [0, 1, 0xFFFF, 0x1234]
+    ram.write_array(10, values, width=2, byteorder=byteorder)
+    assert ram.read_array(10, 4, width=2, byteorder=byteorder).tolist() == values
+    assert [ram.read_u16(10 + 2 * i, byteorder) for i in range(4)] == values
+    words = RAM(64)
+    words.write_array(0, [1 << 63, 5], width=8)
+    assert words.read_array(0, 2, width=8).tolist() == [1 << 63, 5]
+    with pytest.raises(ValueError):
+        words.write_array(0, [1 << 32], width=4)
+
+
+def test_sparse_ram_bulk_ops_only_visit_allocated_pages():
+    ram = SparseRAM(1 << 64)
+    ram.write_block((1 << 50) - 2, b"edge")
+    ram.write(1 << 60, 7)
+    ram.copy(1 << 62, 1 << 50, 1 << 40)
+    assert ram.read_block((1 << 62) - 2, 6) == b"\x00\x00ge\x00\x00"
+    ram.copy((1 << 50) + 1, (1 << 50) - 2, 4)
+    assert ram.read_block((1 << 50) - 2, 6) == b"edgedg"
+    ram.fill(0, 1 << 61, 0)
+    assert sorted(ram.pages) == [(1 << 62) // ram.page_size]
+    assert ram.read(1 << 60) == 0
+    ram.fill(0, 1 << 63, 0)
+    assert ram.page_stats().resident == 0
+
+
+def test_snapshot_is_copy_on_write():
+    ram = SparseRAM(1 << 20, page_size=256)
+    ram.write_block(0, b"a" * 1024)
+    snapshot = ram.snapshot()
+    assert all(ram.pages[index] is page for index, page in snapshot.pages.items())
+    ram.write(300, 0x62)
+    assert ram.pages[1] is not snapshot.pages[1]
+    assert ram.pages[0] is snapshot.pages[0]
+    assert snapshot.pages[1][300 - 256] == ord("a")
+    ram.write_u32(510, 0xFFFFFFFF)
+    ram.fill(768, 256)
+    ram.write(5000, 1)
+    assert ram.diff(snapshot) == [(300, 301), (510, 514), (768, 1024), (5000, 5001)]
+    later = ram.snapshot()
+    ram.restore(snapshot)
+    assert ram.read_block(0, 1024) == b"a" * 1024
+    assert ram.read(5000) == 0
+    assert ram.diff(snapshot) == []
+    assert ram.diff(snapshot, later) == [(300, 301), (510, 514), (768, 1024), (5000, 5001)]
+    ram.write(0, 0x61)
+    assert ram.diff(snapshot) == []
+    with pytest.raises(ValueError):
+        SparseRAM(1 << 20).restore(snapshot)
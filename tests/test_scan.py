@@ -0,0 +1,422 @@
+import asyncio
+import contextlib
+import csv
+import json
+import pathlib
+import random
+import socket
+import sys
+import time
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from scan.main import (
+    BannerGrabber,
+    ResultWriter,
+    RttEstimator,
+    ScanCheckpoint,
+    ScanResult,
+    Scanner,
+    ServiceResult,
+    expand_targets,
+    identify_service,
+    main as scan_main,
+    parse_ports,
+    read_host_file,
+    scan_ports,
+    scan_ports_concurrent,
+)
+
+
+OPEN_OFFSETS = (0, 3, 7)
+SPAN = 10
+
+
+@pytest.fixture
+def listeners():
+    """Listen on three ports of a free block of ``SPAN`` ports on 127.0.0.1."""
+    rng = random.Random()
+    for _ in range(50):
+        base = rng.randrange(20000, 60000)
+        sockets = []
+        try:
+            for offset in range(SPAN):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sockets.append(sock)
+                sock.bind(("127.0.0.1", base + offset))
+        except OSError:
+            for sock in sockets:
+                sock.close()
+            continue
+        for offset, sock in enumerate(sockets):
+            if offset in OPEN_OFFSETS:
+                sock.listen(16)
+            else:
+                sock.close()
+        yield base
+        for sock in sockets:
+            sock.close()
+        return
+    pytest.skip("no free port block on 127.0.0.1")
+
+
+def test_concurrent_scan_matches_sequential(listeners):
+    expected = [listeners + offset for offset in OPEN_OFFSETS]
+    assert scan_ports("127.0.0.1", listeners, listeners + SPAN - 1) == expected
+    assert scan_ports_concurrent("127.0.0.1", listeners, listeners + SPAN - 1, concurrency=4) == expected
+
+
+def test_concurrent_scan_respects_rate_limit(listeners):
+    started = time.monotonic()
+    found = scan_ports_concurrent("127.0.0.1", listeners, listeners + SPAN - 1, rate=50)
+    assert found == [listeners + offset for offset in OPEN_OFFSETS]
+    assert time.monotonic() - started >= (SPAN - 1) / 50 * 0.9
+    with pytest.raises(ValueError):
+        scan_ports_concurrent("127.0.0.1", listeners, listeners, concurrency=0)
+
+
+def _collect(scanner, hosts, ports):
+    async def run():
+        return [result async for result in scanner.scan(hosts, ports)]
+
+    return asyncio.run(run())
+
+
+def test_parse_ports_and_targets(tmp_path):
+    assert parse_ports("22,80, 443,8000-8002,80") == [22, 80, 443, 8000, 8001, 8002]
+    for spec in ("0", "70000", "10-5", "http"):
+        with pytest.raises(ValueError):
+            parse_ports(spec)
+    hosts_file = tmp_path / "hosts.txt"
+    hosts_file.write_text("# lab\n10.0.0.1\n\nexample.org  # web\n", encoding="utf-8")
+    assert read_host_file(str(hosts_file)) == ["10.0.0.1", "example.org"]
+    assert list(expand_targets(["192.168.1.0/30", "10.0.0.7/32", "host"])) == [
+        "192.168.1.1", "192.168.1.2", "10.0.0.7", "host",
+    ]
+
+
+def test_expand_targets_is_lazy_but_validates_up_front(monkeypatch, capsys):
+    hosts = expand_targets(["2001:db8::/32", "host"])
+    assert next(hosts) == "2001:db8::1"
+    with pytest.raises(ValueError):
+        expand_targets(["10.0.0.1", "10.0.0.0/33"])
+    monkeypatch.setattr(sys, "argv", ["scan", " "])
+    with pytest.raises(SystemExit):
+        scan_main()
+    assert "no targets to scan" in capsys.readouterr().err
+
+
+def test_scanner_streams_results_across_hosts(listeners):
+    ports = range(listeners, listeners + SPAN)
+    results = _collect(Scanner(max_sockets=3, per_host=2), ["127.0.0.1", "127.0.0.2"], ports)
+    assert sorted((result.host, result.port) for result in results) == [
+        ("127.0.0.1", listeners + offset) for offset in OPEN_OFFSETS
+    ]
+    assert all(result.latency >= 0 and result.timestamp > 0 for result in results)
+
+
+def test_scanner_caps_sockets_and_interleaves_hosts():
+    active = {"total": 0, "peak": 0}
+    per_host = {}
+    order = []
+
+    async def fake_connect(family, address, port, timeout):
+        host = address[0]
+        order.append(host)
+        active["total"] += 1
+        per_host[host] = per_host.get(host, 0) + 1
+        active["peak"] = max(active["peak"], active["total"])
+        assert per_host[host] <= 2
+        await asyncio.sleep(0.05 if host == "10.0.0.1" else 0.001)
+        active["total"] -= 1
+        per_host[host] -= 1
+        return port == 80, 0.001
+
+    hosts = ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    scanner = Scanner(max_sockets=4, per_host=2, connector=fake_connect)
+    results = _collect(scanner, hosts, parse_ports("22,80,443,8000-8005"))
+    assert active["peak"] <= 4
+    assert set(order[:4]) == set(hosts)
+    assert sorted(result.host for result in results) == hosts
+    assert results[-1].host == "10.0.0.1"
+
+
+def test_rtt_estimator_follows_rfc6298():
+    timing = RttEstimator(initial=1.0, min_timeout=0.05, max_timeout=3.0)
+    assert timing.timeout == 1.0
+    timing.observe(0.1)
+    assert (timing.srtt, timing.rttvar) == (0.1, 0.05)
+    assert timing.timeout == pytest.approx(0.3)
+    timing.observe(0.02)
+    assert timing.srtt == pytest.approx(0.09)
+    assert timing.rttvar == pytest.approx(0.0575)
+    for _ in range(50):
+        timing.observe(0.001)
+    assert timing.timeout == 0.05
+
+
+def test_adaptive_scanner_retries_only_unanswered_probes():
+    attempts = {}
+
+    async def lossy_connect(family, address, port, timeout):
+        attempts.setdefault(port, []).append(timeout)
+        if port == 22:
+            return False, 0.01
+        if port == 80 and len(attempts[port]) == 1:
+            await asyncio.sleep(timeout)
+            return None, timeout
+        if port == 81:
+            await asyncio.sleep(timeout)
+            return None, timeout
+        return True, 0.01
+
+    scanner = Scanner(timeout=0.2, adaptive=True, retries=2, per_host=1, connector=lossy_connect, keep_timings=True)
+    results = _collect(scanner, ["10.0.0.1"], [443, 22, 80, 81])
+    assert [result.port for result in results] == [443, 80]
+    assert len(attempts[22]) == len(attempts[443]) == 1
+    assert attempts[80][1] == 2 * attempts[80][0] < 0.2
+    assert len(attempts[81]) == 3
+    timing = scanner.timings["10.0.0.1"]
+    assert (timing.probes, timing.retries, timing.timeouts, timing.samples) == (7, 3, 1, 3)
+    unkept = Scanner(timeout=0.2, adaptive=True, retries=2, per_host=1, connector=lossy_connect)
+    assert [result.port for result in _collect(unkept, ["10.0.0.1"], [443, 80])] == [443, 80]
+    assert unkept.timings == {}
+
+
+def test_scanner_respects_file_descriptor_limit(listeners, monkeypatch):
+    import errno
+
+    import scan.main
+
+    limit = scan.main.socket_limit()
+    assert limit is None or Scanner(max_sockets=10**9).max_sockets == limit
+    monkeypatch.setattr(scan.main, "socket_limit", lambda: 8)
+    assert Scanner(max_sockets=500).max_sockets == 8
+
+    real_socket = socket.socket
+    failures = [errno.EMFILE, errno.ENFILE]
+
+    def exhausted(*args, **kwargs):
+        if failures:
+            raise OSError(failures.pop(), "Too many open files")
+        return real_socket(*args, **kwargs)
+
+    async def run():
+        monkeypatch.setattr(socket, "socket", exhausted)
+        try:
+            return await scan.main.open_port(socket.AF_INET, ("127.0.0.1", 0), listeners, 1.0)
+        finally:
+            monkeypatch.undo()
+
+    state, _, sock = asyncio.run(run())
+    sock.close()
+    assert state is True and not failures
+
+
+def test_checkpoint_resumes_after_interruption(tmp_path):
+    probed = []
+
+    async def fake_connect(family, address, port, timeout):
+        probed.append(port)
+        await asyncio.sleep(0)
+        return port in (2, 6, 10), 0.001
+
+    async def run(stop_after=None):
+        ports = list(range(1, 13))
+        checkpoint = ScanCheckpoint(str(tmp_path / "scan.checkpoint.json"), ports, block_size=4)
+        scanner = Scanner(max_sockets=1, connector=fake_connect)
+        found = []
+        async with contextlib.aclosing(scanner.scan(["10.0.0.1"], ports, checkpoint)) as results:
+            async for result in results:
+                found.append(result.port)
+                if len(found) == stop_after:
+                    break
+        return checkpoint.resumed, found
+
+    assert asyncio.run(run(stop_after=2)) == (False, [2, 6])
+    state = json.loads((tmp_path / "scan.checkpoint.json").read_text(encoding="utf-8"))
+    assert state["completed"] == {"10.0.0.1": [[0, 0]]}
+    probed.clear()
+    assert asyncio.run(run()) == (True, [6, 10])
+    assert probed == list(range(5, 13))
+    state = json.loads((tmp_path / "scan.checkpoint.json").read_text(encoding="utf-8"))
+    assert state["completed"] == {"10.0.0.1": [[0, 2]]}
+
+
+def test_checkpoint_waits_for_banner_pipeline(tmp_path):
+    async def fake_connect(family, address, port, timeout):
+        await asyncio.sleep(0)
+        return port in (2, 6, 10), 0.001
+
+    async def slow_grab(result):
+        await asyncio.sleep(0.05)
+        return ServiceResult(result.host, result.port, result.latency, result.timestamp, None, "")
+
+    async def run(stop_after=None):
+        ports = list(range(1, 13))
+        checkpoint = ScanCheckpoint(str(tmp_path / "scan.checkpoint.json"), ports, block_size=4)
+        scanner = Scanner(max_sockets=1, connector=fake_connect)
+        grabber = BannerGrabber(workers=1)
+        grabber.grab = slow_grab
+        found = []
+        results = grabber.pipeline(scanner.scan(["10.0.0.1"], ports, checkpoint, acknowledge=True), scanner.acknowledge)
+        async with contextlib.aclosing(results):
+            async for result in results:
+                found.append(result.port)
+                if len(found) == stop_after:
+                    break
+        checkpoint.save()
+        return found
+
+    assert asyncio.run(run(stop_after=2)) == [2, 6]
+    state = json.loads((tmp_path / "scan.checkpoint.json").read_text(encoding="utf-8"))
+    assert state["completed"] == {"10.0.0.1": [[0, 0]]}
+    assert asyncio.run(run()) == [6, 10]
+    state = json.loads((tmp_path / "scan.checkpoint.json").read_text(encoding="utf-8"))
+    assert state["completed"] == {"10.0.0.1": [[0, 2]]}
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "csv"])
+def test_result_writer_streams_rows(tmp_path, output_format):
+    path = tmp_path / f"out.{output_format}"
+    result = ScanResult("10.0.0.1", 22, 0.0123456, 1700000000.5)
+    with ResultWriter(str(path)) as writer:
+        writer.write(result)
+    with ResultWriter(str(path), append=True) as writer:
+        writer.write(result._replace(port=80))
+    expected = {"timestamp": "2023-11-14T22:13:20.500+00:00", "host": "10.0.0.1", "port": 22, "latency_ms": 12.346}
+    if output_format == "jsonl":
+        rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    else:
+        rows = list(csv.DictReader(path.open(encoding="utf-8", newline="")))
+        expected = {key: str(value) for key, value in expected.items()}
+    assert rows == [expected, {**expected, "port": rows[1]["port"]}]
+    assert str(rows[1]["port"]) == "80"
+
+
+@pytest.mark.parametrize(
+    "banner, service",
+    [
+        (b"SSH-2.0-OpenSSH_9.6p1 Ubuntu-3\r\n", "ssh"),
+        (b"HTTP/1.1 404 Not Found\r\nServer: nginx\r\n\r\n", "http"),
+        (b"220 mail.example.com ESMTP Postfix\r\n", "smtp"),
+        (b"220 (vsFTPd 3.0.5)\r\n", "ftp"),
+        (b"+OK Dovecot ready.\r\n", "pop3"),
+        (b"* OK [CAPABILITY IMAP4rev1] ready\r\n", "imap"),
+        (b"hello\r\n", None),
+        (b"", None),
+    ],
+)
+def test_identify_service(banner, service):
+    assert identify_service(banner) == service
+
+
+def test_banner_grabber_pipelines_discovery():
+    async def greet(reader, writer):
+        writer.write(b"SSH-2.0-OpenSSH_9.6\r\n")
+        await writer.drain()
+        writer.close()
+
+    async def http(reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        if request.startswith(b"HEAD / HTTP/1.0\r\n"):
+            writer.write(b"HTTP/1.0 200 OK\r\nServer: test/1.0\r\n\r\n")
+            await writer.drain()
+        writer.close()
+
+    async def silent(reader, writer):
+        await reader.read()
+        writer.close()
+
+    async def run():
+        servers = [await asyncio.start_server(handler, "127.0.0.1", 0) for handler in (greet, http, silent)]
+        ports = [server.sockets[0].getsockname()[1] for server in servers]
+        connects = []
+        scanner = Scanner(timeout=1.0, keep_open=True)
+        original = scanner._probe
+
+        async def counting_probe(target, port):
+            connects.append(port)
+            return await original(target, port)
+
+        scanner._probe = counting_probe
+        grabber = BannerGrabber(timeout=0.5, greeting_timeout=0.2, workers=2)
+        try:
+            found = [result async for result in grabber.pipeline(scanner.scan(["127.0.0.1"], ports))]
+        finally:
+            for server in servers:
+                server.close()
+        return ports, connects, found
+
+    ports, connects, found = asyncio.run(run())
+    assert sorted(connects) == sorted(ports)
+    by_port = {result.port: result for result in found}
+    assert by_port[ports[0]].service == "ssh" and by_port[ports[0]].banner == "SSH-2.0-OpenSSH_9.6"
+    assert by_port[ports[1]].service == "http" and by_port[ports[1]].banner == "HTTP/1.0 200 OK (test/1.0)"
+    assert by_port[ports[2]].service is None and by_port[ports[2]].banner == ""
+
+
+def test_banner_grabber_pipeline_cancels_cleanly():
+    closed = []
+
+    async def results():
+        try:
+            for port in range(1, 100):
+                yield ScanResult("10.0.0.1", port, 0.001, 1.0)
+        finally:
+            closed.append(True)
+
+    async def run():
+        grabber = BannerGrabber(workers=2, queue_size=1)
+
+        async def slow_grab(result):
+            await asyncio.sleep(10)
+
+        grabber.grab = slow_grab
+        consumer = asyncio.ensure_future(grabber.pipeline(results()).__anext__())
+        await asyncio.sleep(0.05)
+        consumer.cancel()
+        await asyncio.wait_for(asyncio.gather(consumer, return_exceptions=True), 2)
+
+    asyncio.run(run())
+    assert closed == [True]
+
+
+def test_banner_grabber_reconnects_without_kept_socket(listeners):
+    async def run():
+        grabber = BannerGrabber(timeout=0.2, greeting_timeout=0.1)
+        return await grabber.grab(ScanResult("127.0.0.1", listeners, 0.001, 1.0))
+
+    assert asyncio.run(run()) == ServiceResult("127.0.0.1", listeners, 0.001, 1.0, None, "")
+
+
+def test_result_writer_service_fields(tmp_path):
+    path = tmp_path / "out.jsonl"
+    with ResultWriter(str(path), services=True) as writer:
+        writer.write(ServiceResult("10.0.0.1", 22, 0.001, 1700000000.0, "ssh", "SSH-2.0-OpenSSH_9.6"))
+    row = json.loads(path.read_text(encoding="utf-8"))
+    assert (row["service"], row["banner"]) == ("ssh", "SSH-2.0-OpenSSH_9.6")
+
+
+def test_checkpoint_skips_blocks_of_unresolved_hosts(tmp_path, monkeypatch):
+    import scan.main
+
+    async def fail_resolve(host):
+        raise OSError("no such host")
+
+    async def fake_connect(family, address, port, timeout):
+        return False, 0.001
+
+    async def run():
+        ports = list(range(1, 13))
+        checkpoint = ScanCheckpoint(str(tmp_path / "scan.checkpoint.json"), ports, block_size=4)
+        scanner = Scanner(max_sockets=8, connector=fake_connect)
+        found = [result async for result in scanner.scan(["nonexistent.invalid"], ports, checkpoint)]
+        return scanner.unresolved, found
+
+    monkeypatch.setattr(scan.main, "_resolve", fail_resolve)
+    assert asyncio.run(run()) == (["nonexistent.invalid"], [])
+    state = json.loads((tmp_path / "scan.checkpoint.json").read_text(encoding="utf-8"))
+    assert state["completed"] == {}
@@ -0,0 +1,172 @@
+import io
+import pathlib
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+from word_count.main import (
+    SpaceSaving,
+    TokenPipeline,
+    WordIndex,
+    count_file,
+    count_files_parallel,
+    count_words,
+    count_words_stream,
+    merge_counts,
+    split_into_shards,
+    top_words_approximate,
+)
+
+
+TEXT = "The cat, the HAT.\nΟΔΟΣ οδος ΣΑΣ's tab\tend_of-line  ünïcödé 42 x\r\nthe end"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 64, 1 << 20])
+def test_stream_matches_count_words(chunk_size):
+    assert count_words_stream(io.StringIO(TEXT), chunk_size) == count_words(TEXT)
+
+
+def test_stream_handles_words_across_chunks():
+    rng = random.Random(7)
+    text = "".join(rng.choice(["alpha ", "Beta\n", "gamma,", "ΣΣ ", "x" * 50, " "]) for _ in range(2000))
+    for chunk_size in (7, 13, 1000):
+        assert count_words_stream(io.StringIO(text), chunk_size) == count_words(text)
+
+
+def test_stream_adds_to_existing_counts():
+    counts = count_words("a b")
+    count_words_stream(io.StringIO("b c"), 2, counts)
+    assert counts == {"a": 1, "b": 2, "c": 1}
+    with pytest.raises(ValueError):
+        count_words_stream(io.StringIO("a"), 0)
+
+
+def test_count_file(tmp_path):
+    path = tmp_path / "texto.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    assert count_file(str(path), chunk_size=4) == count_words(TEXT)
+
+
+def test_split_into_shards_ends_on_whitespace(tmp_path):
+    path = tmp_path / "texto.txt"
+    path.write_text(TEXT * 3, encoding="utf-8")
+    data = path.read_bytes()
+    shards = split_into_shards(str(path), shard_size=10)
+    assert shards[0][0] == 0 and shards[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+    assert all(data[end - 1:end].isspace() for _, end in shards[:-1])
+
+
+def test_merge_counts_is_a_tree_of_updates():
+    parts = [count_words(word) for word in ["a", "b", "a", "c", "a"]]
+    assert merge_counts(parts) == {"a": 3, "b": 1, "c": 1}
+    assert merge_counts([]) == {}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_parallel_matches_serial(tmp_path, processes):
+    rng = random.Random(11)
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"parte{index}.txt"
+        path.write_text(
+            "".join(rng.choice(["alpha ", "Beta\n", "ΟΔΟΣ ", "délta,", "x" * 30]) for _ in range(500)),
+            encoding="utf-8",
+        )
+        paths.append(str(path))
+    serial = count_words("".join(pathlib.Path(path).read_text(encoding="utf-8") + " " for path in paths))
+    assert count_files_parallel(paths, processes=processes, shard_size=97, chunk_size=13) == serial
+
+
+def test_space_saving_bounds_hold_with_small_capacity():
+    rng = random.Random(5)
+    words = [f"id{rng.randrange(5000)}" for _ in range(20000)] + ["hot"] * 3000 + ["warm"] * 1500
+    rng.shuffle(words)
+    text = " ".join(words)
+    exact = count_words(text)
+    top = top_words_approximate(io.StringIO(text), 2, capacity=50, chunk_size=4096)
+    assert [hit.word for hit in top] == ["hot", "warm"]
+    sketch = SpaceSaving(50)
+    for start in range(0, len(words), 700):
+        sketch.update(count_words(" ".join(words[start:start + 700])))
+    assert len(sketch) <= 50
+    for word, count, error in sketch.top(50):
+        assert count - error <= exact[word] <= count
+        assert error <= sketch.total / sketch.capacity
+
+
+def test_space_saving_is_exact_within_capacity():
+    assert top_words_approximate(io.StringIO(TEXT), 3, capacity=100) == [
+        (word, count, 0) for word, count in count_words(TEXT).most_common(3)
+    ]
+    assert SpaceSaving.for_error(0.001).capacity == 1000
+
+
+@pytest.mark.parametrize("tokenizer", ["regex", "finditer", "ascii"])
+@pytest.mark.parametrize("chunk_size", [3, 1 << 20])
+def test_pipeline_tokenizers_match_count_words(tokenizer, chunk_size):
+    data = (TEXT + " plain ascii Words only\n") * 3
+    counts = TokenPipeline(tokenizer).count(io.BytesIO(data.encode("utf-8")), chunk_size)
+    assert counts == count_words(data)
+    assert all(isinstance(word, str) for word in counts)
+
+
+@pytest.mark.parametrize("tokenizer", ["regex", "ascii"])
+def test_pipeline_filters_and_ngrams_in_one_pass(tokenizer):
+    data = "The cat and the hat\nsat on ΟΔΟΣ the mat".encode("utf-8")
+    pipeline = TokenPipeline(tokenizer, stop_words=frozenset({"THE", "on"}), min_length=3, ngram=2)
+    assert pipeline.count(io.BytesIO(data), chunk_size=4) == {
+        "cat and": 1, "and hat": 1, "hat sat": 1, "sat οδος": 1, "οδος mat": 1,
+    }
+    batches = list(pipeline.batches(io.BytesIO(data), chunk_size=4))
+    assert sum(batches, Counter()) == pipeline.count(io.BytesIO(data))
+    with pytest.raises(ValueError):
+        TokenPipeline("split")
+
+
+def test_parallel_pipeline_keeps_ngrams_across_shards(tmp_path):
+    path = tmp_path / "texto.txt"
+    path.write_text("a b c d e f " * 50, encoding="utf-8")
+    pipeline = TokenPipeline("ascii", ngram=3)
+    expected = pipeline.count(io.BytesIO(path.read_bytes()))
+    assert count_files_parallel([str(path)], processes=2, shard_size=16, pipeline=pipeline) == expected
+
+
+def test_word_index_recounts_only_changed_files(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    first, second = corpus / "a.txt", corpus / "sub" / "b.txt"
+    first.write_text("alpha beta beta", encoding="utf-8")
+    second.write_text("Beta gamma", encoding="utf-8")
+    (corpus / "ignored.log").write_text("beta", encoding="utf-8")
+    database = str(tmp_path / "index.sqlite")
+
+    with WordIndex(database) as index:
+        assert index.update([str(corpus)]) == (2, 0, 0)
+        assert index.top(2) == [("beta", 3), ("alpha", 1)]
+        assert index.frequency("BETA") == 3
+
+    first.write_text("alpha alpha delta", encoding="utf-8")
+    with WordIndex(database) as index:
+        assert index.update([str(corpus)]) == (1, 1, 0)
+        assert dict(index.top(10)) == count_words("alpha alpha delta Beta gamma")
+        second.unlink()
+        assert index.update([str(corpus)], processes=2) == (0, 1, 1)
+        assert dict(index.top(10)) == {"alpha": 2, "delta": 1}
+
+    with WordIndex(database, TokenPipeline(min_length=6)) as index:
+        assert index.top(10) == []
+        assert index.update([str(first)]) == (1, 0, 0)
+
+
+def test_word_index_ignores_duplicate_paths(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("alpha beta", encoding="utf-8")
+    with WordIndex(str(tmp_path / "index.sqlite")) as index:
+        assert index.update([str(corpus), str(corpus / "a.txt"), str(corpus)]) == (1, 0, 0)
+        assert index.top(10) == [("alpha", 1), ("beta", 1)]